@@ -0,0 +1,197 @@
+// Client-side filtering for small datasets. The server ships the per-region
+// daily series once in the `sales-store` dcc.Store; region and date filtering,
+// trace building and the summary totals then run in the browser.
+(function () {
+    var DAY_MS = 86400000;
+    var COLORS = ['#2E86AB', '#A23B72', '#F18F01', '#C73E1D', '#6C5CE7'];
+    var CARD_STYLE = {'margin': '15px 0', 'padding': '10px', 'backgroundColor': 'white', 'borderRadius': '8px', 'boxShadow': '0 2px 4px rgba(0,0,0,0.1)'};
+    var prefixCache = new WeakMap();
+
+    function title(text) {
+        return text.charAt(0).toUpperCase() + text.slice(1);
+    }
+
+    function money(value) {
+        return value.toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2});
+    }
+
+    function toDay(value) {
+        return Math.floor(Date.parse(value.slice(0, 10) + 'T00:00:00Z') / DAY_MS);
+    }
+
+    // First index whose day is >= target (or > target when after is true)
+    function bisect(days, target, after) {
+        var lo = 0, hi = days.length;
+        while (lo < hi) {
+            var mid = (lo + hi) >> 1;
+            if (days[mid] < target || (after && days[mid] === target)) {
+                lo = mid + 1;
+            } else {
+                hi = mid;
+            }
+        }
+        return lo;
+    }
+
+    // Cumulative sales cents and record counts per region, computed once per
+    // payload; integer cents keep the totals exact
+    function prefixSums(data) {
+        var sums = prefixCache.get(data);
+        if (!sums) {
+            sums = {};
+            data.regions.forEach(function (region) {
+                var series = data.series[region];
+                var sales = [0], counts = [0];
+                for (var i = 0; i < series.days.length; i++) {
+                    sales.push(sales[i] + series.cents[i]);
+                    counts.push(counts[i] + series.counts[i]);
+                }
+                sums[region] = {sales: sales, counts: counts};
+            });
+            prefixCache.set(data, sums);
+        }
+        return sums;
+    }
+
+    function selection(data, startDate, endDate, region) {
+        var sums = prefixSums(data);
+        var start = startDate && endDate ? toDay(startDate) : null;
+        var end = startDate && endDate ? toDay(endDate) : null;
+        var view = {parts: [], cents: 0, records: 0, minDay: null, maxDay: null};
+        data.regions.forEach(function (name) {
+            if (region !== 'all' && name !== region) {
+                return;
+            }
+            var days = data.series[name].days;
+            var i = start === null ? 0 : bisect(days, start, false);
+            var j = end === null ? days.length : Math.max(i, bisect(days, end, true));
+            view.parts.push({region: name, i: i, j: j});
+            view.cents += sums[name].sales[j] - sums[name].sales[i];
+            view.records += sums[name].counts[j] - sums[name].counts[i];
+            if (j > i) {
+                view.minDay = view.minDay === null ? days[i] : Math.min(view.minDay, days[i]);
+                view.maxDay = view.maxDay === null ? days[j - 1] : Math.max(view.maxDay, days[j - 1]);
+            }
+        });
+        view.total = view.cents / 100;
+        var event = data.price_increase_day;
+        view.inRange = view.minDay !== null && view.minDay <= event && event <= view.maxDay;
+        var beforeCents = 0, afterCents = 0;
+        view.parts.forEach(function (part) {
+            var k = Math.min(Math.max(bisect(data.series[part.region].days, event, false), part.i), part.j);
+            var cumulative = sums[part.region].sales;
+            beforeCents += cumulative[k] - cumulative[part.i];
+            afterCents += cumulative[part.j] - cumulative[k];
+        });
+        view.before = beforeCents / 100;
+        view.after = afterCents / 100;
+        return view;
+    }
+
+    function component(type, children, style) {
+        var props = {children: children};
+        if (style) {
+            props.style = style;
+        }
+        return {type: type, namespace: 'dash_html_components', props: props};
+    }
+
+    function card(icon, text, color, fontSize) {
+        return component('Div', [
+            component('Span', icon + ' ', {'fontSize': '24px'}),
+            component('Span', text, {'fontSize': fontSize || '18px', 'fontWeight': 'bold', 'color': color})
+        ], CARD_STYLE);
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        soul_foods: {
+            update_chart: function (startDate, endDate, region, data, figure) {
+                var view = selection(data, startDate, endDate, region);
+                var traces = [];
+                view.parts.forEach(function (part) {
+                    if (part.j <= part.i) {
+                        return;
+                    }
+                    var series = data.series[part.region];
+                    var color = COLORS[traces.length % COLORS.length];
+                    traces.push({
+                        type: 'scatter',
+                        x: series.days.slice(part.i, part.j).map(function (day) { return day * DAY_MS; }),
+                        y: series.cents.slice(part.i, part.j).map(function (cents) { return cents / 100; }),
+                        mode: 'lines+markers',
+                        name: title(part.region),
+                        line: {width: 3, color: color},
+                        marker: {size: 8, color: color, line: {width: 1, color: 'white'}},
+                        hovertemplate: '<b>' + title(part.region) + '</b><br>Date: %{x|%Y-%m-%d}<br>Daily Sales: $%{y:,.2f}<br><extra></extra>'
+                    });
+                });
+                var markers = data.event_markers.filter(function (marker) {
+                    return view.minDay !== null && view.minDay <= marker.day && marker.day <= view.maxDay;
+                });
+                var layout = Object.assign({}, figure.layout, {
+                    shapes: markers.map(function (marker) { return marker.shape; }),
+                    annotations: markers.map(function (marker) { return marker.annotation; }),
+                    uirevision: startDate + '|' + endDate + '|' + region
+                });
+                return {data: traces, layout: layout};
+            },
+
+            update_summary: function (startDate, endDate, region, data) {
+                var view = selection(data, startDate, endDate, region);
+                var average = view.records ? view.cents / 100 / view.records : NaN;
+                var cards = [
+                    card('💰', 'Total Sales: $' + money(view.total), '#2E86AB'),
+                    card('📊', 'Average Daily Sales: $' + (view.records ? average.toFixed(2) : 'nan'), '#A23B72'),
+                    card('📝', 'Total Records: ' + view.records.toLocaleString('en-US'), '#F18F01')
+                ];
+                if (view.inRange) {
+                    cards.push(card('⬇️', 'Sales Before Price Increase (Jan 15, 2021): $' + money(view.before), '#28a745'));
+                    cards.push(card('⬆️', 'Sales After Price Increase (Jan 15, 2021): $' + money(view.after), '#dc3545'));
+                } else {
+                    cards.push(card('⚠️', 'Note: Price increase date (Jan 15, 2021) not in selected date range', '#6c757d', '16px'));
+                }
+                return component('Div', cards);
+            },
+
+            update_insight: function (startDate, endDate, region, data) {
+                var view = selection(data, startDate, endDate, region);
+                if (!view.inRange) {
+                    return component('Div', [
+                        component('Div', [
+                            component('Span', 'ℹ️ ', {'fontSize': '32px'}),
+                            component('Span', 'Select a date range that includes January 15, 2021 to see the impact of the price increase.',
+                                      {'fontSize': '18px', 'fontWeight': 'bold', 'color': '#17a2b8'})
+                        ], {'margin': '10px 0'})
+                    ], {'padding': '20px', 'backgroundColor': '#d1ecf1', 'borderRadius': '10px', 'border': '2px solid #bee5eb'});
+                }
+                var higher = view.after > view.before;
+                var color = higher ? '#28a745' : '#dc3545';
+                return component('Div', [
+                    component('Div', [
+                        component('Span', higher ? '📈 ' : '📉 ', {'fontSize': '32px'}),
+                        component('Span', higher ? 'Sales were HIGHER after the price increase!' : 'Sales were LOWER after the price increase.',
+                                  {'fontSize': '20px', 'fontWeight': 'bold', 'color': color})
+                    ], {'margin': '10px 0'}),
+                    component('Div', [
+                        component('Span', 'Sales ' + (higher ? 'increased' : 'decreased') + ' by $' + money(Math.abs(view.after - view.before)) + ' after January 15, 2021',
+                                  {'fontSize': '18px', 'color': color})
+                    ])
+                ], higher ? {'padding': '20px', 'backgroundColor': '#d4edda', 'borderRadius': '10px', 'border': '2px solid #c3e6cb'}
+                          : {'padding': '20px', 'backgroundColor': '#f8d7da', 'borderRadius': '10px', 'border': '2px solid #f5c6cb'});
+            },
+
+            // Same URLs as update_export_links on the server; only pink morsels are shipped here
+            export_links: function (startDate, endDate, region, product) {
+                function url(format) {
+                    var params = new URLSearchParams();
+                    if (startDate) { params.set('start_date', startDate); }
+                    if (endDate) { params.set('end_date', endDate); }
+                    if (region) { params.set('region', region); }
+                    params.set('format', format);
+                    return '/export?' + params.toString();
+                }
+                return [url('csv'), url('arrow'), {'textAlign': 'center', 'marginTop': '15px', 'fontSize': '16px'}];
+            }
+        }
+    });
+})();
@@ -0,0 +1,56 @@
+"""
+Compare figure payload size and serialization time of the SVG traces with
+the WebGL traces and their compact arrays.
+
+Usage: python benchmarks/figure_payload.py [--points 1000 5000 20000 100000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import plotly.graph_objects as go
+from plotly.io.json import to_json_plotly
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from soul_foods_figure import make_trace
+
+REGIONS = ['east', 'north', 'south', 'west']
+
+def make_series(points, seed=0):
+    """
+    Return synthetic daily (region, x, y) series with cent-valued sales.
+    """
+    rng = np.random.default_rng(seed)
+    x = np.datetime64('2000-01-01', 'ns') + np.arange(points) * np.timedelta64(1, 'D')
+    return [(region, x, rng.integers(100000, 300000, points) / 100.0) for region in REGIONS]
+
+def measure(series, webgl, repeat=3):
+    """
+    Build and serialize the figure, returning (payload bytes, best time in ms).
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fig = go.Figure([make_trace(i, region, x, y, 'Daily', webgl) for i, (region, x, y) in enumerate(series)])
+        payload = to_json_plotly(fig.to_plotly_json())
+        best = min(best, time.perf_counter() - start)
+    return len(payload.encode('utf-8')), best * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--points', type=int, nargs='+', default=[1000, 5000, 20000, 100000],
+                        help="points per trace (4 traces per figure)")
+    args = parser.parse_args()
+
+    print(f"{'points/trace':>12} | {'svg bytes':>12} {'svg ms':>8} | {'webgl bytes':>12} {'webgl ms':>8} | {'size':>6}")
+    for points in args.points:
+        series = make_series(points)
+        svg_bytes, svg_ms = measure(series, webgl=False)
+        gl_bytes, gl_ms = measure(series, webgl=True)
+        print(f"{points:>12,} | {svg_bytes:>12,} {svg_ms:>8.1f} | {gl_bytes:>12,} {gl_ms:>8.1f} | {gl_bytes / svg_bytes:>6.0%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""
+Load-test the dashboard callbacks with many concurrent simulated users and
+report throughput and the latency distribution of every callback.
+
+Usage: python benchmarks/load_test.py [--clients 16] [--duration 30] [--url http://host:port]
+
+Without --url the dashboard is started in-process on a free localhost port
+(threaded WSGI server, sharing this process and its GIL with the clients);
+with --url an already running server, such as gunicorn, is tested. Each
+simulated user picks a random date range and region (sometimes a zoom) and
+fires the chart, summary and insight callbacks like the browser does, over
+a keep-alive connection. No external services are needed.
+"""
+import argparse
+import http.client
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import numpy as np
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+REGIONS = ['all', 'east', 'north', 'south', 'west']
+DATE_BOUNDS = ('2018-02-06', '2022-02-14')
+PERCENTILES = (50, 90, 99)
+
+def callback_body(output, inputs, state=(), changed='date-picker.start_date'):
+    """
+    Return the JSON body Dash's renderer posts to _dash-update-component for
+    one callback: output is (component id, property), inputs and state lists
+    of (component id, property, value), and changed the input that triggered it.
+    """
+    return json.dumps({
+        'output': f"{output[0]}.{output[1]}",
+        'outputs': {'id': output[0], 'property': output[1]},
+        'inputs': [{'id': id_, 'property': prop, 'value': value} for id_, prop, value in inputs],
+        'state': [{'id': id_, 'property': prop, 'value': value} for id_, prop, value in state],
+        'changedPropIds': [changed]
+    })
+
+def interaction(rng, bounds=DATE_BOUNDS, zoom_fraction=0.2, product='pink morsel'):
+    """
+    Return the (callback name, body) requests of one random filter change:
+    a date range of 1 week to the whole data and a region, and sometimes a
+    zoomed chart window inside the range.
+    """
+    first, last = np.datetime64(bounds[0]), np.datetime64(bounds[1])
+    total_days = int((last - first) / np.timedelta64(1, 'D'))
+    length = int(rng.integers(7, total_days + 1))
+    start = first + int(rng.integers(0, total_days - length + 1))
+    end = start + length
+    region = REGIONS[int(rng.integers(0, len(REGIONS)))]
+
+    relayout_data = None
+    if rng.random() < zoom_fraction:
+        zoom_start = start + int(rng.integers(0, max(1, length - 7)))
+        relayout_data = {'xaxis.range[0]': str(zoom_start), 'xaxis.range[1]': str(zoom_start + int(rng.integers(7, 90)))}
+
+    filters = [
+        ('date-picker', 'start_date', str(start)),
+        ('date-picker', 'end_date', str(end)),
+        ('region-filter', 'value', region)
+    ]
+    trailing = [('product-filter', 'value', product), ('data-version', 'data', None)]
+    state = [('live-toggle', 'value', [])]
+    # A zoom is its own interaction, sent after the filters that it narrows
+    chart_inputs = filters + [('sales-chart', 'relayoutData', relayout_data)] + trailing
+    changed = 'date-picker.start_date' if relayout_data is None else 'sales-chart.relayoutData'
+    return [
+        ('update_chart', callback_body(('sales-chart', 'figure'), chart_inputs, state, changed)),
+        ('update_summary', callback_body(('summary-stats', 'children'), filters + trailing, state)),
+        ('update_insight', callback_body(('business-insight', 'children'), filters + trailing, state))
+    ]
+
+def run_load(url, clients=16, duration=None, requests=None, seed=0, bounds=DATE_BOUNDS, zoom_fraction=0.2, think_seconds=0.0):
+    """
+    Run `clients` simulated users until `duration` seconds pass or `requests`
+    callbacks have been sent. Returns the wall time, interaction count and
+    per-callback latencies (seconds) and error counts.
+    """
+    parts = urlsplit(url)
+    path = (parts.path.rstrip('/') or '') + '/_dash-update-component'
+    deadline = None if duration is None else time.perf_counter() + duration
+    budget = [requests]
+    budget_lock = threading.Lock()
+
+    def take():
+        if deadline is not None and time.perf_counter() >= deadline:
+            return False
+        if budget[0] is None:
+            return True
+        with budget_lock:
+            if budget[0] <= 0:
+                return False
+            budget[0] -= 3
+            return True
+
+    def client(client_id):
+        rng = np.random.default_rng([seed, client_id])
+        connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=60)
+        latencies = {}
+        errors = {}
+        interactions = 0
+        while take():
+            for name, body in interaction(rng, bounds, zoom_fraction):
+                start = time.perf_counter()
+                try:
+                    connection.request('POST', path, body, {'Content-Type': 'application/json'})
+                    response = connection.getresponse()
+                    response.read()
+                    ok = response.status == 200
+                except (OSError, http.client.HTTPException):
+                    connection.close()
+                    connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=60)
+                    ok = False
+                if ok:
+                    latencies.setdefault(name, []).append(time.perf_counter() - start)
+                else:
+                    errors[name] = errors.get(name, 0) + 1
+            interactions += 1
+            if think_seconds:
+                time.sleep(rng.exponential(think_seconds))
+        connection.close()
+        return latencies, errors, interactions
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(clients) as executor:
+        results = list(executor.map(client, range(clients)))
+    seconds = time.perf_counter() - start
+
+    latencies = {}
+    errors = {}
+    for client_latencies, client_errors, _ in results:
+        for name, values in client_latencies.items():
+            latencies.setdefault(name, []).extend(values)
+        for name, count in client_errors.items():
+            errors[name] = errors.get(name, 0) + count
+    return {
+        'seconds': seconds,
+        'clients': clients,
+        'interactions': sum(result[2] for result in results),
+        'latencies': {name: np.array(values) for name, values in latencies.items()},
+        'errors': errors
+    }
+
+def summarize(result):
+    """
+    Return a JSON-serializable summary: throughput and per-callback percentiles in ms.
+    """
+    total = sum(len(values) for values in result['latencies'].values())
+    summary = {
+        'seconds': round(result['seconds'], 3),
+        'clients': result['clients'],
+        'interactions': result['interactions'],
+        'requests': total,
+        'requests_per_second': round(total / result['seconds'], 1),
+        'interactions_per_second': round(result['interactions'] / result['seconds'], 1),
+        'callbacks': {}
+    }
+    for name, values in sorted(result['latencies'].items()):
+        stats = {'requests': len(values), 'errors': result['errors'].get(name, 0)}
+        for percentile in PERCENTILES:
+            stats[f"p{percentile}_ms"] = round(float(np.percentile(values, percentile)) * 1000, 2)
+        stats['max_ms'] = round(float(values.max()) * 1000, 2)
+        summary['callbacks'][name] = stats
+    for name, count in result['errors'].items():
+        summary['callbacks'].setdefault(name, {'requests': 0, 'errors': count})
+    return summary
+
+def print_summary(summary):
+    print(f"{summary['clients']} clients, {summary['seconds']:.1f}s: {summary['requests']:,} requests "
+          f"({summary['requests_per_second']:.1f} req/s, {summary['interactions_per_second']:.1f} interactions/s)")
+    print(f"{'callback':<16} {'requests':>8} {'errors':>6} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for name, stats in summary['callbacks'].items():
+        print(f"{name:<16} {stats['requests']:>8,} {stats['errors']:>6} {stats.get('p50_ms', float('nan')):>8.1f} "
+              f"{stats.get('p90_ms', float('nan')):>8.1f} {stats.get('p99_ms', float('nan')):>8.1f} {stats.get('max_ms', float('nan')):>8.1f}")
+
+def start_local_server():
+    """
+    Serve the dashboard from this process on a free localhost port; return its URL and the server.
+    """
+    import logging
+    from werkzeug.serving import make_server
+    import soul_foods_dashboard
+
+    # One access log line per request would dominate the output
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+
+    if soul_foods_dashboard.CLIENTSIDE_MODE:
+        raise SystemExit("The dashboard runs its callbacks in the browser (SOUL_FOODS_CLIENTSIDE_MAX_ROWS); nothing to load-test")
+    server = make_server('127.0.0.1', 0, soul_foods_dashboard.app.server, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    dataset = soul_foods_dashboard.data_provider.current
+    bounds = (str(dataset.min_date)[:10], str(dataset.max_date)[:10])
+    return f"http://127.0.0.1:{server.server_port}", server, bounds
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--url', help="base URL of a running dashboard (default: start one in-process)")
+    parser.add_argument('--clients', type=int, default=16, help="concurrent simulated users")
+    parser.add_argument('--duration', type=float, default=30, help="seconds to run")
+    parser.add_argument('--requests', type=int, default=None, help="stop after this many callbacks instead")
+    parser.add_argument('--think-ms', type=float, default=0, help="mean pause between a user's interactions")
+    parser.add_argument('--zoom-fraction', type=float, default=0.2, help="share of interactions with a zoomed chart")
+    parser.add_argument('--warmup', type=float, default=2, help="seconds of unmeasured load first")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', metavar='PATH', help="save the summary as JSON")
+    parser.add_argument('--max-p99-ms', type=float, default=None, help="exit with status 1 when update_chart's p99 exceeds this")
+    args = parser.parse_args()
+
+    bounds = DATE_BOUNDS
+    server = None
+    url = args.url
+    if url is None:
+        url, server, bounds = start_local_server()
+
+    try:
+        if args.warmup:
+            run_load(url, args.clients, duration=args.warmup, seed=args.seed + 1, bounds=bounds)
+        result = run_load(url, args.clients, None if args.requests else args.duration, args.requests, args.seed,
+                          bounds, args.zoom_fraction, args.think_ms / 1000)
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    summary = summarize(result)
+    print_summary(summary)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(summary, f, indent=2)
+        print(f"Summary saved to: {args.json}")
+
+    chart = summary['callbacks'].get('update_chart', {})
+    if sum(stats['errors'] for stats in summary['callbacks'].values()):
+        sys.exit("Some callbacks failed")
+    if args.max_p99_ms is not None and chart.get('p99_ms', float('inf')) > args.max_p99_ms:
+        sys.exit(f"update_chart p99 {chart.get('p99_ms')} ms exceeds {args.max_p99_ms} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Run the ingest and representative dashboard queries on synthetic data at
+several scales and compare wall time, peak memory and payload size with a
+stored baseline. Exits with status 1 when a measurement regresses.
+
+Usage: python benchmarks/scale_suite.py [--scales 1,10,100,1000] [--update-baseline]
+
+Each stage runs in its own process so its peak resident memory can be
+measured. Scales of STREAMING_SCALE and above use the streaming ingest,
+which keeps the ingest's memory bounded.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scale_baseline.json')
+DEFAULT_SCALES = '1,10,100'
+STREAMING_SCALE = 1000
+
+# Allowed growth over the baseline before a measurement counts as a regression;
+# time differences below MIN_SECONDS are noise
+TIME_TOLERANCE = 0.5
+MEMORY_TOLERANCE = 0.2
+PAYLOAD_TOLERANCE = 0.05
+MIN_SECONDS = 0.05
+
+# Representative chart queries: (name, start date, end date, region, relayoutData)
+QUERIES = [
+    ('full_range', None, None, 'all', None),
+    ('one_year_region', '2020-01-01', '2020-12-31', 'north', None),
+    ('price_increase', '2020-12-01', '2021-02-28', 'all', None),
+    ('zoomed', None, None, 'all', {'xaxis.range[0]': '2021-01-01', 'xaxis.range[1]': '2021-03-31'})
+]
+
+def run_ingest(workdir, scale):
+    """
+    Ingest the generated files and return the wall time and output rows.
+    """
+    from process_soul_foods_data import discover_input_files, process_soul_foods_data
+
+    csv_files = discover_input_files(os.path.join(workdir, 'data', 'daily_sales_data_*.csv'))
+    start = time.perf_counter()
+    result = process_soul_foods_data(csv_files, streaming=scale >= STREAMING_SCALE)
+    seconds = time.perf_counter() - start
+    rows = sum(1 for _ in open('soul_foods_pink_morsels_sales.csv')) - 1 if isinstance(result, str) else len(result)
+    return {'seconds': seconds, 'rows': rows}
+
+def run_dashboard(repeat=3):
+    """
+    Load the dashboard on the ingested data and time every query with an empty cache.
+    """
+    from plotly.io.json import to_json_plotly
+
+    start = time.perf_counter()
+    import soul_foods_dashboard as dashboard
+    results = {'startup_seconds': time.perf_counter() - start, 'queries': {}}
+
+    for name, start_date, end_date, region, relayout_data in QUERIES:
+        best = float('inf')
+        for _ in range(repeat):
+            dashboard.chart_cache.clear()
+            query_start = time.perf_counter()
+            dashboard.update_chart(start_date, end_date, region, relayout_data)
+            dashboard.update_summary(start_date, end_date, region)
+            best = min(best, time.perf_counter() - query_start)
+        chart = dashboard.chart_data(start_date, end_date, region, dashboard.zoom_window(relayout_data))
+        results['queries'][name] = {'seconds': best, 'payload_bytes': len(to_json_plotly(chart))}
+    return results
+
+def run_stage(stage, workdir, scale):
+    """
+    Run one stage in a child process and return its result with the peak RSS in MB.
+    """
+    env = dict(os.environ, PYTHONPATH=REPO_DIR, SOUL_FOODS_RELOAD_SECONDS='0', SOUL_FOODS_METRICS='0')
+    process = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), '--stage', stage, '--workdir', workdir, '--scales', str(scale)],
+        cwd=workdir, env=env, stdout=subprocess.PIPE, text=True
+    )
+    output = process.stdout.read()
+    _, status, usage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    if process.returncode != 0:
+        raise RuntimeError(f"{stage} stage failed at scale {scale}")
+    result = json.loads(output.strip().splitlines()[-1])
+    result['peak_mb'] = usage.ru_maxrss / 1024
+    return result
+
+def measure_scale(scale):
+    """
+    Generate data at one scale, then measure the ingest and dashboard stages.
+    """
+    from generate_soul_foods_data import generate_soul_foods_data
+
+    with tempfile.TemporaryDirectory(prefix=f"soul_foods_scale_{scale}_") as workdir:
+        generate_soul_foods_data(os.path.join(workdir, 'data'), scale=scale)
+        ingest = run_stage('ingest', workdir, scale)
+        dashboard = run_stage('dashboard', workdir, scale)
+    return {
+        'rows': ingest['rows'],
+        'ingest_seconds': ingest['seconds'],
+        'ingest_peak_mb': ingest['peak_mb'],
+        'startup_seconds': dashboard['startup_seconds'],
+        'dashboard_peak_mb': dashboard['peak_mb'],
+        'queries': dashboard['queries']
+    }
+
+def regressions(scale, result, baseline):
+    """
+    Return messages for every measurement that grew beyond its tolerance.
+    """
+    checks = [
+        ('ingest_seconds', result['ingest_seconds'], baseline['ingest_seconds'], TIME_TOLERANCE),
+        ('ingest_peak_mb', result['ingest_peak_mb'], baseline['ingest_peak_mb'], MEMORY_TOLERANCE),
+        ('startup_seconds', result['startup_seconds'], baseline['startup_seconds'], TIME_TOLERANCE),
+        ('dashboard_peak_mb', result['dashboard_peak_mb'], baseline['dashboard_peak_mb'], MEMORY_TOLERANCE)
+    ]
+    for name, query in result['queries'].items():
+        if name in baseline['queries']:
+            expected = baseline['queries'][name]
+            checks.append((f"{name}.seconds", query['seconds'], expected['seconds'], TIME_TOLERANCE))
+            checks.append((f"{name}.payload_bytes", query['payload_bytes'], expected['payload_bytes'], PAYLOAD_TOLERANCE))
+
+    messages = []
+    for name, value, expected, tolerance in checks:
+        if name.endswith('seconds') and value - expected < MIN_SECONDS:
+            continue
+        if value > expected * (1 + tolerance):
+            messages.append(f"{scale}x {name}: {value:,.3f} vs baseline {expected:,.3f} (+{value / expected - 1:.0%})")
+    return messages
+
+def print_result(scale, result):
+    print(f"\n{scale}x: {result['rows']:,} pink morsel rows")
+    print(f"  ingest    {result['ingest_seconds']:>8.3f}s  peak {result['ingest_peak_mb']:>8.1f} MB")
+    print(f"  dashboard {result['startup_seconds']:>8.3f}s  peak {result['dashboard_peak_mb']:>8.1f} MB (startup)")
+    for name, query in result['queries'].items():
+        print(f"  {name:<16} {query['seconds'] * 1000:>8.1f} ms  {query['payload_bytes']:>10,} bytes")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scales', default=DEFAULT_SCALES, help="comma separated scale factors")
+    parser.add_argument('--baseline', default=BASELINE_FILE, help="baseline JSON file")
+    parser.add_argument('--update-baseline', action='store_true', help="store these results as the baseline")
+    parser.add_argument('--stage', choices=['ingest', 'dashboard'], help=argparse.SUPPRESS)
+    parser.add_argument('--workdir', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    scales = [int(scale) for scale in args.scales.split(',')]
+
+    # Child process of run_stage
+    if args.stage == 'ingest':
+        result = run_ingest(args.workdir, scales[0])
+        print(json.dumps(result))
+        return
+    if args.stage == 'dashboard':
+        result = run_dashboard()
+        print(json.dumps(result))
+        return
+
+    baseline = {'scales': {}}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    results = {}
+    failures = []
+    for scale in scales:
+        results[str(scale)] = result = measure_scale(scale)
+        print_result(scale, result)
+        if str(scale) in baseline['scales']:
+            failures += regressions(scale, result, baseline['scales'][str(scale)])
+        else:
+            print(f"  (no baseline for {scale}x)")
+
+    if args.update_baseline:
+        baseline['scales'].update(results)
+        baseline['machine'] = f"{platform.system()} {platform.machine()}, {os.cpu_count()} CPU, Python {platform.python_version()}"
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"\nBaseline saved to: {args.baseline}")
+        return
+
+    if failures:
+        print("\nRegressions:")
+        for message in failures:
+            print(f"  {message}")
+        sys.exit(1)
+    print("\nNo regressions against the baseline.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Measure dashboard throughput and memory as the number of gunicorn workers
+grows, with the memory-mapped shared index and with a private copy per worker.
+
+Usage: python benchmarks/worker_scaling.py [--rows 2000000] [--workers 1,2,4] [--requests 400]
+
+Requires gunicorn. Every run serves a synthetic processed sales file from a
+temporary directory and replays the same random interactions (chart, summary
+and insight callbacks) with the load_test.py clients.
+Memory is the proportional set size (PSS) of the workers, which splits
+shared pages between the processes mapping them.
+"""
+import argparse
+import http.client
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from load_test import REGIONS, run_load, summarize
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def write_sales_file(path, rows, seed=0):
+    """
+    Write a synthetic processed sales file (sales, date, region).
+    """
+    rng = np.random.default_rng(seed)
+    days = np.datetime64('2018-02-06') + rng.integers(0, 1470, rows).astype('timedelta64[D]')
+    pd.DataFrame({
+        'sales': rng.integers(100, 100000, rows) / 100,
+        'date': days.astype(str),
+        'region': np.array(REGIONS[1:])[rng.integers(0, len(REGIONS) - 1, rows)]
+    }).to_csv(path, index=False)
+
+def child_pids(pid):
+    """
+    Return the pids of a process's children, from /proc.
+    """
+    children = []
+    for name in os.listdir('/proc'):
+        if name.isdigit():
+            try:
+                with open(f"/proc/{name}/stat") as f:
+                    if int(f.read().rsplit(')', 1)[1].split()[1]) == pid:
+                        children.append(int(name))
+            except (OSError, IndexError, ValueError):
+                continue
+    return children
+
+def pss_bytes(pid):
+    """
+    Return the proportional set size of a process, from /proc/<pid>/smaps_rollup.
+    """
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            if line.startswith('Pss:'):
+                return int(line.split()[1]) * 1024
+    return 0
+
+def wait_for_workers(master, workers, port, timeout=300):
+    """
+    Wait until the server answers and every worker's memory stops growing (its data is loaded).
+    """
+    deadline = time.time() + timeout
+    last = None
+    while time.time() < deadline:
+        time.sleep(1)
+        pids = child_pids(master.pid)
+        if master.poll() is not None:
+            raise RuntimeError("gunicorn exited")
+        if len(pids) < workers:
+            continue
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+            connection.request('GET', '/cache-stats')
+            connection.getresponse().read()
+        except OSError:
+            continue
+        sizes = sorted(pss_bytes(pid) for pid in pids)
+        if sizes == last:
+            return pids
+        last = sizes
+    raise RuntimeError("workers did not start")
+
+def serve(data_dir, workers, shared, port):
+    """
+    Start gunicorn with the WSGI factory on the synthetic data.
+    """
+    env = dict(
+        os.environ,
+        PYTHONPATH=REPO_DIR,
+        SOUL_FOODS_RELOAD_SECONDS='0',
+        SOUL_FOODS_SHARED_DIR=os.path.join(data_dir, 'shared') if shared else ''
+    )
+    return subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--workers', str(workers), '--bind', f"127.0.0.1:{port}",
+         '--timeout', '300', 'soul_foods_wsgi:create_app()'],
+        cwd=data_dir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=2000000, help="rows in the synthetic sales file")
+    parser.add_argument('--workers', default='1,2,4', help="comma separated worker counts")
+    parser.add_argument('--requests', type=int, default=400, help="callbacks per run")
+    parser.add_argument('--clients', type=int, default=8, help="concurrent simulated users")
+    parser.add_argument('--port', type=int, default=8061)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_sales_file(os.path.join(data_dir, 'soul_foods_pink_morsels_sales.csv'), args.rows)
+
+        print(f"{'index':>8} {'workers':>7} | {'req/s':>8} {'chart p50 ms':>12} {'chart p99 ms':>12} | {'total PSS MB':>12} {'MB/worker':>9}")
+        for shared in (True, False):
+            for workers in [int(n) for n in args.workers.split(',')]:
+                master = serve(data_dir, workers, shared, args.port)
+                try:
+                    pids = wait_for_workers(master, workers, args.port)
+                    url = f"http://127.0.0.1:{args.port}"
+                    run_load(url, args.clients, requests=min(args.requests, 48), seed=1)
+                    summary = summarize(run_load(url, args.clients, requests=args.requests))
+                    pss = sum(pss_bytes(pid) for pid in pids) / 1e6
+                finally:
+                    master.terminate()
+                    master.wait()
+                chart = summary['callbacks']['update_chart']
+                print(f"{'shared' if shared else 'private':>8} {workers:>7} | {summary['requests_per_second']:>8.1f} "
+                      f"{chart['p50_ms']:>12.1f} {chart['p99_ms']:>12.1f} | {pss:>12.1f} {pss / workers:>9.1f}")
+
+if __name__ == "__main__":
+    main()
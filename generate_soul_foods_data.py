@@ -0,0 +1,155 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+# Products and prices of the sample files, in their order within a day; pink
+# morsels went from $3.00 to $5.00 on the price increase date
+PRODUCTS = [
+    ('pink morsel', 300),
+    ('gold morsel', 999),
+    ('magenta morsel', 250),
+    ('chartreuse morsel', 300),
+    ('periwinkle morsel', 125),
+    ('vermilion morsel', 499),
+    ('lapis morsel', 199)
+]
+PINK_MORSEL_NEW_PRICE = 500
+PRICE_INCREASE_DATE = '2021-01-15'
+
+# Regions of the sample files, then extra regions used at larger scales
+REGIONS = ['north', 'south', 'east', 'west', 'central', 'northeast', 'northwest', 'southeast', 'southwest']
+
+# Date range of the sample files: 1470 days split over 3 files
+START_DATE = '2018-02-06'
+DEFAULT_DAYS = 1470
+DEFAULT_FILES = 3
+
+# Quantities of the sample files lie between 400 and 600
+MIN_QUANTITY = 400
+MAX_QUANTITY = 600
+
+# Rows generated and written per batch, to bound memory at large scales
+BATCH_ROWS = 1000000
+
+def product_names(n_products):
+    """
+    Return n product names and prices in cents: the sample products first.
+    """
+    products = list(PRODUCTS[:n_products])
+    for i in range(len(products), n_products):
+        products.append((f"morsel {i + 1}", 100 + (i * 137) % 900))
+    return products
+
+def region_names(n_regions):
+    """
+    Return n region names: the sample regions first.
+    """
+    return REGIONS[:n_regions] + [f"region {i + 1}" for i in range(len(REGIONS), n_regions)]
+
+def scale_config(scale):
+    """
+    Return the generator settings of a scale factor relative to the sample data.
+    Scale multiplies the records per product, region and day, and the number
+    of files grows with its square root so each file stays a manageable size.
+    """
+    return {
+        'records_per_day': scale,
+        'files': DEFAULT_FILES * int(np.ceil(np.sqrt(scale)))
+    }
+
+def format_prices(cents):
+    """
+    Format integer cents as "$x.xx" strings; each distinct price is formatted once.
+    """
+    unique, inverse = np.unique(np.asarray(cents, dtype=np.int64), return_inverse=True)
+    return np.array([f"${value // 100}.{value % 100:02d}" for value in unique], dtype=object)[inverse]
+
+def write_file(path, days, products, regions, records_per_day, rng):
+    """
+    Write one daily sales file covering the given days. Within a day rows are
+    ordered by product, then region, then record, like the sample files.
+    """
+    names = np.array([name for name, _ in products], dtype=object)
+    prices = np.array([price for _, price in products], dtype=np.int64)
+    region_array = np.array(regions, dtype=object)
+    rows_per_day = len(products) * len(regions) * records_per_day
+    increase_day = np.datetime64(PRICE_INCREASE_DATE, 'D')
+
+    days_per_batch = max(1, BATCH_ROWS // rows_per_day)
+    with open(path, 'w', newline='') as f:
+        f.write('product,price,quantity,date,region\n')
+        for lo in range(0, len(days), days_per_batch):
+            batch_days = days[lo:lo + days_per_batch]
+            day_index = np.repeat(np.arange(len(batch_days)), rows_per_day)
+            within_day = np.tile(np.arange(rows_per_day), len(batch_days))
+            product_index = within_day // (len(regions) * records_per_day)
+            region_index = (within_day // records_per_day) % len(regions)
+
+            row_days = batch_days[day_index]
+            row_prices = prices[product_index]
+            row_prices = np.where((product_index == 0) & (names[0] == 'pink morsel') & (row_days >= increase_day),
+                                  PINK_MORSEL_NEW_PRICE, row_prices)
+            pd.DataFrame({
+                'product': names[product_index],
+                'price': format_prices(row_prices),
+                'quantity': rng.integers(MIN_QUANTITY, MAX_QUANTITY + 1, len(day_index)),
+                'date': row_days.astype(str),
+                'region': region_array[region_index]
+            }).to_csv(f, index=False, header=False)
+
+def generate_soul_foods_data(output_dir='data', scale=1, years=None, regions=4, products=len(PRODUCTS),
+                             files=None, records_per_day=None, seed=0, start_date=START_DATE):
+    """
+    Write synthetic daily_sales_data_*.csv files in the schema of the sample
+    data (product, "$x.xx" price, quantity, date, region).
+
+    At scale 1 with the defaults the files have the shape of the sample
+    data: 3 files of 13,720 rows, 7 products, 4 regions and 1470 days. The
+    scale multiplies the records per product, region and day (see
+    scale_config); years, regions, products, files and records_per_day
+    override the individual settings. Days are split into contiguous ranges,
+    one per file. Returns the paths written.
+    """
+    config = scale_config(scale)
+    files = files or config['files']
+    records_per_day = records_per_day or config['records_per_day']
+    n_days = DEFAULT_DAYS if years is None else max(1, int(round(years * 365.25)))
+    all_days = np.datetime64(start_date, 'D') + np.arange(n_days)
+    product_list = product_names(products)
+    region_list = region_names(regions)
+    rng = np.random.default_rng(seed)
+
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for i, days in enumerate(np.array_split(all_days, files)):
+        if len(days) == 0:
+            continue
+        path = os.path.join(output_dir, f"daily_sales_data_{i}.csv")
+        write_file(path, days, product_list, region_list, records_per_day, rng)
+        paths.append(path)
+
+    rows = n_days * len(product_list) * len(region_list) * records_per_day
+    print(f"Generated {rows:,} rows in {len(paths)} files under {output_dir}")
+    return paths
+
+def parse_args():
+    """
+    Parse command line options for the generator.
+    """
+    parser = argparse.ArgumentParser(description="Write synthetic Soul Foods daily sales files at a configurable scale.")
+    parser.add_argument('--output-dir', default='data', help="directory for the daily_sales_data_*.csv files")
+    parser.add_argument('--scale', type=int, default=1, help="size relative to the sample data (records per product, region and day)")
+    parser.add_argument('--years', type=float, default=None, help=f"years of data from {START_DATE} (default: {DEFAULT_DAYS} days)")
+    parser.add_argument('--regions', type=int, default=4, help="number of regions")
+    parser.add_argument('--products', type=int, default=len(PRODUCTS), help="number of products (pink morsel first)")
+    parser.add_argument('--files', type=int, default=None, help="number of files (default: from the scale)")
+    parser.add_argument('--records-per-day', type=int, default=None, help="rows per product, region and day (default: the scale)")
+    parser.add_argument('--seed', type=int, default=0, help="random seed for the quantities")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    generate_soul_foods_data(args.output_dir, args.scale, args.years, args.regions, args.products,
+                             args.files, args.records_per_day, args.seed)
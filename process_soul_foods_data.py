@@ -1,76 +1,733 @@
 import pandas as pd
+import argparse
+import glob
+import hashlib
+import heapq
+import io
+import json
 import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 
-def process_soul_foods_data():
+from soul_foods_metrics import metrics
+from soul_foods_money import parse_price_cents
+from soul_foods_sqlite import SQLITE_FILE, write_sales_db
+from soul_foods_store import PRODUCTS_CSV_FILE, PRODUCTS_STORE_DIR, SALES_CSV_FILE, STORE_DIR, write_sales_store
+
+# Glob pattern used to discover the daily sales files
+DATA_FILE_PATTERN = 'data/daily_sales_data_*.csv'
+
+# Output file and the manifest used by incremental runs
+OUTPUT_FILE = SALES_CSV_FILE
+PRODUCTS_OUTPUT_FILE = PRODUCTS_CSV_FILE
+MANIFEST_FILE = 'soul_foods_manifest.json'
+MANIFEST_VERSION = 2
+
+# Bytes of each raw file the latest output was built from, written next to the output
+# for the dashboard's live mode
+OFFSETS_VERSION = 1
+OFFSETS_FILE = os.path.splitext(OUTPUT_FILE)[0] + '_offsets.json'
+
+# Memory ceiling for streaming runs and a rough in-memory size of one raw row
+DEFAULT_MEMORY_LIMIT_MB = 256
+RAW_ROW_BYTES = 400
+
+# Only these columns are needed to compute pink morsel sales; the few
+# distinct products and regions are read as categoricals
+INPUT_COLUMNS = ['product', 'price', 'quantity', 'date', 'region']
+INPUT_DTYPES = {
+    'product': 'category',
+    'price': str,
+    'quantity': 'int64',
+    'date': str,
+    'region': 'category'
+}
+
+# Histogram of the time spent in each ingest phase
+INGEST_PHASE_METRIC = 'soul_foods_ingest_phase_seconds'
+metrics.describe(INGEST_PHASE_METRIC, 'histogram', "Time spent in each ingest phase")
+
+def phase(name):
+    """
+    Return a timer for one ingest phase (a no-op unless metrics are enabled).
+    """
+    return metrics.timer(INGEST_PHASE_METRIC, phase=name)
+
+def discover_input_files(pattern=DATA_FILE_PATTERN):
+    """
+    Return the daily sales files matching the glob pattern, in a stable order.
+    """
+    return sorted(glob.glob(pattern))
+
+class LimitedReader(io.RawIOBase):
+    """
+    Read-only view of the first `limit` bytes of an open binary file.
+    """
+
+    def __init__(self, raw, limit):
+        self.raw = raw
+        self.remaining = limit
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        n = min(len(buffer), self.remaining)
+        if n <= 0:
+            return 0
+        n = self.raw.readinto(memoryview(buffer)[:n])
+        self.remaining -= n
+        return n
+
+    def close(self):
+        self.raw.close()
+        super().close()
+
+def ingest_size(file_path):
+    """
+    Return how many bytes of a raw file an ingest reads: the file as it is
+    now, up to the end of its last complete line. A last line without a line
+    break may still be being written, so it is left for a later run, as the
+    dashboard's live mode does.
+    """
+    size = os.path.getsize(file_path)
+    with open(file_path, 'rb') as f:
+        end = size
+        while end > 0:
+            start = max(0, end - (1 << 16))
+            f.seek(start)
+            i = f.read(end - start).rfind(b'\n')
+            if i >= 0:
+                return start + i + 1
+            end = start
+    return 0
+
+def open_raw_file(file_path, size=None):
+    """
+    Open a raw file for parsing, limited to its first `size` bytes when given.
+    """
+    if size is None:
+        return open(file_path, 'rb')
+    return io.BufferedReader(LimitedReader(open(file_path, 'rb'), size))
+
+def read_raw_file(file_path, size=None):
+    """
+    Parse the needed columns of a raw file (its first `size` bytes when given) with explicit dtypes.
+    """
+    with phase('read'), open_raw_file(file_path, size) as f:
+        return pd.read_csv(f, usecols=INPUT_COLUMNS, dtype=INPUT_DTYPES)
+
+def read_pink_morsels(file_path, size=None):
+    """
+    Read one daily sales file and return its pink morsel sales.
+    Only the needed columns are parsed, with explicit dtypes, and rows are
+    filtered before any price parsing so non pink morsel rows cost nothing.
+    """
+    return filter_pink_morsels(read_raw_file(file_path, size))
+
+def filter_pink_morsels(df):
+    """
+    Keep the pink morsel rows of a raw sales frame and compute their sales.
+    """
+    # Filter for pink morsels only (case insensitive)
+    with phase('filter'):
+        pink_morsels = df[df['product'].str.lower() == 'pink morsel'].copy()
+
+    # Calculate sales (price * quantity) in exact integer cents
+    with phase('parse'):
+        pink_morsels['sales'] = parse_price_cents(pink_morsels['price']) * pink_morsels['quantity'].to_numpy() / 100
+
+    # Select only the required columns, with plain string regions for the output
+    pink_morsels['region'] = pink_morsels['region'].astype(str)
+    return pink_morsels[['sales', 'date', 'region']].reset_index(drop=True)
+
+def read_all_products(file_path, size=None):
+    """
+    Read one daily sales file and return the sales of every product.
+    """
+    return compute_product_sales(read_raw_file(file_path, size))
+
+def compute_product_sales(df):
+    """
+    Compute the sales of every row of a raw sales frame, keeping its product.
+    Prices are parsed once for all rows, so the cost follows the input size
+    rather than the number of products.
+    """
+    with phase('parse'):
+        return pd.DataFrame({
+            'sales': parse_price_cents(df['price']) * df['quantity'].to_numpy() / 100,
+            'date': df['date'],
+            'region': df['region'].astype(str),
+            'product': df['product'].str.lower()
+        })
+
+def timed_read(reader, file_path, size=None, timing=False):
+    """
+    Run reader on one file in a worker process and return its frame with the
+    phase timings it recorded there, so the parent can add them to its report.
+    """
+    metrics.enabled = timing
+    metrics.reset()
+    df = reader(file_path, size)
+    return df, metrics.totals(INGEST_PHASE_METRIC, 'phase')
+
+def read_input_files(csv_files, parallel=False, workers=None, reader=read_pink_morsels, label='pink morsel', offsets=None):
+    """
+    Parse the given files with reader and return a list of (file_path, frame).
+    Missing files are reported and skipped. Each file is read up to its
+    ingest_size, which is recorded in `offsets` when given.
+    """
+    existing_files = []
+    sizes = []
+    for file_path in csv_files:
+        if os.path.exists(file_path):
+            existing_files.append(file_path)
+            sizes.append(ingest_size(file_path))
+        else:
+            print(f"Warning: File {file_path} not found")
+    if offsets is not None:
+        offsets.update(zip(existing_files, sizes))
+
+    # Parse every file, in a process pool when running in parallel mode
+    if parallel and len(existing_files) > 1:
+        print(f"Processing {len(existing_files)} files with {workers or os.cpu_count()} workers...")
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            timed_results = list(executor.map(timed_read, repeat(reader), existing_files, sizes, repeat(metrics.enabled)))
+        results = []
+        for processed_df, phases in timed_results:
+            for name, totals in phases.items():
+                metrics.observe(INGEST_PHASE_METRIC, totals['seconds'], phase=name)
+            results.append(processed_df)
+    else:
+        results = []
+        for file_path, size in zip(existing_files, sizes):
+            print(f"Processing {file_path}...")
+            results.append(reader(file_path, size))
+
+    for file_path, processed_df in zip(existing_files, results):
+        if len(processed_df) > 0:
+            print(f"  - Found {len(processed_df)} {label} records in {file_path}")
+        else:
+            print(f"  - No {label} records found in {file_path}")
+
+    return list(zip(existing_files, results))
+
+def write_output(combined_df, output_file, store_dir=STORE_DIR, db_file=None, offsets=None):
+    """
+    Sort the combined sales by date and region, save them and print a summary.
+    The columnar store is rewritten too unless store_dir is None, and the
+    SQLite database when db_file is given. The bytes of each raw file the
+    output was built from (`offsets`) are recorded last, see save_offsets.
+    """
+    # Sort by date and region for better organization
+    with phase('sort'):
+        combined_df = combined_df.sort_values(['date', 'region'])
+
+    # Save to output file
+    with phase('write_csv'):
+        combined_df.to_csv(output_file, index=False)
+    if store_dir is not None:
+        with phase('write_store'):
+            write_sales_store([combined_df], store_dir, output_file)
+    if db_file is not None:
+        with phase('write_db'):
+            write_sales_db([combined_df], db_file)
+    if offsets is not None:
+        save_offsets(offsets, offsets_file_for(output_file))
+
+    print(f"\nProcessing complete!")
+    print(f"Total records: {len(combined_df)}")
+    print(f"Output saved to: {output_file}")
+
+    # Display sample of the output
+    print(f"\nSample of processed data:")
+    print(combined_df.head(10))
+
+    # Display summary statistics
+    print(f"\nSummary by region:")
+    print(combined_df.groupby('region')['sales'].agg(['count', 'sum', 'mean']).round(2))
+
+    return combined_df
+
+def write_products_output(products_df, products_file, store_dir=PRODUCTS_STORE_DIR):
+    """
+    Sort the sales of every product by date, region and product, save them
+    and print a per-product summary. The product-partitioned store is
+    rewritten too unless store_dir is None.
+    """
+    with phase('sort'):
+        products_df = products_df.sort_values(['date', 'region', 'product'], kind='stable')
+
+    with phase('write_csv'):
+        products_df.to_csv(products_file, index=False)
+    if store_dir is not None:
+        with phase('write_store'):
+            write_sales_store([products_df], store_dir, products_file)
+
+    print(f"\nAll products saved to: {products_file}")
+    print(f"\nSummary by product:")
+    print(products_df.groupby('product')['sales'].agg(['count', 'sum', 'mean']).round(2))
+
+    return products_df
+
+def process_all_products(csv_files, parallel, workers, output_file, products_file, store_dir, products_store_dir,
+                         db_file=None):
+    """
+    Scan the raw files once and write every product's sales, partitioned by
+    product and region, together with the usual pink morsel output derived
+    from the same scan.
+    """
+    offsets = {}
+    processed_dfs = [
+        df for _, df in read_input_files(csv_files, parallel, workers, read_all_products, 'sales', offsets)
+        if len(df) > 0
+    ]
+    if not processed_dfs:
+        print("No data was processed. Please check the input files.")
+        return None
+
+    with phase('concat'):
+        products_df = pd.concat(processed_dfs, ignore_index=True)
+
+    # The pink morsel output is a subset of the same scan
+    with phase('filter'):
+        pink_morsels = products_df[products_df['product'] == 'pink morsel']
+    write_output(pink_morsels[['sales', 'date', 'region']].reset_index(drop=True), output_file, store_dir, db_file,
+                 offsets)
+
+    return write_products_output(products_df, products_file, products_store_dir)
+
+def process_soul_foods_data(csv_files=None, parallel=False, workers=None, incremental=False,
+                            streaming=False, memory_limit_mb=DEFAULT_MEMORY_LIMIT_MB,
+                            output_file=OUTPUT_FILE, manifest_file=MANIFEST_FILE, store_dir=STORE_DIR,
+                            all_products=False, products_file=PRODUCTS_OUTPUT_FILE,
+                            products_store_dir=PRODUCTS_STORE_DIR, db_file=None, timing_report=None):
     """
     Process Soul Foods CSV files to extract pink morsel data and calculate sales.
     Output will contain: Sales, Date, Region
+
+    Input files are discovered with DATA_FILE_PATTERN unless csv_files is given.
+    With parallel=True the files are parsed concurrently in a process pool of
+    `workers` processes (defaults to the CPU count); the combined output is
+    identical to the single-process run.
+
+    With incremental=True only new or changed files (according to the
+    manifest) are parsed and merged into the existing output. Returns None
+    when nothing changed.
+
+    With streaming=True the files are read in chunks and sorted out of core
+    so peak memory stays under memory_limit_mb; the output file path is
+    returned instead of a DataFrame.
+
+    Besides the CSV, a columnar store partitioned by region and month is
+    written to store_dir for the dashboard (skipped when store_dir is None).
+    With db_file, the rows are also bulk-loaded into a SQLite database for
+    the dashboard's SQLite backend.
+
+    With all_products=True every product is kept in one pass over the files:
+    products_file and a store partitioned by product, region and month
+    (products_store_dir) are written besides the pink morsel output, and
+    the frame of all products is returned. This mode cannot be combined
+    with incremental or streaming runs.
+
+    With timing_report, the time spent in each phase (read, filter, parse,
+    concat, sort and the writes) is saved to that path as JSON.
     """
-    
+
     # List of CSV files to process
-    csv_files = [
-        'data/daily_sales_data_0.csv',
-        'data/daily_sales_data_1.csv', 
-        'data/daily_sales_data_2.csv'
-    ]
-    
+    if csv_files is None:
+        csv_files = discover_input_files()
+
+    if timing_report is None:
+        return run_ingest(csv_files, parallel, workers, incremental, streaming, memory_limit_mb, output_file,
+                          manifest_file, store_dir, all_products, products_file, products_store_dir, db_file)
+
+    # Time every phase of this run, including work done in worker processes
+    enabled = metrics.enabled
+    metrics.enabled = True
+    metrics.reset()
+    start = time.perf_counter()
+    try:
+        result = run_ingest(csv_files, parallel, workers, incremental, streaming, memory_limit_mb, output_file,
+                            manifest_file, store_dir, all_products, products_file, products_store_dir, db_file)
+        write_timing_report(timing_report, time.perf_counter() - start, csv_files,
+                            'all_products' if all_products else 'incremental' if incremental
+                            else 'streaming' if streaming else 'parallel' if parallel else 'serial')
+    finally:
+        metrics.enabled = enabled
+    return result
+
+def write_timing_report(report_file, total_seconds, csv_files, mode):
+    """
+    Save the per-phase timings of a run as JSON and print them.
+    Phases run once per file (read, filter, parse) are summed over the files;
+    in parallel runs they add up the workers' time, which can exceed the wall time.
+    """
+    phases = metrics.totals(INGEST_PHASE_METRIC, 'phase')
+    report = {
+        'mode': mode,
+        'files': len(csv_files),
+        'total_seconds': round(total_seconds, 6),
+        'phases': {
+            name: {'seconds': round(totals['seconds'], 6), 'calls': totals['calls']}
+            for name, totals in sorted(phases.items(), key=lambda item: -item[1]['seconds'])
+        }
+    }
+    with open(report_file, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\nTiming report saved to: {report_file}")
+    for name, totals in report['phases'].items():
+        print(f"  {name:<12} {totals['seconds']:>9.3f}s ({totals['calls']} calls)")
+    print(f"  {'total':<12} {total_seconds:>9.3f}s")
+    return report
+
+def run_ingest(csv_files, parallel, workers, incremental, streaming, memory_limit_mb, output_file,
+               manifest_file, store_dir, all_products, products_file, products_store_dir, db_file):
+    """
+    Dispatch a run to the all-products, incremental, streaming or in-memory path.
+    """
+    if all_products:
+        if incremental or streaming:
+            raise ValueError("all_products cannot be combined with incremental or streaming runs")
+        return process_all_products(csv_files, parallel, workers, output_file, products_file,
+                                    store_dir, products_store_dir, db_file)
+
+    if incremental:
+        return process_incrementally(csv_files, parallel, workers, output_file, manifest_file, store_dir, db_file)
+
+    if streaming:
+        return process_streaming(csv_files, output_file, memory_limit_mb, store_dir, db_file)
+
     # List to store processed dataframes
+    offsets = {}
+    processed_dfs = [df for _, df in read_input_files(csv_files, parallel, workers, offsets=offsets) if len(df) > 0]
+
+    if processed_dfs:
+        # Combine all processed dataframes
+        with phase('concat'):
+            combined_df = pd.concat(processed_dfs, ignore_index=True)
+        return write_output(combined_df, output_file, store_dir, db_file, offsets)
+    else:
+        print("No data was processed. Please check the input files.")
+        return None
+
+def file_sha256(file_path):
+    """
+    Return the hex SHA-256 digest of a file, read in blocks.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def load_manifest(manifest_file):
+    """
+    Load the manifest of processed source files, or an empty one.
+    """
+    if not os.path.exists(manifest_file):
+        return {'version': MANIFEST_VERSION, 'files': {}}
+    with open(manifest_file) as f:
+        manifest = json.load(f)
+    if manifest.get('version') != MANIFEST_VERSION:
+        return {'version': MANIFEST_VERSION, 'files': {}}
+    return manifest
+
+def save_manifest(manifest, manifest_file):
+    """
+    Write the manifest atomically so an interrupted run never leaves it half written.
+    """
+    tmp_file = manifest_file + '.tmp'
+    with open(tmp_file, 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_file, manifest_file)
+
+def offsets_file_for(output_file):
+    """
+    Return the file recording the raw file offsets an output was built from, next to the output.
+    """
+    return os.path.splitext(output_file)[0] + '_offsets.json'
+
+def load_offsets(offsets_file=OFFSETS_FILE):
+    """
+    Return {absolute raw file path: bytes ingested} recorded by the last ingest
+    that wrote the output, or None when no ingest has recorded them.
+    """
+    if not os.path.exists(offsets_file):
+        return None
+    with open(offsets_file) as f:
+        offsets = json.load(f)
+    if offsets.get('version') != OFFSETS_VERSION:
+        return None
+    return offsets['files']
+
+def save_offsets(offsets, offsets_file=OFFSETS_FILE):
+    """
+    Record how many bytes of each raw file the output was built from, so the
+    dashboard's live mode tails each file from exactly where this ingest
+    stopped reading it. Every ingest path writes it after its outputs.
+    """
+    files = {os.path.abspath(path): size for path, size in offsets.items()}
+    save_manifest({'version': OFFSETS_VERSION, 'files': files}, offsets_file)
+
+def parts_dir_for(manifest_file):
+    """
+    Return the directory holding the parsed rows of every source file, next to the manifest.
+    """
+    return os.path.splitext(manifest_file)[0] + '_parts'
+
+def part_path(parts_dir, file_path):
+    """
+    Return the part file holding one source file's parsed rows.
+    """
+    name = hashlib.sha256(os.path.abspath(file_path).encode()).hexdigest()[:16]
+    return os.path.join(parts_dir, f"{name}.csv")
+
+def read_part(path):
+    with phase('read'):
+        return pd.read_csv(path, dtype={'date': str, 'region': str})
+
+def process_incrementally(csv_files, parallel, workers, output_file, manifest_file, store_dir=STORE_DIR, db_file=None):
+    """
+    Parse only new or changed files and rebuild the output from every file's parsed rows.
+
+    The parsed rows of each source file are kept in their own part file
+    (next to the manifest), so a changed or deleted file replaces exactly
+    its own rows even when other files have rows for the same dates and
+    regions. The manifest only records each file's size, mtime and content
+    hash: a run with no changes stats the input files and reads a manifest
+    whose size depends on the number of files, not rows. Files whose size
+    and mtime are unchanged are not even hashed.
+    """
+    manifest = load_manifest(manifest_file)
+    parts_dir = parts_dir_for(manifest_file)
+    offsets = load_offsets(offsets_file_for(output_file)) or {}
+
+    # Without an existing output every file has to be processed again
+    if not os.path.exists(output_file):
+        manifest['files'] = {}
+
+    entries = manifest['files']
+    changed_files = []
+    manifest_dirty = False
+
+    for file_path in csv_files:
+        if not os.path.exists(file_path):
+            print(f"Warning: File {file_path} not found")
+            continue
+
+        stat = os.stat(file_path)
+        entry = entries.get(file_path)
+        if entry and not (os.path.exists(part_path(parts_dir, file_path))
+                          and os.path.abspath(file_path) in offsets):
+            entry = None
+        if entry and entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime_ns:
+            continue
+
+        with phase('hash'):
+            content_hash = file_sha256(file_path)
+        if entry and entry['sha256'] == content_hash:
+            # Touched but not modified: only refresh the recorded stat
+            entry['size'] = stat.st_size
+            entry['mtime'] = stat.st_mtime_ns
+            manifest_dirty = True
+            continue
+
+        changed_files.append((file_path, stat, content_hash))
+
+    current_files = set(csv_files)
+    removed_files = [path for path in entries if path not in current_files or not os.path.exists(path)]
+
+    if not changed_files and not removed_files:
+        if manifest_dirty:
+            save_manifest(manifest, manifest_file)
+        print(f"No new or changed files - {output_file} is up to date")
+        return None
+
+    print(f"{len(changed_files)} new or changed files, {len(removed_files)} removed files")
+
+    # Drop the rows of removed files with their parts
+    for file_path in removed_files:
+        del entries[file_path]
+        if os.path.exists(part_path(parts_dir, file_path)):
+            os.remove(part_path(parts_dir, file_path))
+
+    # Parse the changed files and replace their parts
+    os.makedirs(parts_dir, exist_ok=True)
+    changed_offsets = {}
+    parsed = dict(read_input_files([path for path, _, _ in changed_files], parallel, workers, offsets=changed_offsets))
+    for file_path, stat, content_hash in changed_files:
+        with phase('write_csv'):
+            parsed[file_path].to_csv(part_path(parts_dir, file_path), index=False)
+        entries[file_path] = {'size': stat.st_size, 'mtime': stat.st_mtime_ns, 'sha256': content_hash}
+
+    # Changed files were read up to their new offsets, the others keep the recorded ones
+    offsets = {
+        file_path: changed_offsets[file_path] if file_path in changed_offsets else offsets[os.path.abspath(file_path)]
+        for file_path in entries
+    }
+
+    # Combine every file's rows in input order, like a full run
     processed_dfs = []
-    
     for file_path in csv_files:
-        if os.path.exists(file_path):
-            print(f"Processing {file_path}...")
-            
-            # Read CSV file
-            df = pd.read_csv(file_path)
-            
-            # Filter for pink morsels only (case insensitive)
-            pink_morsels = df[df['product'].str.lower() == 'pink morsel'].copy()
-            
-            if len(pink_morsels) > 0:
-                # Clean price column by removing '$' and converting to float
-                pink_morsels['price'] = pink_morsels['price'].str.replace('$', '').astype(float)
-                
-                # Calculate sales (price * quantity)
-                pink_morsels['sales'] = pink_morsels['price'] * pink_morsels['quantity']
-                
-                # Select only the required columns and rename for clarity
-                processed_df = pink_morsels[['sales', 'date', 'region']].copy()
-                
+        if file_path in entries:
+            processed_df = parsed[file_path] if file_path in parsed else read_part(part_path(parts_dir, file_path))
+            if len(processed_df) > 0:
                 processed_dfs.append(processed_df)
-                print(f"  - Found {len(pink_morsels)} pink morsel records")
-            else:
-                print(f"  - No pink morsel records found in {file_path}")
-        else:
-            print(f"Warning: File {file_path} not found")
-    
+
     if processed_dfs:
-        # Combine all processed dataframes
-        combined_df = pd.concat(processed_dfs, ignore_index=True)
-        
-        # Sort by date and region for better organization
-        combined_df = combined_df.sort_values(['date', 'region'])
-        
-        # Save to output file
-        output_file = 'soul_foods_pink_morsels_sales.csv'
-        combined_df.to_csv(output_file, index=False)
-        
-        print(f"\nProcessing complete!")
-        print(f"Total records: {len(combined_df)}")
-        print(f"Output saved to: {output_file}")
-        
-        # Display sample of the output
-        print(f"\nSample of processed data:")
-        print(combined_df.head(10))
-        
-        # Display summary statistics
-        print(f"\nSummary by region:")
-        print(combined_df.groupby('region')['sales'].agg(['count', 'sum', 'mean']).round(2))
-        
-        return combined_df
+        with phase('concat'):
+            combined_df = pd.concat(processed_dfs, ignore_index=True)
+        combined_df = write_output(combined_df, output_file, store_dir, db_file, offsets)
     else:
         print("No data was processed. Please check the input files.")
-        return None
+        combined_df = None
+
+    save_manifest(manifest, manifest_file)
+    return combined_df
+
+def sort_key(line):
+    """
+    Return the (date, region) sort key of an output CSV line.
+    """
+    _, date, region = line.rstrip('\r\n').split(',')
+    return date, region
+
+def process_streaming(csv_files, output_file, memory_limit_mb=DEFAULT_MEMORY_LIMIT_MB, store_dir=STORE_DIR, db_file=None):
+    """
+    Build the output with an external merge sort so memory stays bounded.
+
+    Files are read in fixed-size chunks. Filtered rows are buffered until
+    the buffer reaches about half the memory limit, then sorted by (date,
+    region) and written to a temporary run file. The runs are finally
+    combined with a k-way merge that holds one line per run in memory.
+    The output is byte-identical to the in-memory path. The columnar store
+    is then built from the sorted output, again chunk by chunk.
+    """
+    memory_limit = memory_limit_mb * 1024 * 1024
+    buffer_limit = memory_limit // 2
+    chunk_rows = max(1000, buffer_limit // RAW_ROW_BYTES)
+
+    with tempfile.TemporaryDirectory(prefix='soul_foods_runs_') as run_dir:
+        run_files = []
+        buffer = []
+        buffer_bytes = 0
+        total_records = 0
+        region_summary = {}
+        offsets = {}
+
+        def flush_run():
+            with phase('concat'):
+                run_df = pd.concat(buffer, ignore_index=True)
+            with phase('sort'):
+                run_df = run_df.sort_values(['date', 'region'], kind='stable')
+            run_file = os.path.join(run_dir, f"run_{len(run_files):06d}.csv")
+            with phase('write_runs'):
+                run_df.to_csv(run_file, index=False, header=False)
+            run_files.append(run_file)
+
+        for file_path in csv_files:
+            if not os.path.exists(file_path):
+                print(f"Warning: File {file_path} not found")
+                continue
+
+            print(f"Processing {file_path}...")
+            file_records = 0
+            offsets[file_path] = ingest_size(file_path)
+            with open_raw_file(file_path, offsets[file_path]) as f:
+                reader = pd.read_csv(f, usecols=INPUT_COLUMNS, dtype=INPUT_DTYPES, chunksize=chunk_rows)
+                while True:
+                    with phase('read'):
+                        chunk = next(reader, None)
+                    if chunk is None:
+                        break
+                    processed_df = filter_pink_morsels(chunk)
+                    if len(processed_df) == 0:
+                        continue
+
+                    file_records += len(processed_df)
+                    for region, sales in processed_df.groupby('region')['sales']:
+                        count, total = region_summary.get(region, (0, 0.0))
+                        region_summary[region] = (count + len(sales), total + sales.sum())
+
+                    buffer.append(processed_df)
+                    buffer_bytes += processed_df.memory_usage(deep=True).sum()
+                    if buffer_bytes >= buffer_limit:
+                        flush_run()
+                        buffer = []
+                        buffer_bytes = 0
+
+            total_records += file_records
+            print(f"  - Found {file_records} pink morsel records in {file_path}")
+
+        if buffer:
+            flush_run()
+            buffer = []
+
+        if not run_files:
+            print("No data was processed. Please check the input files.")
+            return None
+
+        # Merge the sorted runs into the output file
+        print(f"Merging {len(run_files)} sorted runs...")
+        run_handles = [open(run_file, newline='') for run_file in run_files]
+        try:
+            with phase('merge'), open(output_file, 'w', newline='') as out:
+                out.write('sales,date,region' + os.linesep)
+                out.writelines(heapq.merge(*run_handles, key=sort_key))
+        finally:
+            for handle in run_handles:
+                handle.close()
+
+    if store_dir is not None:
+        with phase('write_store'):
+            write_sales_store(pd.read_csv(output_file, dtype={'date': str, 'region': str}, chunksize=chunk_rows), store_dir,
+                              output_file)
+    if db_file is not None:
+        with phase('write_db'):
+            write_sales_db(pd.read_csv(output_file, dtype={'date': str, 'region': str}, chunksize=chunk_rows), db_file)
+    save_offsets(offsets, offsets_file_for(output_file))
+
+    print(f"\nProcessing complete!")
+    print(f"Total records: {total_records}")
+    print(f"Output saved to: {output_file}")
+
+    # Display summary statistics
+    print(f"\nSummary by region:")
+    summary = pd.DataFrame(
+        [(region, count, total, total / count) for region, (count, total) in sorted(region_summary.items())],
+        columns=['region', 'count', 'sum', 'mean']
+    ).set_index('region')
+    print(summary.round(2))
+
+    return output_file
+
+def parse_args():
+    """
+    Parse command line options for the ingest script.
+    """
+    parser = argparse.ArgumentParser(description="Process Soul Foods daily sales files into pink morsel sales.")
+    parser.add_argument('--parallel', action='store_true', help="parse input files concurrently in a process pool")
+    parser.add_argument('--workers', type=int, default=None, help="number of worker processes (default: CPU count)")
+    parser.add_argument('--incremental', action='store_true', help="only parse new or changed files, tracked in a manifest")
+    parser.add_argument('--no-store', action='store_true', help="do not write the columnar store")
+    parser.add_argument('--streaming', action='store_true', help="read in chunks and sort out of core with bounded memory")
+    parser.add_argument('--memory-limit-mb', type=int, default=DEFAULT_MEMORY_LIMIT_MB, help="memory ceiling for --streaming runs")
+    parser.add_argument('--sqlite', action='store_true', help=f"also bulk-load the sales into {SQLITE_FILE}")
+    parser.add_argument('--all-products', action='store_true', help="also write every product's sales, partitioned by product, in the same pass")
+    parser.add_argument('--timing-report', metavar='PATH', help="save the time spent in each phase as JSON to PATH")
+    args = parser.parse_args()
+    if args.all_products and (args.incremental or args.streaming):
+        parser.error("--all-products cannot be combined with --incremental or --streaming")
+    return args
 
 if __name__ == "__main__":
-    process_soul_foods_data() 
\ No newline at end of file
+    args = parse_args()
+    process_soul_foods_data(parallel=args.parallel, workers=args.workers, incremental=args.incremental,
+                            streaming=args.streaming, memory_limit_mb=args.memory_limit_mb,
+                            store_dir=None if args.no_store else STORE_DIR, all_products=args.all_products,
+                            products_store_dir=None if args.no_store else PRODUCTS_STORE_DIR,
+                            db_file=SQLITE_FILE if args.sqlite else None, timing_report=args.timing_report)
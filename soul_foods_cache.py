@@ -0,0 +1,90 @@
+import threading
+from collections import OrderedDict
+
+class LRUCache:
+    """
+    Thread-safe, size-bounded cache with least-recently-used eviction.
+
+    Values are computed outside the lock, so a slow computation never blocks
+    readers of other keys; two threads missing the same key at once may both
+    compute it and the last one stored wins.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+    def get_or_compute(self, key, compute):
+        """
+        Return the cached value for key, calling compute() to fill a miss.
+        """
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+
+        value = compute()
+
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        """
+        Drop every entry, keeping the counters.
+        """
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        """
+        Return the cache counters as a dict.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+class VersionedCache(LRUCache):
+    """
+    LRU cache whose entries belong to one version of the underlying data.
+
+    Keys are extended with the current data version and every entry is
+    dropped as soon as a different version is seen. Callers holding a
+    specific version of the data pass it explicitly, so a result is never
+    stored under a newer version than the one it was computed from.
+    """
+
+    def __init__(self, version_func, maxsize=256):
+        super().__init__(maxsize)
+        self.version_func = version_func
+        self.version = None
+
+    def get_or_compute(self, key, compute, version=None):
+        if version is None:
+            version = self.version_func()
+        with self._lock:
+            if version != self.version:
+                self._data.clear()
+                self.version = version
+        return super().get_or_compute(key + (version,), compute)
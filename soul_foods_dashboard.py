@@ -1,225 +1,663 @@
 import dash
-from dash import dcc, html
-from dash.dependencies import Input, Output
+from dash import Patch, dcc, html, no_update
+from dash.dependencies import ClientsideFunction, Input, Output, State
+from dash.exceptions import MissingCallbackContextException, PreventUpdate
 import plotly.express as px
-import plotly.graph_objects as go
+from plotly.io.json import to_json_plotly
+import numpy as np
 import pandas as pd
+import functools
+import os
+import time
 from datetime import datetime
+from urllib.parse import urlencode
 
-# Load the processed data
-df = pd.read_csv('soul_foods_pink_morsels_sales.csv')
+from flask import Response, abort, g, has_request_context, jsonify, request
 
-# Convert date column to datetime
-df['date'] = pd.to_datetime(df['date'])
+from soul_foods_cache import VersionedCache
+from soul_foods_downsample import downsample, neighbours
+from soul_foods_events import EVENT_DATES, evaluate_view
+from soul_foods_export import EXPORT_CHUNK_ROWS, EXPORT_FORMATS, encode_export, format_available, gzip_stream
+from soul_foods_figure import base_figure, chart_title, make_trace, use_webgl, vline_markers
+from soul_foods_index import SalesIndex, to_datetime64
+from process_soul_foods_data import OFFSETS_FILE, load_offsets
+from soul_foods_live import LiveFeed
+from soul_foods_metrics import BYTES_BUCKETS, metrics
+from soul_foods_provider import DataProvider, Dataset
+from soul_foods_rollup import GRAIN_LABELS, SalesRollup
+from soul_foods_shared import shared_index
+from soul_foods_sqlite import DEFAULT_POOL_SIZE, SQLITE_FILE, SqliteSalesBackend, db_version
+from soul_foods_store import PRODUCTS_CSV_FILE, PRODUCTS_STORE_DIR, data_source, data_version, load_sales_data
 
-# Sort by date
-df = df.sort_values('date')
+# Product shown when the dashboard opens, loaded from the pink morsel output
+DEFAULT_PRODUCT = 'pink morsel'
+
+# Date of the pink morsel price increase
+PRICE_INCREASE_DATE = '2021-01-15'
+
+# Events marked on the chart: the price increase plus any configured in SOUL_FOODS_EVENT_DATES
+CHART_EVENTS = [PRICE_INCREASE_DATE] + [
+    date for date in EVENT_DATES if to_datetime64(date) != to_datetime64(PRICE_INCREASE_DATE)
+]
+
+# Upper bound on chart points per region; wider ranges switch to weekly or monthly totals
+MAX_POINTS_PER_TRACE = int(os.environ.get('SOUL_FOODS_MAX_POINTS', 500))
+
+# Point budget per trace for LTTB downsampling (0 disables)
+DOWNSAMPLE_POINTS = int(os.environ.get('SOUL_FOODS_DOWNSAMPLE_POINTS', 400))
+
+# Traces longer than this before downsampling are drawn with WebGL and sent as compact arrays (0 disables)
+WEBGL_POINT_THRESHOLD = int(os.environ.get('SOUL_FOODS_WEBGL_THRESHOLD', 2000))
+
+# Number of callback results kept in the LRU cache
+CACHE_SIZE = int(os.environ.get('SOUL_FOODS_CACHE_SIZE', 256))
+
+# Datasets with at most this many rows are filtered in the browser (0 disables)
+CLIENTSIDE_MAX_ROWS = int(os.environ.get('SOUL_FOODS_CLIENTSIDE_MAX_ROWS', 0))
+
+# Query backend: 'pandas' holds the sales in memory, 'sqlite' runs aggregate
+# queries on the database written by `process_soul_foods_data.py --sqlite`
+BACKEND = os.environ.get('SOUL_FOODS_BACKEND', 'pandas')
+SQLITE_POOL_SIZE = int(os.environ.get('SOUL_FOODS_SQLITE_POOL_SIZE', DEFAULT_POOL_SIZE))
+
+if BACKEND not in ('pandas', 'sqlite'):
+    raise ValueError(f"Unknown SOUL_FOODS_BACKEND {BACKEND!r}, expected 'pandas' or 'sqlite'")
+
+# Seconds between checks for new data on disk (0 disables hot reloading)
+RELOAD_SECONDS = float(os.environ.get('SOUL_FOODS_RELOAD_SECONDS', 30))
+
+# Directory of memory-mapped index files shared by worker processes (empty: each process keeps its own copy)
+SHARED_DIR = os.environ.get('SOUL_FOODS_SHARED_DIR', '')
+
+# Seconds between live mode updates (0 disables live mode) and the daily points kept per trace
+LIVE_SECONDS = float(os.environ.get('SOUL_FOODS_LIVE_SECONDS', 5))
+LIVE_MAX_POINTS = int(os.environ.get('SOUL_FOODS_LIVE_POINTS', 365))
+
+def current_data_version():
+    """
+    Return a cheap signature of every data source the dashboard may read.
+    """
+    return (data_version(), data_version(PRODUCTS_CSV_FILE, PRODUCTS_STORE_DIR), db_version(SQLITE_FILE),
+            offsets_version())
+
+def offsets_version():
+    """
+    Return the stat of the ingest offsets file, so a reload after an ingest
+    also picks up the offsets the ingest recorded after its outputs.
+    """
+    try:
+        stat = os.stat(OFFSETS_FILE)
+    except OSError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns)
+
+def load_product_rollups(rollup):
+    """
+    Return a rollup per product. Other products come from the product-partitioned
+    output of a multi-product ingest, so adding one needs no rescan of the raw files.
+    The SQLite backend only serves the pink morsel database.
+    """
+    product_rollups = {}
+    if BACKEND == 'pandas' and os.path.exists(data_source(PRODUCTS_CSV_FILE, PRODUCTS_STORE_DIR)):
+        product_sales = load_sales_data(PRODUCTS_CSV_FILE, PRODUCTS_STORE_DIR)
+        for product, product_df in product_sales.groupby('product', sort=True):
+            product_rollups[product] = SalesRollup.from_frame(product_df)
+    product_rollups[DEFAULT_PRODUCT] = rollup
+    return product_rollups
+
+def load_dataset(version):
+    """
+    Load one consistent version of the dashboard data with the configured backend.
+    """
+    if BACKEND == 'sqlite':
+        # No sales are held in memory; views are answered by pooled read-only connections
+        sales_index = None
+        rollup = SqliteSalesBackend(SQLITE_FILE, pool_size=SQLITE_POOL_SIZE)
+    elif SHARED_DIR:
+        # Map the index arrays read-only; only the first worker parses the data
+        sales_index = shared_index(version[0], lambda: SalesIndex.from_frame(load_sales_data()), SHARED_DIR)
+        rollup = SalesRollup.from_index(sales_index)
+    else:
+        # Load the processed data, from the columnar store when it has been built, into
+        # compact per-region arrays sorted by date
+        sales_index = SalesIndex.from_frame(load_sales_data())
+
+        # Precompute per-region daily, weekly and monthly aggregates for the callbacks
+        rollup = SalesRollup.from_index(sales_index)
+    return Dataset(version, rollup, sales_index, load_product_rollups(rollup), offsets=load_offsets())
+
+# Current data, swapped atomically by a background reload after each ingest
+data_provider = DataProvider(load_dataset, current_data_version, poll_seconds=RELOAD_SECONDS)
+data_provider.start()
+
+# Ship the data to the browser once when the data loaded at startup is small enough
+CLIENTSIDE_MODE = (data_provider.current.sales_index is not None
+                   and 0 < len(data_provider.current.sales_index) <= CLIENTSIDE_MAX_ROWS)
+
+# Live mode tails the raw files into the in-memory rollup of the pandas backend
+LIVE_MODE = LIVE_SECONDS > 0 and BACKEND == 'pandas' and not CLIENTSIDE_MODE
+live_feed = LiveFeed(increase_date=PRICE_INCREASE_DATE, min_poll_seconds=LIVE_SECONDS / 2)
+if LIVE_MODE:
+    live_feed.reset(data_provider.current)
+
+# Views and chart data keyed by query and dataset generation; a reload invalidates them
+chart_cache = VersionedCache(lambda: data_provider.current.generation, maxsize=CACHE_SIZE)
+
+# Callback instrumentation exposed on /metrics (SOUL_FOODS_METRICS=0 turns the timers off)
+CALLBACK_METRIC = 'soul_foods_callback_seconds'
+PHASE_METRIC = 'soul_foods_callback_phase_seconds'
+REQUEST_METRIC = 'soul_foods_request_seconds'
+RESPONSE_BYTES_METRIC = 'soul_foods_response_bytes'
+ROWS_METRIC = 'soul_foods_rows_scanned_total'
+EXPORT_ROWS_METRIC = 'soul_foods_export_rows_total'
+metrics.describe(CALLBACK_METRIC, 'histogram', "Time spent in each dashboard callback")
+metrics.describe(PHASE_METRIC, 'histogram', "Time spent in each phase of a dashboard callback")
+metrics.describe(REQUEST_METRIC, 'histogram', "Callback request latency, including serialization")
+metrics.describe(RESPONSE_BYTES_METRIC, 'histogram', "Callback response payload size", BYTES_BUCKETS)
+metrics.describe(ROWS_METRIC, 'counter', "Daily rollup rows covered by computed queries")
+metrics.describe(EXPORT_ROWS_METRIC, 'counter', "Sales rows streamed by the export route")
+for name in ['size', 'maxsize', 'hits', 'misses', 'evictions', 'hit_rate']:
+    metrics.describe(f"soul_foods_cache_{name}", 'gauge', f"Callback cache {name.replace('_', ' ')}")
+
+# Serialize once up front: plotly imports its JSON engine (orjson) lazily on first use,
+# and concurrent first callback requests racing on that import fail
+to_json_plotly({'warmup': np.zeros(1)})
 
 # Create the Dash app
 app = dash.Dash(__name__)
 
-# Define the layout
-app.layout = html.Div([
-    # Header with enhanced styling
-    html.Div([
-        html.H1("🍪 Soul Foods - Pink Morsels Sales Analysis Dashboard", 
-                 style={'textAlign': 'center', 'color': '#2E86AB', 'marginBottom': 20, 'fontSize': '2.5em', 'fontWeight': 'bold', 'textShadow': '2px 2px 4px rgba(0,0,0,0.1)'}),
-        html.Hr(style={'border': '2px solid #2E86AB', 'width': '80%', 'margin': '0 auto 30px auto'})
-    ], style={'backgroundColor': 'linear-gradient(135deg, #667eea 0%, #764ba2 100%)', 'padding': '30px', 'borderRadius': '15px', 'marginBottom': '30px', 'boxShadow': '0 8px 32px rgba(0,0,0,0.1)'}),
+# Download links under the chart, hidden for products without row-level data
+EXPORT_LINKS_STYLE = {'textAlign': 'center', 'marginTop': '15px', 'fontSize': '16px'}
+EXPORT_LINK_STYLE = {'margin': '0 15px', 'color': '#2E86AB', 'fontWeight': 'bold'}
+
+def export_url(start_date, end_date, region_filter, export_format='csv'):
+    """
+    Return the export route URL of a selection.
+    """
+    params = {'start_date': start_date, 'end_date': end_date, 'region': region_filter, 'format': export_format}
+    return '/export?' + urlencode({name: value for name, value in params.items() if value})
+
+def serve_layout():
+    """
+    Build the page from the current dataset, so a page opened after a reload
+    shows the new date range and products.
+    """
+    dataset = data_provider.current
+    return html.Div([
+        # Header with enhanced styling
+        html.Div([
+            html.H1("🍪 Soul Foods - Pink Morsels Sales Analysis Dashboard", 
+                     style={'textAlign': 'center', 'color': '#2E86AB', 'marginBottom': 20, 'fontSize': '2.5em', 'fontWeight': 'bold', 'textShadow': '2px 2px 4px rgba(0,0,0,0.1)'}),
+            html.Hr(style={'border': '2px solid #2E86AB', 'width': '80%', 'margin': '0 auto 30px auto'})
+        ], style={'backgroundColor': 'linear-gradient(135deg, #667eea 0%, #764ba2 100%)', 'padding': '30px', 'borderRadius': '15px', 'marginBottom': '30px', 'boxShadow': '0 8px 32px rgba(0,0,0,0.1)'}),
+    
+        # Subtitle explaining the business question
+        html.Div([
+            html.H3("🎯 Business Question: Were sales higher before or after the Pink Morsel price increase on January 15, 2021?",
+                     style={'textAlign': 'center', 'color': '#A23B72', 'marginBottom': 20, 'fontSize': '1.4em', 'fontWeight': '600'}),
+            html.P("Use the filters below to explore sales data by region and date range", 
+                   style={'textAlign': 'center', 'color': '#666', 'fontSize': '1.1em', 'fontStyle': 'italic'})
+        ], style={'backgroundColor': '#fff3cd', 'padding': '20px', 'borderRadius': '10px', 'marginBottom': '30px', 'border': '2px solid #ffeaa7'}),
     
-    # Subtitle explaining the business question
-    html.Div([
-        html.H3("🎯 Business Question: Were sales higher before or after the Pink Morsel price increase on January 15, 2021?",
-                 style={'textAlign': 'center', 'color': '#A23B72', 'marginBottom': 20, 'fontSize': '1.4em', 'fontWeight': '600'}),
-        html.P("Use the filters below to explore sales data by region and date range", 
-               style={'textAlign': 'center', 'color': '#666', 'fontSize': '1.1em', 'fontStyle': 'italic'})
-    ], style={'backgroundColor': '#fff3cd', 'padding': '20px', 'borderRadius': '10px', 'marginBottom': '30px', 'border': '2px solid #ffeaa7'}),
+        # Date range selector with enhanced styling
+        html.Div([
+            html.Label("📅 Select Date Range:", style={'fontSize': '18px', 'fontWeight': 'bold', 'marginBottom': '15px', 'color': '#495057'}),
+            dcc.DatePickerRange(
+                id='date-picker',
+                start_date=pd.Timestamp(dataset.min_date),
+                end_date=pd.Timestamp(dataset.max_date),
+                min_date_allowed=pd.Timestamp(dataset.min_date),
+                max_date_allowed=pd.Timestamp(dataset.max_date),
+                display_format='YYYY-MM-DD',
+                style={'margin': '0 auto'}
+            )
+        ], style={'margin': '30px', 'textAlign': 'center', 'padding': '25px', 'backgroundColor': '#e3f2fd', 'borderRadius': '12px', 'boxShadow': '0 4px 8px rgba(0,0,0,0.1)', 'border': '2px solid #bbdefb'}),
     
-    # Date range selector with enhanced styling
-    html.Div([
-        html.Label("📅 Select Date Range:", style={'fontSize': '18px', 'fontWeight': 'bold', 'marginBottom': '15px', 'color': '#495057'}),
-        dcc.DatePickerRange(
-            id='date-picker',
-            start_date=df['date'].min(),
-            end_date=df['date'].max(),
-            display_format='YYYY-MM-DD',
-            style={'margin': '0 auto'}
-        )
-    ], style={'margin': '30px', 'textAlign': 'center', 'padding': '25px', 'backgroundColor': '#e3f2fd', 'borderRadius': '12px', 'boxShadow': '0 4px 8px rgba(0,0,0,0.1)', 'border': '2px solid #bbdefb'}),
+        # Region filter with radio buttons
+        html.Div([
+            html.Label("🌍 Filter by Region:", style={'fontSize': '18px', 'fontWeight': 'bold', 'marginBottom': '10px', 'color': '#495057'}),
+            dcc.RadioItems(
+                id='region-filter',
+                options=[
+                    {'label': '🌍 All Regions', 'value': 'all'},
+                    {'label': '🧭 North', 'value': 'north'},
+                    {'label': '🧭 South', 'value': 'south'},
+                    {'label': '🧭 East', 'value': 'east'},
+                    {'label': '🧭 West', 'value': 'west'}
+                ],
+                value='all',
+                inline=True,
+                style={'margin': '0 auto', 'textAlign': 'center'}
+            )
+        ], style={'margin': '30px', 'textAlign': 'center', 'padding': '20px', 'backgroundColor': '#f8f9fa', 'borderRadius': '10px', 'boxShadow': '0 2px 4px rgba(0,0,0,0.1)'}),
     
-    # Region filter with radio buttons
-    html.Div([
-        html.Label("🌍 Filter by Region:", style={'fontSize': '18px', 'fontWeight': 'bold', 'marginBottom': '10px', 'color': '#495057'}),
-        dcc.RadioItems(
-            id='region-filter',
-            options=[
-                {'label': '🌍 All Regions', 'value': 'all'},
-                {'label': '🧭 North', 'value': 'north'},
-                {'label': '🧭 South', 'value': 'south'},
-                {'label': '🧭 East', 'value': 'east'},
-                {'label': '🧭 West', 'value': 'west'}
-            ],
-            value='all',
-            inline=True,
-            style={'margin': '0 auto', 'textAlign': 'center'}
-        )
-    ], style={'margin': '30px', 'textAlign': 'center', 'padding': '20px', 'backgroundColor': '#f8f9fa', 'borderRadius': '10px', 'boxShadow': '0 2px 4px rgba(0,0,0,0.1)'}),
+        # Product filter, listing every product of the multi-product output
+        html.Div([
+            html.Label("🍬 Filter by Product:", style={'fontSize': '18px', 'fontWeight': 'bold', 'marginBottom': '10px', 'color': '#495057'}),
+            dcc.Dropdown(
+                id='product-filter',
+                options=[{'label': product.title(), 'value': product} for product in sorted(dataset.product_rollups)],
+                value=DEFAULT_PRODUCT,
+                clearable=False,
+                # Client-side mode only ships the pink morsel series
+                disabled=CLIENTSIDE_MODE,
+                style={'width': '300px', 'margin': '0 auto', 'textAlign': 'left'}
+            )
+        ], style={'margin': '30px', 'textAlign': 'center', 'padding': '20px', 'backgroundColor': '#f8f9fa', 'borderRadius': '10px', 'boxShadow': '0 2px 4px rgba(0,0,0,0.1)'}),
     
-    # Main line chart with enhanced styling
-    html.Div([
-        html.H4("📊 Sales Performance Over Time", style={'textAlign': 'center', 'color': '#2E86AB', 'marginBottom': '20px', 'fontSize': '1.6em', 'fontWeight': 'bold'}),
-        dcc.Graph(
-            id='sales-chart',
-            style={'height': '600px'}
-        )
-    ], style={'margin': '30px', 'padding': '25px', 'backgroundColor': 'white', 'borderRadius': '15px', 'boxShadow': '0 8px 25px rgba(0,0,0,0.15)', 'border': '2px solid #e9ecef'}),
+        # Per-region daily series for client-side filtering; stays empty when callbacks run on the server
+        dcc.Store(id='sales-store', data=clientside_payload(dataset) if CLIENTSIDE_MODE else None),
     
-    # Summary statistics with enhanced styling
-    html.Div([
-        html.H4("📈 Summary Statistics", style={'textAlign': 'center', 'color': '#F18F01', 'marginBottom': '25px', 'fontSize': '1.5em', 'fontWeight': 'bold'}),
-        html.Div(id='summary-stats', style={'textAlign': 'center', 'margin': '20px', 'fontSize': '16px'})
-    ], style={'margin': '30px', 'padding': '25px', 'backgroundColor': '#fff8e1', 'borderRadius': '12px', 'boxShadow': '0 4px 12px rgba(0,0,0,0.1)', 'border': '2px solid #ffcc02'}),
+        # Polls for reloaded data and remembers the version the page shows
+        dcc.Interval(id='data-reload-interval', interval=max(RELOAD_SECONDS, 1) * 1000, disabled=RELOAD_SECONDS <= 0),
+        dcc.Store(id='data-version', data={
+            'generation': data_provider.current.generation,
+            'bounds': [str(dataset.min_date)[:10], str(dataset.max_date)[:10]]
+        }),
     
-    # Business insight with enhanced styling
-    html.Div([
-        html.H4("💡 Business Insight", style={'textAlign': 'center', 'color': '#C73E1D', 'marginBottom': '25px', 'fontSize': '1.5em', 'fontWeight': 'bold'}),
-        html.Div(id='business-insight', style={'textAlign': 'center', 'margin': '20px', 'fontSize': '18px', 'fontWeight': '500'})
-    ], style={'margin': '30px', 'padding': '25px', 'backgroundColor': '#ffebee', 'borderRadius': '12px', 'boxShadow': '0 4px 12px rgba(0,0,0,0.1)', 'border': '2px solid #ef5350'}),
+        # Main line chart with enhanced styling
+        html.Div([
+            html.H4("📊 Sales Performance Over Time", style={'textAlign': 'center', 'color': '#2E86AB', 'marginBottom': '20px', 'fontSize': '1.6em', 'fontWeight': 'bold'}),
+        
+            # Live mode: the chart follows rows appended to the raw data files
+            dcc.Checklist(
+                id='live-toggle',
+                options=[{'label': ' 🔴 Live: follow new rows in the daily sales files', 'value': 'live', 'disabled': not LIVE_MODE}],
+                value=[],
+                style={'textAlign': 'center', 'marginBottom': '10px', 'fontSize': '16px', 'color': '#495057'}
+            ),
+            dcc.Interval(id='live-interval', interval=max(LIVE_SECONDS, 0.5) * 1000, disabled=True),
+            dcc.Store(id='live-cursor'),
+            dcc.Graph(
+                id='sales-chart',
+                figure=base_figure(),
+                style={'height': '600px'}
+            ),
+        
+            # Download the rows behind the chart
+            html.Div([
+                html.A("⬇️ Download CSV", id='export-csv', href=export_url(None, None, 'all', 'csv'), style=EXPORT_LINK_STYLE),
+                html.A("⬇️ Download Arrow", id='export-arrow', href=export_url(None, None, 'all', 'arrow'), style=EXPORT_LINK_STYLE)
+            ], id='export-links', style=EXPORT_LINKS_STYLE)
+        ], style={'margin': '30px', 'padding': '25px', 'backgroundColor': 'white', 'borderRadius': '15px', 'boxShadow': '0 8px 25px rgba(0,0,0,0.15)', 'border': '2px solid #e9ecef'}),
     
-    # Footer with enhanced styling
-    html.Footer([
-        html.Hr(style={'border': '2px solid #2E86AB', 'width': '60%', 'margin': '40px auto 20px auto'}),
-        html.P("🍪 Soul Foods Sales Analysis Dashboard - Created with Dash & Python", 
-               style={'textAlign': 'center', 'color': '#666', 'marginTop': '20px', 'fontSize': '16px', 'fontStyle': 'italic'}),
-        html.P("📊 Powered by Data-Driven Insights", 
-               style={'textAlign': 'center', 'color': '#999', 'marginTop': '10px', 'fontSize': '14px'})
-    ], style={'backgroundColor': '#f8f9fa', 'padding': '30px', 'borderRadius': '15px', 'marginTop': '40px'})
-], style={'backgroundColor': '#f5f7fa', 'minHeight': '100vh', 'padding': '20px', 'fontFamily': "'Segoe UI', Tahoma, Geneva, Verdana, sans-serif"})
-
-@app.callback(
-    [Output('sales-chart', 'figure'),
-     Output('summary-stats', 'children'),
-     Output('business-insight', 'children')],
-    [Input('date-picker', 'start_date'),
-     Input('date-picker', 'end_date'),
-     Input('region-filter', 'value')]
-)
-def update_chart(start_date, end_date, region_filter):
-    # Filter data based on selected date range and region
-    filtered_df = df.copy()
+        # Summary statistics with enhanced styling
+        html.Div([
+            html.H4("📈 Summary Statistics", style={'textAlign': 'center', 'color': '#F18F01', 'marginBottom': '25px', 'fontSize': '1.5em', 'fontWeight': 'bold'}),
+            html.Div(id='summary-stats', style={'textAlign': 'center', 'margin': '20px', 'fontSize': '16px'})
+        ], style={'margin': '30px', 'padding': '25px', 'backgroundColor': '#fff8e1', 'borderRadius': '12px', 'boxShadow': '0 4px 12px rgba(0,0,0,0.1)', 'border': '2px solid #ffcc02'}),
     
-    if start_date and end_date:
-        filtered_df = filtered_df[
-            (filtered_df['date'] >= start_date) & 
-            (filtered_df['date'] <= end_date)
-        ]
+        # Business insight with enhanced styling
+        html.Div([
+            html.H4("💡 Business Insight", style={'textAlign': 'center', 'color': '#C73E1D', 'marginBottom': '25px', 'fontSize': '1.5em', 'fontWeight': 'bold'}),
+            html.Div(id='business-insight', style={'textAlign': 'center', 'margin': '20px', 'fontSize': '18px', 'fontWeight': '500'})
+        ], style={'margin': '30px', 'padding': '25px', 'backgroundColor': '#ffebee', 'borderRadius': '12px', 'boxShadow': '0 4px 12px rgba(0,0,0,0.1)', 'border': '2px solid #ef5350'}),
     
-    if region_filter != 'all':
-        filtered_df = filtered_df[filtered_df['region'] == region_filter]
+        # Footer with enhanced styling
+        html.Footer([
+            html.Hr(style={'border': '2px solid #2E86AB', 'width': '60%', 'margin': '40px auto 20px auto'}),
+            html.P("🍪 Soul Foods Sales Analysis Dashboard - Created with Dash & Python", 
+                   style={'textAlign': 'center', 'color': '#666', 'marginTop': '20px', 'fontSize': '16px', 'fontStyle': 'italic'}),
+            html.P("📊 Powered by Data-Driven Insights", 
+                   style={'textAlign': 'center', 'color': '#999', 'marginTop': '10px', 'fontSize': '14px'})
+        ], style={'backgroundColor': '#f8f9fa', 'padding': '30px', 'borderRadius': '15px', 'marginTop': '40px'})
+    ], style={'backgroundColor': '#f5f7fa', 'minHeight': '100vh', 'padding': '20px', 'fontFamily': "'Segoe UI', Tahoma, Geneva, Verdana, sans-serif"})
+
+def normalize_date(value):
+    """
+    Normalize a date picker value so equivalent dates share a cache key.
+    """
+    return None if not value else str(to_datetime64(value))
+
+def normalize_range(start_date, end_date):
+    """
+    Return the date range to filter on; like before, a half-open picker selects every date.
+    """
+    if not (start_date and end_date):
+        return None, None
+    return start_date, end_date
+
+def zoom_window(relayout_data):
+    """
+    Return the (start, end) of the zoomed x-axis window from relayoutData,
+    or None when the chart shows its full range.
+    """
+    if not relayout_data or relayout_data.get('xaxis.autorange'):
+        return None
+    if 'xaxis.range[0]' in relayout_data and 'xaxis.range[1]' in relayout_data:
+        bounds = (relayout_data['xaxis.range[0]'], relayout_data['xaxis.range[1]'])
+    elif 'xaxis.range' in relayout_data:
+        bounds = tuple(relayout_data['xaxis.range'])
+    else:
+        return None
+    return normalize_date(bounds[0]), normalize_date(bounds[1])
+
+def zoom_triggered():
+    """
+    Return True unless the running callback was triggered by something other
+    than a zoom. relayoutData keeps the last zoom after the filters change,
+    so it only describes the chart when it is what changed. Direct calls
+    outside a callback use the zoom they are given.
+    """
+    try:
+        triggered = dash.callback_context.triggered_prop_ids
+    except MissingCallbackContextException:
+        return True
+    return 'sales-chart.relayoutData' in triggered
+
+def query_view(start_date, end_date, region_filter, product=DEFAULT_PRODUCT, dataset=None):
+    """
+    Return the rollup view of a selection, cached and shared by the chart,
+    summary and insight callbacks. Everything is read from one dataset
+    (the current one by default) and cached under its generation.
+    """
+    dataset = dataset or data_provider.current
+    start_date, end_date = normalize_range(start_date, end_date)
+    key = ('view', normalize_date(start_date), normalize_date(end_date), region_filter, product)
+
+    def compute():
+        view = dataset.product_rollups[product].query(start_date, end_date, region_filter, max_points=MAX_POINTS_PER_TRACE)
+        metrics.inc(ROWS_METRIC, view.rows)
+        return view
+
+    return chart_cache.get_or_compute(key, compute, version=dataset.generation)
+
+def chart_data(start_date, end_date, region_filter, window=None, product=DEFAULT_PRODUCT, dataset=None):
+    """
+    Return the cached traces and price increase marker of a selection.
+    """
+    dataset = dataset or data_provider.current
+    start_date, end_date = normalize_range(start_date, end_date)
+    key = ('chart', normalize_date(start_date), normalize_date(end_date), region_filter, window, product)
+    return chart_cache.get_or_compute(
+        key, lambda: build_chart_data(start_date, end_date, region_filter, window, product, dataset),
+        version=dataset.generation
+    )
+
+def event_impacts(start_date, end_date, region_filter, product=DEFAULT_PRODUCT, dataset=None):
+    """
+    Return the cached before/after impact of every chart event on a selection.
+    """
+    dataset = dataset or data_provider.current
+    start_date, end_date = normalize_range(start_date, end_date)
+    key = ('events', normalize_date(start_date), normalize_date(end_date), region_filter, product)
+    return chart_cache.get_or_compute(
+        key, lambda: evaluate_view(query_view(start_date, end_date, region_filter, product, dataset), CHART_EVENTS),
+        version=dataset.generation
+    )
+
+def event_label(date, product=DEFAULT_PRODUCT):
+    """
+    Return the chart marker text of an event. Only pink morsels changed
+    price, so other products' charts name whose price increase it was.
+    """
+    if date == PRICE_INCREASE_DATE:
+        if product != DEFAULT_PRODUCT:
+            return "📌 Pink Morsel Price Increase<br>Jan 15, 2021"
+        return "🚨 Price Increase<br>Jan 15, 2021"
+    return f"📌 Event<br>{pd.Timestamp(date):%b %d, %Y}"
+
+def build_chart_data(start_date, end_date, region_filter, window=None, product=DEFAULT_PRODUCT, dataset=None):
+    dataset = dataset or data_provider.current
+    with metrics.timer(PHASE_METRIC, callback='update_chart', phase='filter'):
+        view = query_view(start_date, end_date, region_filter, product, dataset)
+        
+        # A zoomed chart shows the visible window at full daily resolution
+        chart_view = view
+        if window:
+            window_start = window[0] if start_date is None else max(window[0], normalize_date(start_date))
+            window_end = window[1] if end_date is None else min(window[1], normalize_date(end_date))
+            chart_view = dataset.product_rollups[product].query(window_start, window_end, region_filter, grain='D')
+            metrics.inc(ROWS_METRIC, chart_view.rows)
     
-    # Create the line chart
-    fig = go.Figure()
+    with metrics.timer(PHASE_METRIC, callback='update_chart', phase='traces'):
+        # Switch to WebGL and compact arrays for large traces; the length is taken
+        # before downsampling, which would otherwise keep every trace under the threshold
+        series = list(chart_view.series())
+        webgl = use_webgl(series, WEBGL_POINT_THRESHOLD)
+        
+        # Reduce long traces with LTTB, keeping the points either side of every event
+        reduced = []
+        for region, x, y in series:
+            keep = [k for date in CHART_EVENTS for k in neighbours(x, to_datetime64(date))]
+            x, y = downsample(x, y, DOWNSAMPLE_POINTS, keep=keep)
+            reduced.append((region, x, y))
+        series = reduced
+        
+        # Add line for each region with enhanced styling and colors
+        grain_label = GRAIN_LABELS[chart_view.grain]
+        traces = [make_trace(i, region, x, y, grain_label, webgl).to_plotly_json() for i, (region, x, y) in enumerate(series)]
     
-    # Add line for each region with enhanced styling and colors
-    colors = ['#2E86AB', '#A23B72', '#F18F01', '#C73E1D', '#6C5CE7']
-    for i, region in enumerate(filtered_df['region'].unique()):
-        region_data = filtered_df[filtered_df['region'] == region]
-        color = colors[i % len(colors)]
-        fig.add_trace(go.Scatter(
-            x=region_data['date'],
-            y=region_data['sales'],
-            mode='lines+markers',
-            name=region.title(),
-            line=dict(width=3, color=color),
-            marker=dict(size=8, color=color, line=dict(width=1, color='white')),
-            hovertemplate=f'<b>{region.title()}</b><br>' +
-                         'Date: %{x}<br>' +
-                         'Sales: $%{y:,.2f}<br>' +
-                         '<extra></extra>'
-        ))
+    with metrics.timer(PHASE_METRIC, callback='update_chart', phase='vlines'):
+        # Add a vertical line for the price increase and every other event in range
+        shapes = []
+        annotations = []
+        impacts = event_impacts(start_date, end_date, region_filter, product, dataset)
+        in_range = impacts.groupby('event', sort=False)['in_range'].any()
+        for date in CHART_EVENTS:
+            if in_range.get(pd.Timestamp(date), False):
+                shape, annotation = vline_markers(date, event_label(date, product))
+                shapes.append(shape)
+                annotations.append(annotation)
     
-    # Add vertical line for January 15, 2021 (price increase date) with enhanced styling
-    price_increase_date = '2021-01-15'
-    if pd.to_datetime(price_increase_date) >= filtered_df['date'].min() and pd.to_datetime(price_increase_date) <= filtered_df['date'].max():
-        fig.add_vline(
-            x=price_increase_date,
-            line_dash="dash",
-            line_color="#FF6B6B",
-            line_width=3,
-            annotation=dict(
-                text="🚨 Price Increase<br>Jan 15, 2021",
-                textangle=0,
-                font=dict(size=14, color="#FF6B6B"),
-                bgcolor="rgba(255, 255, 255, 0.9)",
-                bordercolor="#FF6B6B",
-                borderwidth=2
-            ),
-            annotation_position="top right"
-        )
+    return {
+        'data': traces,
+        'shapes': shapes,
+        'annotations': annotations,
+        # Keep the user's zoom while the chart is refreshed for the same filters
+        'uirevision': f"{start_date}|{end_date}|{region_filter}|{product}"
+    }
+
+def update_chart(start_date, end_date, region_filter, relayout_data=None, product=DEFAULT_PRODUCT, shown_version=None, live=None):
+    # The live callback owns the chart while live mode is on
+    if live:
+        raise PreventUpdate
     
-    # Update layout with enhanced styling
-    fig.update_layout(
-        title={
-            'text': "🍪 Pink Morsels Sales Performance Over Time by Region",
-            'x': 0.5,
-            'xanchor': 'center',
-            'font': {'size': 20, 'color': '#2E86AB', 'family': 'Arial, sans-serif'}
-        },
-        xaxis_title="📅 Date",
-        yaxis_title="💰 Sales ($)",
-        hovermode='x unified',
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.02,
-            xanchor="right",
-            x=1,
-            bgcolor='rgba(255,255,255,0.8)',
-            bordercolor='#2E86AB',
-            borderwidth=1
-        ),
-        plot_bgcolor='#f8f9fa',
-        paper_bgcolor='white',
-        font=dict(family="Arial, sans-serif", size=12),
-        margin=dict(l=80, r=80, t=100, b=80)
-    )
+    # Patch only the traces and the marker; the static layout is already in the browser.
+    # A filter change resets the axes (new uirevision), so an older zoom is ignored
+    window = zoom_window(relayout_data) if zoom_triggered() else None
+    chart = chart_data(start_date, end_date, region_filter, window, product)
+    patch = Patch()
+    patch['data'] = chart['data']
+    patch['layout']['shapes'] = chart['shapes']
+    patch['layout']['annotations'] = chart['annotations']
+    patch['layout']['uirevision'] = chart['uirevision']
+    patch['layout']['title']['text'] = chart_title(product)
+    return patch
+
+def price_increase_split(start_date, end_date, region_filter, product=DEFAULT_PRODUCT, dataset=None):
+    """
+    Return (in range, sales before, sales after) for the price increase date,
+    from the event engine's row for the whole selection.
+    """
+    impacts = event_impacts(start_date, end_date, region_filter, product, dataset)
+    rows = impacts[impacts['event'] == pd.Timestamp(PRICE_INCREASE_DATE)]
+    if len(rows) and rows['in_range'].iloc[-1]:
+        # The last row covers every selected region ('all' when there are several)
+        return True, float(rows['before_sales'].iloc[-1]), float(rows['after_sales'].iloc[-1])
+    return False, None, None
+
+def update_summary(start_date, end_date, region_filter, product=DEFAULT_PRODUCT, shown_version=None, live=None):
+    if live:
+        raise PreventUpdate
     
-    # Update x-axis to show dates nicely with enhanced styling
-    fig.update_xaxes(
-        gridcolor='#e9ecef',
-        showgrid=True,
-        gridwidth=1,
-        zeroline=False,
-        linecolor='#2E86AB',
-        linewidth=2,
-        tickfont=dict(size=12, color='#495057')
-    )
+    # Calculate summary statistics from the rollup's prefix sums, all from one dataset
+    dataset = data_provider.current
+    with metrics.timer(PHASE_METRIC, callback='update_summary', phase='filter'):
+        view = query_view(start_date, end_date, region_filter, product, dataset)
+    with metrics.timer(PHASE_METRIC, callback='update_summary', phase='stats'):
+        split = price_increase_split(start_date, end_date, region_filter, product, dataset)
+    return summary_component(view.total_sales, view.avg_sales, view.total_records, *split, product)
+
+def update_insight(start_date, end_date, region_filter, product=DEFAULT_PRODUCT, shown_version=None, live=None):
+    if live:
+        raise PreventUpdate
+    with metrics.timer(PHASE_METRIC, callback='update_insight', phase='stats'):
+        split = price_increase_split(start_date, end_date, region_filter, product)
+    return insight_component(*split, product)
+
+def update_export_links(start_date, end_date, region_filter, product=DEFAULT_PRODUCT):
+    """
+    Point the download links at the current selection. Only the pink morsel
+    rows are kept row by row, so the links are hidden for other products.
+    """
+    style = EXPORT_LINKS_STYLE if product == DEFAULT_PRODUCT else dict(EXPORT_LINKS_STYLE, display='none')
+    return (export_url(start_date, end_date, region_filter, 'csv'),
+            export_url(start_date, end_date, region_filter, 'arrow'), style)
+
+def export_frames(dataset, start_date, end_date, region_filter, chunk_rows=EXPORT_CHUNK_ROWS):
+    """
+    Yield the sales rows of a selection in chunks, from the sales index or the
+    SQLite backend. The range goes through the same normalize_range as the
+    chart's queries, and both read the same inclusive day bounds, so an
+    export adds up to the totals shown for the selection.
+    """
+    start_date, end_date = normalize_range(start_date, end_date)
+    source = dataset.rollup if dataset.sales_index is None else dataset.sales_index
+    for df in source.chunks(start_date, end_date, region_filter, chunk_rows):
+        metrics.inc(EXPORT_ROWS_METRIC, len(df))
+        yield df
+
+def live_regions(region_filter, sales):
+    """
+    Return the live regions shown for a region filter, in trace order.
+    """
+    return [region for region in sales.regions if region_filter in (None, 'all') or region == region_filter]
+
+def live_chart(region_filter, regions, sales):
+    """
+    Return the chart patch and cursor of a full live redraw: the last
+    LIVE_MAX_POINTS completed days of every region at daily resolution. The
+    cursor remembers the trace order and the last day each trace shows.
+    """
+    traces = []
+    last_days = []
+    shown_days = []
+    for i, region in enumerate(regions):
+        days, cents = sales.buffers[region].completed(limit=LIVE_MAX_POINTS)
+        x = days.astype('datetime64[D]').astype('datetime64[ns]')
+        traces.append(make_trace(i, region, x, cents / 100, GRAIN_LABELS['D']).to_plotly_json())
+        last_days.append(int(days[-1]) if len(days) else None)
+        if len(days):
+            shown_days += [int(days[0]), int(days[-1])]
     
-    # Update y-axis with enhanced styling
-    fig.update_yaxes(
-        gridcolor='#e9ecef',
-        showgrid=True,
-        gridwidth=1,
-        zeroline=True,
-        zerolinecolor='#2E86AB',
-        zerolinewidth=2,
-        linecolor='#2E86AB',
-        linewidth=2,
-        tickfont=dict(size=12, color='#495057')
-    )
+    # Mark the events within the days shown
+    shapes = []
+    annotations = []
+    for date in CHART_EVENTS:
+        day = int(np.datetime64(date, 'D').astype('int64'))
+        if shown_days and min(shown_days) <= day <= max(shown_days):
+            shape, annotation = vline_markers(date, event_label(date))
+            shapes.append(shape)
+            annotations.append(annotation)
     
-    # Calculate summary statistics
-    total_sales = filtered_df['sales'].sum()
-    avg_sales = filtered_df['sales'].mean()
-    total_records = len(filtered_df)
+    patch = Patch()
+    patch['data'] = traces
+    patch['layout']['shapes'] = shapes
+    patch['layout']['annotations'] = annotations
+    patch['layout']['uirevision'] = f"live|{region_filter}"
+    patch['layout']['title']['text'] = chart_title(DEFAULT_PRODUCT)
+    cursor = {'generation': live_feed.generation, 'version': sales.version, 'region_filter': region_filter,
+              'regions': regions, 'days': last_days}
+    return patch, cursor
+
+def live_points(cursor, sales):
+    """
+    Return the extendData payload of the days completed since the cursor, or
+    no_update, and the advanced cursor. Only the new points are sent; the
+    browser drops the oldest ones beyond LIVE_MAX_POINTS per trace.
+    """
+    xs, ys, indices = [], [], []
+    days = list(cursor['days'])
+    for i, region in enumerate(cursor['regions']):
+        new_days, cents = sales.buffers[region].completed(cursor['days'][i], LIVE_MAX_POINTS)
+        if len(new_days):
+            xs.append(new_days.astype('datetime64[D]').astype(str).tolist())
+            ys.append((cents / 100).tolist())
+            indices.append(i)
+            days[i] = int(new_days[-1])
+    cursor = dict(cursor, version=sales.version, days=days)
+    if not indices:
+        return no_update, cursor
+    return [{'x': xs, 'y': ys}, indices, LIVE_MAX_POINTS], cursor
+
+def update_live(n_intervals, live, region_filter, cursor, start_date, end_date, product=DEFAULT_PRODUCT):
+    """
+    Drive live mode. Turning it on redraws the chart from the live sales and
+    locks the date and product filters; every interval tick then tails the
+    raw files and sends only the newly completed days with extendData, and
+    the summary and insight from the running totals. Turning it off restores
+    the filtered chart.
+    """
+    if not live:
+        if cursor is None:
+            raise PreventUpdate
+        return (update_chart(start_date, end_date, region_filter, None, product), no_update, None,
+                update_summary(start_date, end_date, region_filter, product),
+                update_insight(start_date, end_date, region_filter, product), True, False, False)
     
-    # Calculate sales before and after price increase if the date is in range
-    price_increase_date = pd.to_datetime('2021-01-15')
-    if price_increase_date >= filtered_df['date'].min() and price_increase_date <= filtered_df['date'].max():
-        before_increase = filtered_df[filtered_df['date'] < price_increase_date]['sales'].sum()
-        after_increase = filtered_df[filtered_df['date'] >= price_increase_date]['sales'].sum()
+    dataset = data_provider.current
+    with live_feed.lock:
+        with metrics.timer(PHASE_METRIC, callback='update_live', phase='tail'):
+            live_feed.sync(dataset, force=cursor is None)
+        sales = live_feed.sales
+        regions = live_regions(region_filter, sales)
+        
+        with metrics.timer(PHASE_METRIC, callback='update_live', phase='traces'):
+            # Redraw when live mode starts, the region or data generation changed, or a region appeared
+            if (cursor is None or cursor['generation'] != live_feed.generation
+                    or cursor['region_filter'] != region_filter or cursor['regions'] != regions):
+                figure, cursor = live_chart(region_filter, regions, sales)
+                extend_data = no_update
+            elif cursor['version'] == sales.version:
+                raise PreventUpdate
+            else:
+                figure = no_update
+                extend_data, cursor = live_points(cursor, sales)
         
-        summary_stats = html.Div([
+        with metrics.timer(PHASE_METRIC, callback='update_live', phase='stats'):
+            totals = sales.summary(regions)
+    return (figure, extend_data, cursor, summary_component(*totals), insight_component(*totals[3:]),
+            False, True, True)
+
+def instrumented(callback):
+    """
+    Time a registered callback and remember its duration, so the request hook
+    can attribute the rest of the request to serialization.
+    """
+    @functools.wraps(callback)
+    def wrapper(*args):
+        if not metrics.enabled:
+            return callback(*args)
+        with metrics.timer(CALLBACK_METRIC, callback=callback.__name__) as timer:
+            result = callback(*args)
+        if has_request_context():
+            g.callback = (callback.__name__, timer.seconds)
+        return result
+    return wrapper
+
+def increase_wording(product):
+    """
+    Return how the summary and insight name the price increase. Only pink
+    morsels changed price, so for other products it is named as the pink
+    morsel price increase.
+    """
+    if product == DEFAULT_PRODUCT:
+        return {'label': "Price Increase (Jan 15, 2021)", 'note': "Price increase date (Jan 15, 2021)",
+                'event': "the price increase", 'subject': "Sales"}
+    return {'label': "Pink Morsel Price Increase (Jan 15, 2021)", 'note': "Pink morsel price increase date (Jan 15, 2021)",
+            'event': "the pink morsel price increase", 'subject': f"{product.title()} sales"}
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def summary_component(total_sales, avg_sales, total_records, in_range, before_increase, after_increase,
+                      product=DEFAULT_PRODUCT):
+    """
+    Build the summary statistics; identical numbers reuse the component tree.
+    """
+    wording = increase_wording(product)
+    # Show sales before and after price increase if the date is in range
+    if in_range:
+        return html.Div([
             html.Div([
                 html.Span("💰 ", style={'fontSize': '24px'}),
                 html.Span(f"Total Sales: ${total_sales:,.2f}", style={'fontSize': '18px', 'fontWeight': 'bold', 'color': '#2E86AB'})
@@ -234,39 +672,15 @@ def update_chart(start_date, end_date, region_filter):
             ], style={'margin': '15px 0', 'padding': '10px', 'backgroundColor': 'white', 'borderRadius': '8px', 'boxShadow': '0 2px 4px rgba(0,0,0,0.1)'}),
             html.Div([
                 html.Span("⬇️ ", style={'fontSize': '24px'}),
-                html.Span(f"Sales Before Price Increase (Jan 15, 2021): ${before_increase:,.2f}", style={'fontSize': '18px', 'fontWeight': 'bold', 'color': '#28a745'})
+                html.Span(f"Sales Before {wording['label']}: ${before_increase:,.2f}", style={'fontSize': '18px', 'fontWeight': 'bold', 'color': '#28a745'})
             ], style={'margin': '15px 0', 'padding': '10px', 'backgroundColor': 'white', 'borderRadius': '8px', 'boxShadow': '0 2px 4px rgba(0,0,0,0.1)'}),
             html.Div([
                 html.Span("⬆️ ", style={'fontSize': '24px'}),
-                html.Span(f"Sales After Price Increase (Jan 15, 2021): ${after_increase:,.2f}", style={'fontSize': '18px', 'fontWeight': 'bold', 'color': '#dc3545'})
+                html.Span(f"Sales After {wording['label']}: ${after_increase:,.2f}", style={'fontSize': '18px', 'fontWeight': 'bold', 'color': '#dc3545'})
             ], style={'margin': '15px 0', 'padding': '10px', 'backgroundColor': 'white', 'borderRadius': '8px', 'boxShadow': '0 2px 4px rgba(0,0,0,0.1)'})
         ])
-        
-        # Determine business insight with enhanced styling
-        if after_increase > before_increase:
-            insight = html.Div([
-                html.Div([
-                    html.Span("📈 ", style={'fontSize': '32px'}),
-                    html.Span("Sales were HIGHER after the price increase!", style={'fontSize': '20px', 'fontWeight': 'bold', 'color': '#28a745'})
-                ], style={'margin': '10px 0'}),
-                html.Div([
-                    html.Span(f"Sales increased by ${after_increase - before_increase:,.2f} after January 15, 2021", 
-                             style={'fontSize': '18px', 'color': '#28a745'})
-                ])
-            ], style={'padding': '20px', 'backgroundColor': '#d4edda', 'borderRadius': '10px', 'border': '2px solid #c3e6cb'})
-        else:
-            insight = html.Div([
-                html.Div([
-                    html.Span("📉 ", style={'fontSize': '32px'}),
-                    html.Span("Sales were LOWER after the price increase.", style={'fontSize': '20px', 'fontWeight': 'bold', 'color': '#dc3545'})
-                ], style={'margin': '10px 0'}),
-                html.Div([
-                    html.Span(f"Sales decreased by ${before_increase - after_increase:,.2f} after January 15, 2021", 
-                             style={'fontSize': '18px', 'color': '#dc3545'})
-                ])
-            ], style={'padding': '20px', 'backgroundColor': '#f8d7da', 'borderRadius': '10px', 'border': '2px solid #f5c6cb'})
     else:
-        summary_stats = html.Div([
+        return html.Div([
             html.Div([
                 html.Span("💰 ", style={'fontSize': '24px'}),
                 html.Span(f"Total Sales: ${total_sales:,.2f}", style={'fontSize': '18px', 'fontWeight': 'bold', 'color': '#2E86AB'})
@@ -281,18 +695,237 @@ def update_chart(start_date, end_date, region_filter):
             ], style={'margin': '15px 0', 'padding': '10px', 'backgroundColor': 'white', 'borderRadius': '8px', 'boxShadow': '0 2px 4px rgba(0,0,0,0.1)'}),
             html.Div([
                 html.Span("⚠️ ", style={'fontSize': '24px'}),
-                html.Span("Note: Price increase date (Jan 15, 2021) not in selected date range", style={'fontSize': '16px', 'fontWeight': 'bold', 'color': '#6c757d'})
+                html.Span(f"Note: {wording['note']} not in selected date range", style={'fontSize': '16px', 'fontWeight': 'bold', 'color': '#6c757d'})
             ], style={'margin': '15px 0', 'padding': '10px', 'backgroundColor': 'white', 'borderRadius': '8px', 'boxShadow': '0 2px 4px rgba(0,0,0,0.1)'})
         ])
-        insight = html.Div([
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def insight_component(in_range, before_increase, after_increase, product=DEFAULT_PRODUCT):
+    """
+    Build the business insight; identical numbers reuse the component tree.
+    """
+    wording = increase_wording(product)
+    if not in_range:
+        return html.Div([
             html.Div([
                 html.Span("ℹ️ ", style={'fontSize': '32px'}),
-                html.Span("Select a date range that includes January 15, 2021 to see the impact of the price increase.", 
+                html.Span(f"Select a date range that includes January 15, 2021 to see the impact of {wording['event']}.",
                          style={'fontSize': '18px', 'fontWeight': 'bold', 'color': '#17a2b8'})
             ], style={'margin': '10px 0'})
         ], style={'padding': '20px', 'backgroundColor': '#d1ecf1', 'borderRadius': '10px', 'border': '2px solid #bee5eb'})
+
+    # Determine business insight with enhanced styling
+    if after_increase > before_increase:
+        return html.Div([
+            html.Div([
+                html.Span("📈 ", style={'fontSize': '32px'}),
+                html.Span(f"{wording['subject']} were HIGHER after {wording['event']}!", style={'fontSize': '20px', 'fontWeight': 'bold', 'color': '#28a745'})
+            ], style={'margin': '10px 0'}),
+            html.Div([
+                html.Span(f"Sales increased by ${after_increase - before_increase:,.2f} after January 15, 2021", 
+                         style={'fontSize': '18px', 'color': '#28a745'})
+            ])
+        ], style={'padding': '20px', 'backgroundColor': '#d4edda', 'borderRadius': '10px', 'border': '2px solid #c3e6cb'})
+    else:
+        return html.Div([
+            html.Div([
+                html.Span("📉 ", style={'fontSize': '32px'}),
+                html.Span(f"{wording['subject']} were LOWER after {wording['event']}.", style={'fontSize': '20px', 'fontWeight': 'bold', 'color': '#dc3545'})
+            ], style={'margin': '10px 0'}),
+            html.Div([
+                html.Span(f"Sales decreased by ${before_increase - after_increase:,.2f} after January 15, 2021", 
+                         style={'fontSize': '18px', 'color': '#dc3545'})
+            ])
+        ], style={'padding': '20px', 'backgroundColor': '#f8d7da', 'borderRadius': '10px', 'border': '2px solid #f5c6cb'})
+
+def clientside_payload(dataset=None):
+    """
+    Return the per-region daily series shipped to the browser in client-side mode:
+    epoch days, sales in integer cents and record counts, plus the event markers.
+    """
+    rollup = (dataset or data_provider.current).rollup
+    markers = []
+    for date in CHART_EVENTS:
+        shape, annotation = vline_markers(date, event_label(date))
+        markers.append({'day': int(np.datetime64(date, 'D').astype('int64')), 'shape': shape, 'annotation': annotation})
+    return {
+        'regions': rollup.regions,
+        'series': {
+            region_rollup.region: {
+                'days': region_rollup.dates.astype('datetime64[D]').astype('int64').tolist(),
+                'cents': region_rollup.cents.tolist(),
+                'counts': region_rollup.counts.tolist()
+            }
+            for region_rollup in rollup.region_rollups
+        },
+        'price_increase_day': markers[0]['day'],
+        'event_markers': markers
+    }
+
+# Build the layout on every page load; Dash also builds it once here to validate the callbacks
+app.layout = serve_layout
+
+# Filter inputs shared by every callback
+FILTER_INPUTS = [
+    Input('date-picker', 'start_date'),
+    Input('date-picker', 'end_date'),
+    Input('region-filter', 'value')
+]
+
+def refresh_data(n_intervals, start_date, end_date, shown_version):
+    """
+    Move the date picker to the bounds of newly loaded data. A selection that
+    started or ended at the old first or last date follows the new one, so
+    appended days show up; any other selection is kept. Nothing is sent while
+    the page already shows the current dataset.
+    """
+    dataset = data_provider.current
+    if shown_version and shown_version['generation'] == dataset.generation:
+        raise PreventUpdate
+    bounds = [str(dataset.min_date)[:10], str(dataset.max_date)[:10]]
+    old_min, old_max = shown_version['bounds'] if shown_version else (None, None)
+    if normalize_date(start_date) is None or normalize_date(start_date) == normalize_date(old_min):
+        start_date = bounds[0]
+    if normalize_date(end_date) is None or normalize_date(end_date) == normalize_date(old_max):
+        end_date = bounds[1]
+    options = [{'label': product.title(), 'value': product} for product in sorted(dataset.product_rollups)]
+    store_data = clientside_payload(dataset) if CLIENTSIDE_MODE else no_update
+    version = {'generation': dataset.generation, 'bounds': bounds}
+    return bounds[0], bounds[1], start_date, end_date, options, version, store_data
+
+if CLIENTSIDE_MODE:
+    # Filtering, traces and totals run in the browser from the sales-store payload
+    app.clientside_callback(
+        ClientsideFunction('soul_foods', 'update_chart'),
+        Output('sales-chart', 'figure'),
+        FILTER_INPUTS + [Input('sales-store', 'data')],
+        State('sales-chart', 'figure')
+    )
+    app.clientside_callback(
+        ClientsideFunction('soul_foods', 'update_summary'),
+        Output('summary-stats', 'children'),
+        FILTER_INPUTS + [Input('sales-store', 'data')]
+    )
+    app.clientside_callback(
+        ClientsideFunction('soul_foods', 'update_insight'),
+        Output('business-insight', 'children'),
+        FILTER_INPUTS + [Input('sales-store', 'data')]
+    )
+else:
+    # The data-version input re-runs the callbacks after a reload
+    extra_inputs = [Input('product-filter', 'value'), Input('data-version', 'data')]
+    live_state = State('live-toggle', 'value')
+    app.callback(Output('sales-chart', 'figure'), FILTER_INPUTS + [Input('sales-chart', 'relayoutData')] + extra_inputs, live_state)(instrumented(update_chart))
+    app.callback(Output('summary-stats', 'children'), FILTER_INPUTS + extra_inputs, live_state)(instrumented(update_summary))
+    app.callback(Output('business-insight', 'children'), FILTER_INPUTS + extra_inputs, live_state)(instrumented(update_insight))
+
+# The download links follow the filters, in the browser in client-side mode
+export_outputs = [Output('export-csv', 'href'), Output('export-arrow', 'href'), Output('export-links', 'style')]
+export_inputs = FILTER_INPUTS + [Input('product-filter', 'value')]
+if CLIENTSIDE_MODE:
+    app.clientside_callback(ClientsideFunction('soul_foods', 'export_links'), export_outputs, export_inputs)
+else:
+    app.callback(export_outputs, export_inputs)(update_export_links)
+
+if LIVE_MODE:
+    app.callback(
+        [Output('sales-chart', 'figure', allow_duplicate=True), Output('sales-chart', 'extendData'),
+         Output('live-cursor', 'data'), Output('summary-stats', 'children', allow_duplicate=True),
+         Output('business-insight', 'children', allow_duplicate=True), Output('live-interval', 'disabled'),
+         Output('date-picker', 'disabled'), Output('product-filter', 'disabled')],
+        [Input('live-interval', 'n_intervals'), Input('live-toggle', 'value'), Input('region-filter', 'value')],
+        [State('live-cursor', 'data'), State('date-picker', 'start_date'), State('date-picker', 'end_date'),
+         State('product-filter', 'value')],
+        prevent_initial_call=True
+    )(instrumented(update_live))
+
+app.callback(
+    [Output('date-picker', 'min_date_allowed'), Output('date-picker', 'max_date_allowed'),
+     Output('date-picker', 'start_date'), Output('date-picker', 'end_date'),
+     Output('product-filter', 'options'), Output('data-version', 'data'), Output('sales-store', 'data')],
+    Input('data-reload-interval', 'n_intervals'),
+    [State('date-picker', 'start_date'), State('date-picker', 'end_date'), State('data-version', 'data')],
+    prevent_initial_call=True
+)(refresh_data)
+
+@app.server.before_request
+def start_request_timer():
+    if metrics.enabled:
+        g.request_start = time.perf_counter()
+
+@app.server.after_request
+def record_request_metrics(response):
+    """
+    Record the latency and payload size of callback requests. The time not
+    spent in the callback itself is Dash's dispatch and JSON serialization.
+    """
+    start = g.pop('request_start', None)
+    if start is None or not request.path.endswith('_dash-update-component'):
+        return response
+    seconds = time.perf_counter() - start
+    output = (request.get_json(silent=True) or {}).get('output', '')
+    metrics.observe(REQUEST_METRIC, seconds, output=output)
+    if not response.is_streamed:
+        metrics.observe(RESPONSE_BYTES_METRIC, response.content_length or 0, output=output)
+    callback = g.pop('callback', None)
+    if callback is not None:
+        metrics.observe(PHASE_METRIC, max(seconds - callback[1], 0.0), callback=callback[0], phase='serialize')
+    return response
+
+@app.server.route('/metrics')
+def metrics_endpoint():
+    """
+    Expose callback latency histograms, rows scanned, payload sizes and the
+    cache counters in the Prometheus text format.
+    """
+    for name, value in chart_cache.stats().items():
+        metrics.set(f"soul_foods_cache_{name}", value)
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@app.server.route('/export')
+def export_sales():
+    """
+    Stream the sales rows of a date range and region (query parameters
+    start_date, end_date, region and format=csv|arrow) in chunks, so memory
+    stays bounded however large the selection is. The response is gzip
+    compressed on the fly when the client accepts it, unless gzip=0.
+    """
+    dataset = data_provider.current
+    export_format = request.args.get('format', 'csv')
+    region_filter = request.args.get('region', 'all')
+    start_date = request.args.get('start_date')
+    end_date = request.args.get('end_date')
     
-    return fig, summary_stats, insight
+    # Reject what the chart could not show either
+    if export_format not in EXPORT_FORMATS:
+        abort(400, f"Unknown format {export_format!r}, expected one of {', '.join(EXPORT_FORMATS)}")
+    if not format_available(export_format):
+        abort(400, f"The {export_format} format needs pyarrow, which is not installed")
+    if request.args.get('product', DEFAULT_PRODUCT) != DEFAULT_PRODUCT:
+        abort(400, "Only the pink morsel sales can be exported row by row")
+    if region_filter != 'all' and region_filter not in dataset.rollup.regions:
+        abort(400, f"Unknown region {region_filter!r}")
+    try:
+        start_date, end_date = normalize_range(start_date, end_date)
+        first, last = normalize_date(start_date), normalize_date(end_date)
+    except ValueError:
+        abort(400, "Dates must look like YYYY-MM-DD")
+    
+    mimetype, extension = EXPORT_FORMATS[export_format]
+    filename = f"soul_foods_pink_morsels_{region_filter}_{(first or 'start')[:10]}_{(last or 'end')[:10]}.{extension}"
+    headers = {'Content-Disposition': f'attachment; filename="{filename}"', 'Vary': 'Accept-Encoding'}
+    chunks = encode_export(export_frames(dataset, start_date, end_date, region_filter), export_format)
+    if request.args.get('gzip') != '0' and request.accept_encodings['gzip']:
+        chunks = gzip_stream(chunks)
+        headers['Content-Encoding'] = 'gzip'
+    return Response(chunks, mimetype=mimetype, headers=headers)
+
+@app.server.route('/cache-stats')
+def cache_stats():
+    """
+    Expose the callback cache's hit/miss counters for tuning.
+    """
+    return jsonify(chart_cache.stats())
 
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=8050) 
\ No newline at end of file
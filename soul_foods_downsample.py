@@ -0,0 +1,76 @@
+import numpy as np
+
+def as_float(values):
+    """
+    Return values as float64, converting datetimes to nanoseconds since the epoch.
+    """
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype('datetime64[ns]').astype('int64').astype('float64')
+    return values.astype('float64')
+
+def lttb_indices(x, y, threshold):
+    """
+    Return the indices selected by Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept. The points in between are
+    split into threshold - 2 buckets, and from each bucket the point forming
+    the largest triangle with the previously selected point and the average
+    of the next bucket is kept, which preserves peaks and troughs.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    xs = as_float(x)
+    ys = as_float(y)
+    every = (n - 2) / (threshold - 2)
+
+    sampled = np.empty(threshold, dtype=np.int64)
+    sampled[0] = 0
+    a = 0
+    for i in range(threshold - 2):
+        # Average point of the next bucket
+        avg_start = int(np.floor((i + 1) * every)) + 1
+        avg_end = min(int(np.floor((i + 2) * every)) + 1, n)
+        avg_x = xs[avg_start:avg_end].mean()
+        avg_y = ys[avg_start:avg_end].mean()
+
+        # Point of the current bucket with the largest triangle area
+        range_start = int(np.floor(i * every)) + 1
+        range_end = int(np.floor((i + 1) * every)) + 1
+        area = np.abs(
+            (xs[a] - avg_x) * (ys[range_start:range_end] - ys[a])
+            - (xs[a] - xs[range_start:range_end]) * (avg_y - ys[a])
+        )
+        a = range_start + int(np.argmax(area))
+        sampled[i + 1] = a
+
+    sampled[-1] = n - 1
+    return sampled
+
+def downsample(x, y, threshold, keep=()):
+    """
+    Reduce a series to about threshold points with LTTB, always keeping the
+    indices in keep. The series is split at the kept points and each segment
+    gets a share of the budget proportional to its length.
+    """
+    n = len(x)
+    if threshold is None or n <= threshold:
+        return x, y
+
+    boundaries = sorted({0, n - 1, *[int(k) for k in keep if 0 <= k < n]})
+    selected = []
+    for b0, b1 in zip(boundaries[:-1], boundaries[1:]):
+        length = b1 - b0 + 1
+        budget = max(2, int(round(threshold * length / n)))
+        selected.append(b0 + lttb_indices(x[b0:b1 + 1], y[b0:b1 + 1], budget))
+    indices = np.unique(np.concatenate(selected))
+    return x[indices], y[indices]
+
+def neighbours(x, date):
+    """
+    Return the indices of the last point before date and the first point on or after it.
+    """
+    k = int(np.searchsorted(x, date, side='left'))
+    return [i for i in (k - 1, k) if 0 <= i < len(x)]
@@ -0,0 +1,190 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from soul_foods_index import SalesIndex, to_datetime64
+from soul_foods_rollup import SalesRollup
+
+# Event dates to analyse, e.g. SOUL_FOODS_EVENT_DATES=2021-01-15,2021-06-01
+EVENT_DATES = [date.strip() for date in os.environ.get('SOUL_FOODS_EVENT_DATES', '2021-01-15').split(',') if date.strip()]
+
+DAY = np.timedelta64(1, 'D')
+
+IMPACT_COLUMNS = [
+    'event', 'region', 'in_range',
+    'before_sales', 'after_sales', 'before_records', 'after_records', 'before_mean', 'after_mean',
+    'window_days', 'window_before_sales', 'window_after_sales', 'window_change_pct'
+]
+
+def safe_divide(numerator, denominator):
+    """
+    Element-wise division returning NaN where the denominator is zero.
+    """
+    numerator = np.asarray(numerator, dtype='float64')
+    denominator = np.asarray(denominator, dtype='float64')
+    out = np.full(np.broadcast(numerator, denominator).shape, np.nan)
+    np.divide(numerator, denominator, out=out, where=denominator != 0)
+    return out
+
+def empty_impact(n_events):
+    """
+    Return the impact of n_events events on a region without selected days.
+    """
+    zeros = np.zeros(n_events, dtype=np.int64)
+    return {
+        'in_range': np.zeros(n_events, dtype=bool),
+        'before_sales': zeros, 'after_sales': zeros,
+        'before_records': zeros, 'after_records': zeros,
+        'window_days': zeros, 'window_before_sales': zeros, 'window_after_sales': zeros,
+        'first_day': None, 'last_day': None
+    }
+
+def event_windows(events, first_day, last_day, window_days=None):
+    """
+    Return the number of days compared on each side of every event:
+    window_days when given, otherwise the largest span available on both
+    sides of the event between first_day and last_day.
+    """
+    if window_days is not None:
+        return np.full(len(events), int(window_days))
+    days_before = (events - first_day) // DAY
+    days_after = (last_day - events) // DAY + 1
+    return np.maximum(np.minimum(days_before, days_after), 0)
+
+def region_impact(rollup, i, j, events, window_days=None):
+    """
+    Evaluate every event against one region's days [i, j) at once.
+
+    Each total is a difference of the region's cumulative cents at indices
+    found by one vectorized binary search over all events, so the cost is
+    O(log n) per event and sums are exact. The window comparison uses the same number of days
+    on each side of the event: window_days when given, otherwise the
+    largest span available on both sides within the selection.
+    """
+    if j <= i:
+        return empty_impact(len(events))
+
+    dates = rollup.dates
+    cum_cents = rollup.cum_cents
+    cum_counts = rollup.cum_counts
+    first_day, last_day = dates[i], dates[j - 1]
+
+    k = np.clip(np.searchsorted(dates, events, side='left'), i, j)
+
+    # Equal-length windows either side of each event
+    window = event_windows(events, first_day, last_day, window_days)
+    lo = np.clip(np.searchsorted(dates, events - window * DAY, side='left'), i, j)
+    hi = np.clip(np.searchsorted(dates, events + window * DAY, side='left'), i, j)
+    lo = np.minimum(lo, k)
+    hi = np.maximum(hi, k)
+
+    return {
+        'in_range': (first_day <= events) & (events <= last_day),
+        'before_sales': cum_cents[k] - cum_cents[i],
+        'after_sales': cum_cents[j] - cum_cents[k],
+        'before_records': cum_counts[k] - cum_counts[i],
+        'after_records': cum_counts[j] - cum_counts[k],
+        'window_days': window.astype('int64'),
+        'window_before_sales': cum_cents[k] - cum_cents[lo],
+        'window_after_sales': cum_cents[hi] - cum_cents[k],
+        'first_day': first_day,
+        'last_day': last_day
+    }
+
+def evaluate_view(view, event_dates, window_days=None):
+    """
+    Return per-event, per-region before/after impact of a rollup view as a
+    DataFrame, with an 'all' row per event when several regions are selected.
+    """
+    events = np.array([to_datetime64(date) for date in event_dates], dtype='datetime64[ns]')
+    frames = []
+    parts = []
+    for region, impact in view_impacts(view, events, window_days):
+        parts.append(impact)
+        frames.append(impact_frame(events, region, impact))
+
+    if len(parts) > 1:
+        frames.append(impact_frame(events, 'all', combine_impacts(parts, events, window_days)))
+
+    if not frames:
+        return pd.DataFrame(columns=IMPACT_COLUMNS)
+    return pd.concat(frames, ignore_index=True)[IMPACT_COLUMNS]
+
+def view_impacts(view, events, window_days):
+    """
+    Return (region, impact) for every selected region. Views of backends
+    answering with aggregate queries compute them with region_impacts.
+    """
+    if hasattr(view, 'region_impacts'):
+        return view.region_impacts(events, window_days)
+    return [(rollup.region, region_impact(rollup, i, j, events, window_days)) for rollup, i, j in view.parts()]
+
+def combine_impacts(parts, events, window_days):
+    """
+    Sum region impacts into an all-regions impact for the same events.
+    """
+    days = [(part['first_day'], part['last_day']) for part in parts if part['first_day'] is not None]
+    combined = {key: sum(part[key] for part in parts) for key in [
+        'before_sales', 'after_sales', 'before_records', 'after_records', 'window_before_sales', 'window_after_sales'
+    ]}
+    if days:
+        first_day = min(first for first, _ in days)
+        last_day = max(last for _, last in days)
+        combined['in_range'] = (first_day <= events) & (events <= last_day)
+    else:
+        combined['in_range'] = np.zeros(len(events), dtype=bool)
+    # Regions may use different spans when the window is automatic; report the widest
+    combined['window_days'] = np.max([part['window_days'] for part in parts], axis=0)
+    return combined
+
+def impact_frame(events, region, impact):
+    """
+    Build the result rows of one region for every event, turning the
+    impact's cents into dollars.
+    """
+    return pd.DataFrame({
+        'event': pd.to_datetime(events),
+        'region': region,
+        'in_range': impact['in_range'],
+        'before_sales': impact['before_sales'] / 100,
+        'after_sales': impact['after_sales'] / 100,
+        'before_records': impact['before_records'],
+        'after_records': impact['after_records'],
+        'before_mean': safe_divide(impact['before_sales'], impact['before_records']) / 100,
+        'after_mean': safe_divide(impact['after_sales'], impact['after_records']) / 100,
+        'window_days': impact['window_days'],
+        'window_before_sales': impact['window_before_sales'] / 100,
+        'window_after_sales': impact['window_after_sales'] / 100,
+        'window_change_pct': 100 * (safe_divide(impact['window_after_sales'], impact['window_before_sales']) - 1)
+    })
+
+def evaluate_events(rollup, event_dates=None, start_date=None, end_date=None, region='all', window_days=None):
+    """
+    Evaluate the before/after impact of event dates on a date range and region.
+    Defaults to the configured EVENT_DATES.
+    """
+    view = rollup.query(start_date, end_date, region)
+    return evaluate_view(view, EVENT_DATES if event_dates is None else event_dates, window_days)
+
+def parse_args():
+    """
+    Parse command line options for the event impact report.
+    """
+    parser = argparse.ArgumentParser(description="Report sales before and after pricing events.")
+    parser.add_argument('--event', action='append', dest='events', help="event date (repeatable, default: SOUL_FOODS_EVENT_DATES)")
+    parser.add_argument('--start', default=None, help="first date of the analysed range")
+    parser.add_argument('--end', default=None, help="last date of the analysed range")
+    parser.add_argument('--region', default='all', help="region to analyse (default: all)")
+    parser.add_argument('--window', type=int, default=None, help="days on each side for the window comparison (default: widest equal span)")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    from soul_foods_store import load_sales_data
+
+    args = parse_args()
+    rollup = SalesRollup.from_index(SalesIndex.from_frame(load_sales_data()))
+    report = evaluate_events(rollup, args.events, args.start, args.end, args.region, args.window)
+    with pd.option_context('display.width', 200, 'display.max_columns', None):
+        print(report.round(2).to_string(index=False))
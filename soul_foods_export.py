@@ -0,0 +1,80 @@
+import io
+import zlib
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+# Rows read and encoded per chunk of an export
+EXPORT_CHUNK_ROWS = 65536
+
+# Export formats: (MIME type, file extension)
+EXPORT_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'arrow': ('application/vnd.apache.arrow.stream', 'arrow')
+}
+
+# Columns of an export, as in the processed sales CSV
+EXPORT_COLUMNS = ['sales', 'date', 'region']
+
+def format_available(export_format):
+    """
+    Return True when the format is known and its dependencies are installed.
+    """
+    return export_format == 'csv' or (export_format == 'arrow' and pa is not None)
+
+def csv_stream(frames):
+    """
+    Encode sales frames as CSV in the layout of the processed output: a header,
+    then one encoded block per frame.
+    """
+    yield (','.join(EXPORT_COLUMNS) + '\n').encode()
+    for df in frames:
+        # numpy formats day dates faster than to_csv's strftime
+        days = df['date'].to_numpy(dtype='datetime64[D]').astype(str)
+        yield df[EXPORT_COLUMNS].assign(date=days).to_csv(index=False, header=False).encode()
+
+def arrow_schema():
+    return pa.schema([('sales', pa.float64()), ('date', pa.date32()), ('region', pa.string())])
+
+def arrow_stream(frames):
+    """
+    Encode sales frames as an Arrow IPC stream, one record batch per frame.
+    The schema is sent first, so an empty selection is still a valid stream.
+    """
+    schema = arrow_schema()
+    sink = io.BytesIO()
+    writer = pa.ipc.new_stream(sink, schema)
+
+    def drain():
+        data = sink.getvalue()
+        sink.seek(0)
+        sink.truncate()
+        return data
+
+    yield drain()
+    for df in frames:
+        writer.write_batch(pa.RecordBatch.from_pandas(df[EXPORT_COLUMNS], schema=schema, preserve_index=False))
+        yield drain()
+    writer.close()
+    yield drain()
+
+def encode_export(frames, export_format):
+    """
+    Return a generator of the encoded bytes of sales frames.
+    """
+    if export_format == 'arrow':
+        return arrow_stream(frames)
+    return csv_stream(frames)
+
+def gzip_stream(chunks, level=6):
+    """
+    Compress a stream of byte chunks into one gzip member as it goes.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
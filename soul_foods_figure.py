@@ -0,0 +1,149 @@
+import numpy as np
+import plotly.graph_objects as go
+
+# Trace colors, assigned to regions in order
+COLORS = ['#2E86AB', '#A23B72', '#F18F01', '#C73E1D', '#6C5CE7']
+
+def compact_xy(x, y):
+    """
+    Return x as integer epoch milliseconds and y rounded to cents.
+
+    Plotly date axes accept epoch milliseconds, which serialize to 13 digits
+    instead of a 29 character ISO timestamp, and sales need no more than two
+    decimals.
+    """
+    x = np.asarray(x).astype('datetime64[ms]').astype('int64')
+    y = np.round(np.asarray(y, dtype='float64'), 2)
+    return x, y
+
+def use_webgl(series, threshold):
+    """
+    Return True when any trace has more points than the WebGL threshold.
+    """
+    return threshold > 0 and any(len(x) > threshold for _, x, _ in series)
+
+def make_trace(i, region, x, y, grain_label, webgl=False):
+    """
+    Build the chart trace of one region, as Scattergl with compact arrays in WebGL mode.
+    """
+    color = COLORS[i % len(COLORS)]
+    trace_type = go.Scatter
+    date_format = '%{x}'
+    if webgl:
+        trace_type = go.Scattergl
+        date_format = '%{x|%Y-%m-%d}'
+        x, y = compact_xy(x, y)
+    return trace_type(
+        x=x,
+        y=y,
+        mode='lines+markers',
+        name=region.title(),
+        line=dict(width=3, color=color),
+        marker=dict(size=8, color=color, line=dict(width=1, color='white')),
+        hovertemplate=f'<b>{region.title()}</b><br>' +
+                     f'Date: {date_format}<br>' +
+                     f'{grain_label} Sales: $%{{y:,.2f}}<br>' +
+                     '<extra></extra>'
+    )
+
+def chart_title(product='pink morsel'):
+    """
+    Return the chart title of a product.
+    """
+    return f"🍪 {product.title()}s Sales Performance Over Time by Region"
+
+def base_figure():
+    """
+    Build the empty chart with all static styling. It is sent once with the
+    page layout; callbacks only patch the traces, the price increase marker
+    and the title of the selected product.
+    """
+    fig = go.Figure()
+
+    # Update layout with enhanced styling
+    fig.update_layout(
+        title={
+            'text': chart_title(),
+            'x': 0.5,
+            'xanchor': 'center',
+            'font': {'size': 20, 'color': '#2E86AB', 'family': 'Arial, sans-serif'}
+        },
+        xaxis_title="📅 Date",
+        yaxis_title="💰 Sales ($)",
+        hovermode='x unified',
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1,
+            bgcolor='rgba(255,255,255,0.8)',
+            bordercolor='#2E86AB',
+            borderwidth=1
+        ),
+        plot_bgcolor='#f8f9fa',
+        paper_bgcolor='white',
+        font=dict(family="Arial, sans-serif", size=12),
+        margin=dict(l=80, r=80, t=100, b=80)
+    )
+
+    # Update x-axis to show dates nicely with enhanced styling
+    fig.update_xaxes(
+        type='date',
+        gridcolor='#e9ecef',
+        showgrid=True,
+        gridwidth=1,
+        zeroline=False,
+        linecolor='#2E86AB',
+        linewidth=2,
+        tickfont=dict(size=12, color='#495057')
+    )
+
+    # Update y-axis with enhanced styling
+    fig.update_yaxes(
+        gridcolor='#e9ecef',
+        showgrid=True,
+        gridwidth=1,
+        zeroline=True,
+        zerolinecolor='#2E86AB',
+        zerolinewidth=2,
+        linecolor='#2E86AB',
+        linewidth=2,
+        tickfont=dict(size=12, color='#495057')
+    )
+
+    return fig
+
+def vline_markers(date, text):
+    """
+    Return the (shape, annotation) of a dashed vertical marker at date, as
+    fig.add_vline(..., annotation_position="top right") would place them.
+    The x position is given in epoch milliseconds.
+    """
+    x = int(np.datetime64(date, 'ms').astype('int64'))
+    shape = dict(
+        type='line',
+        x0=x,
+        x1=x,
+        xref='x',
+        y0=0,
+        y1=1,
+        yref='y domain',
+        line=dict(color="#FF6B6B", dash="dash", width=3)
+    )
+    annotation = dict(
+        x=x,
+        xref='x',
+        y=1,
+        yref='y domain',
+        xanchor='left',
+        yanchor='top',
+        showarrow=False,
+        text=text,
+        textangle=0,
+        font=dict(size=14, color="#FF6B6B"),
+        bgcolor="rgba(255, 255, 255, 0.9)",
+        bordercolor="#FF6B6B",
+        borderwidth=2
+    )
+    return shape, annotation
@@ -0,0 +1,159 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from soul_foods_money import to_cents
+
+# Arrays written by SalesIndex.save, in constructor order
+INDEX_ARRAYS = ('codes', 'dates', 'cents')
+
+def to_datetime64(value):
+    """
+    Convert a date picker value (string, Timestamp or None) to datetime64[ns].
+    """
+    if value is None:
+        return None
+    return pd.Timestamp(value).to_datetime64().astype('datetime64[ns]')
+
+class SalesIndex:
+    """
+    Compact, indexed in-memory sales data.
+
+    Rows are grouped into one contiguous block per region and sorted by date
+    within each block. Dates are a datetime64 array, sales exact int64 cents
+    and regions small integer codes into `regions`, so a date range query is
+    a binary search inside each block followed by array slicing: O(log n + k)
+    with no copy of the full data.
+    """
+
+    def __init__(self, regions, codes, dates, cents):
+        self.regions = list(regions)
+        self.codes = codes
+        self.dates = dates
+        self.cents = cents
+
+        # Block of rows [offsets[c], offsets[c + 1]) holds region code c
+        self.offsets = np.searchsorted(codes, np.arange(len(self.regions) + 1), side='left')
+
+    @classmethod
+    def from_frame(cls, df):
+        """
+        Build the index from a sales frame with sales, date (datetime) and region.
+        """
+        region = pd.Categorical(df['region'])
+
+        # pandas picks the smallest integer type that holds every category's code
+        codes = region.codes
+        dates = df['date'].to_numpy(dtype='datetime64[ns]')
+        order = np.lexsort((dates, codes))
+        return cls(
+            region.categories.tolist(),
+            codes[order],
+            dates[order],
+            to_cents(df['sales'])[order]
+        )
+
+    def save(self, directory):
+        """
+        Write the arrays as .npy files, plus the region names, to a directory.
+        """
+        os.makedirs(directory, exist_ok=True)
+        for name in INDEX_ARRAYS:
+            np.save(os.path.join(directory, f"{name}.npy"), getattr(self, name))
+        with open(os.path.join(directory, 'regions.json'), 'w') as f:
+            json.dump(self.regions, f)
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """
+        Load an index written by save(). With mmap the arrays are mapped read-only
+        from the files, so processes loading the same directory share one copy
+        of the data through the page cache.
+        """
+        with open(os.path.join(directory, 'regions.json')) as f:
+            regions = json.load(f)
+        arrays = [np.load(os.path.join(directory, f"{name}.npy"), mmap_mode='r' if mmap else None) for name in INDEX_ARRAYS]
+        return cls(regions, *arrays)
+
+    def __len__(self):
+        return len(self.dates)
+
+    @property
+    def sales(self):
+        """
+        Sales in dollars.
+        """
+        return self.cents / 100
+
+    @property
+    def min_date(self):
+        return self.dates.min() if len(self) else None
+
+    @property
+    def max_date(self):
+        return self.dates.max() if len(self) else None
+
+    def region_block(self, region):
+        """
+        Return the [lo, hi) row range of one region's block.
+        """
+        code = self.regions.index(region)
+        return int(self.offsets[code]), int(self.offsets[code + 1])
+
+    def slices(self, start_date=None, end_date=None, region='all'):
+        """
+        Return (region, lo, hi) row ranges of the rows between the dates inclusive.
+        """
+        start = to_datetime64(start_date)
+        end = to_datetime64(end_date)
+        regions = self.regions if region == 'all' else [r for r in self.regions if r == region]
+
+        ranges = []
+        for name in regions:
+            lo, hi = self.region_block(name)
+            block = self.dates[lo:hi]
+            i = 0 if start is None else int(np.searchsorted(block, start, side='left'))
+            j = len(block) if end is None else int(np.searchsorted(block, end, side='right'))
+            ranges.append((name, lo + i, lo + max(i, j)))
+        return ranges
+
+    def chunks(self, start_date=None, end_date=None, region='all', chunk_rows=65536):
+        """
+        Yield the rows between the dates inclusive as (sales, date, region)
+        frames of at most chunk_rows rows, region by region in date order.
+        Only one chunk is copied out of the index at a time.
+        """
+        for name, lo, hi in self.slices(start_date, end_date, region):
+            for i in range(lo, hi, chunk_rows):
+                j = min(i + chunk_rows, hi)
+                yield pd.DataFrame({'sales': self.cents[i:j] / 100, 'date': self.dates[i:j], 'region': name})
+
+    def nbytes(self):
+        """
+        Return the memory held by the index arrays.
+        """
+        return self.codes.nbytes + self.dates.nbytes + self.cents.nbytes + self.offsets.nbytes
+
+def memory_comparison(df):
+    """
+    Compare the deep memory use of a sales frame with its SalesIndex.
+    """
+    frame_bytes = int(df.memory_usage(deep=True).sum())
+    index_bytes = int(SalesIndex.from_frame(df).nbytes())
+    return {
+        'rows': len(df),
+        'frame_bytes': frame_bytes,
+        'index_bytes': index_bytes,
+        'ratio': frame_bytes / index_bytes if index_bytes else float('nan')
+    }
+
+if __name__ == "__main__":
+    from soul_foods_store import load_sales_data
+
+    comparison = memory_comparison(load_sales_data())
+    print(f"Rows: {comparison['rows']:,}")
+    print(f"DataFrame (deep): {comparison['frame_bytes']:,} bytes ({comparison['frame_bytes'] / comparison['rows']:.1f} bytes/row)")
+    print(f"SalesIndex:       {comparison['index_bytes']:,} bytes ({comparison['index_bytes'] / comparison['rows']:.1f} bytes/row)")
+    print(f"Reduction:        {comparison['ratio']:.1f}x")
@@ -0,0 +1,294 @@
+import io
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from process_soul_foods_data import DATA_FILE_PATTERN, INPUT_COLUMNS, INPUT_DTYPES, discover_input_files, filter_pink_morsels
+from soul_foods_money import day_numbers, to_cents
+
+class FileTailer:
+    """
+    Reads the rows appended to the raw daily sales files since the last poll.
+
+    A byte offset is kept per file, so each poll reads only the new bytes;
+    a trailing partial line is left for the next poll. Files that appear
+    later are read from their start, and a file that shrank (rewritten or
+    truncated) is skipped to its new end: its rows come back with the next
+    ingest and reload.
+    """
+
+    def __init__(self, pattern=DATA_FILE_PATTERN, offsets=None):
+        self.pattern = pattern
+        self.offsets = dict(offsets or {})
+        self._headers = {}
+
+    @classmethod
+    def from_ingest(cls, pattern=DATA_FILE_PATTERN, ingested=None):
+        """
+        Start where the ingest that built the loaded data stopped reading:
+        `ingested` maps absolute paths to the bytes it read (see
+        process_soul_foods_data.save_offsets). Files it did not read were
+        created after it and are read from their start. Without any record
+        (data from an ingest that predates them) every file starts at its
+        current end, so rows appended before the tailer started are missed.
+        """
+        if ingested is None:
+            print("Warning: no ingest offsets recorded; live mode starts at the current end of the files")
+        offsets = {}
+        for path in discover_input_files(pattern):
+            if ingested is None:
+                offsets[path] = os.path.getsize(path)
+            else:
+                offsets[path] = ingested.get(os.path.abspath(path), 0)
+        return cls(pattern, offsets)
+
+    def header(self, path):
+        """
+        Return the header line of a file, read once.
+        """
+        if path not in self._headers:
+            with open(path, 'rb') as f:
+                self._headers[path] = f.readline()
+        return self._headers[path]
+
+    def read_new_lines(self, path):
+        """
+        Return the complete lines appended to one file since its offset (with
+        its header line prepended), or None, and advance the offset.
+        """
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return None
+        offset = self.offsets.get(path, 0)
+        if size < offset:
+            print(f"Warning: {path} shrank; skipping to its end until the next ingest")
+            self.offsets[path] = size
+            self._headers.pop(path, None)
+            return None
+        if size == offset:
+            return None
+
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            data = f.read(size - offset)
+        end = data.rfind(b'\n') + 1
+        if end == 0:
+            return None
+        self.offsets[path] = offset + end
+
+        # A new file starts with its own header
+        data = data[:end]
+        if offset == 0:
+            self._headers[path], _, data = data.partition(b'\n')
+            self._headers[path] += b'\n'
+        if not data.strip():
+            return None
+        return self.header(path) + data
+
+    def poll(self):
+        """
+        Return the pink morsel sales (sales, date, region) of every row appended
+        since the last poll, or None when there are none.
+        """
+        frames = []
+        for path in discover_input_files(self.pattern):
+            chunk = self.read_new_lines(path)
+            if chunk is not None:
+                raw_df = pd.read_csv(io.BytesIO(chunk), usecols=INPUT_COLUMNS, dtype=INPUT_DTYPES)
+                frames.append(filter_pink_morsels(raw_df))
+        frames = [df for df in frames if len(df) > 0]
+        if not frames:
+            return None
+        return pd.concat(frames, ignore_index=True)
+
+class DailyBuffer:
+    """
+    Daily sales of one region in arrays with spare capacity, so appending a
+    day or adding to the last one is amortized O(1). Days are int64 day numbers.
+    """
+
+    def __init__(self, days=(), cents=(), counts=()):
+        self.size = len(days)
+        capacity = max(16, 2 * self.size)
+        self.days = np.zeros(capacity, dtype=np.int64)
+        self.cents = np.zeros(capacity, dtype=np.int64)
+        self.counts = np.zeros(capacity, dtype=np.int64)
+        self.days[:self.size] = days
+        self.cents[:self.size] = cents
+        self.counts[:self.size] = counts
+
+    def _reserve(self, size):
+        if size <= len(self.days):
+            return
+        capacity = max(size, 2 * len(self.days))
+        for name in ('days', 'cents', 'counts'):
+            grown = np.zeros(capacity, dtype=np.int64)
+            grown[:self.size] = getattr(self, name)[:self.size]
+            setattr(self, name, grown)
+
+    def add(self, day, cents, count):
+        """
+        Add sales to a day. New rows are nearly always for the last day or a
+        later one; a late row for an earlier day is still placed in order.
+        """
+        n = self.size
+        if n and day <= self.days[n - 1]:
+            i = int(np.searchsorted(self.days[:n], day))
+            if self.days[i] == day:
+                self.cents[i] += cents
+                self.counts[i] += count
+                return
+            self._reserve(n + 1)
+            for array in (self.days, self.cents, self.counts):
+                array[i + 1:n + 1] = array[i:n]
+        else:
+            self._reserve(n + 1)
+            i = n
+        self.days[i] = day
+        self.cents[i] = cents
+        self.counts[i] = count
+        self.size = n + 1
+
+    def completed(self, after_day=None, limit=None):
+        """
+        Return the (days, cents) of the completed days after after_day, at most
+        the last `limit` of them. The last day is still open: rows for it may
+        keep arriving until a later day appears.
+        """
+        end = max(self.size - 1, 0)
+        start = 0 if after_day is None else int(np.searchsorted(self.days[:end], after_day, side='right'))
+        if limit is not None:
+            start = max(start, end - limit)
+        return self.days[start:end].copy(), self.cents[start:end].copy()
+
+class LiveSales:
+    """
+    Per-region daily sales and running totals that new rows are added to in
+    O(new rows): the totals and the before/after split of the price increase
+    are kept as running sums instead of being recomputed from the history.
+
+    It is seeded once from a SalesRollup, copying its daily arrays.
+    """
+
+    def __init__(self, rollup, increase_date):
+        self.increase_day = int(np.datetime64(increase_date, 'D').astype(np.int64))
+        self.buffers = {}
+        self.totals = {}
+        self.version = 0
+        for region_rollup in rollup.region_rollups:
+            days = region_rollup.dates.astype('datetime64[D]').astype(np.int64)
+            self.buffers[region_rollup.region] = DailyBuffer(days, region_rollup.cents, region_rollup.counts)
+            cents, records = region_rollup.total(0, len(days))
+            before, after = region_rollup.split(0, len(days), np.datetime64(increase_date, 'ns'))
+            self.totals[region_rollup.region] = {
+                'cents': cents, 'records': records, 'before_cents': before, 'after_cents': after,
+                'min_day': int(days[0]) if len(days) else None, 'max_day': int(days[-1]) if len(days) else None
+            }
+
+    @property
+    def regions(self):
+        return list(self.buffers)
+
+    def append(self, df):
+        """
+        Add new pink morsel sales (sales, date, region). Returns the rows added.
+        """
+        if df is None or len(df) == 0:
+            return 0
+        days = day_numbers(df['date']).astype(np.int64)
+        cents = to_cents(df['sales'])
+        new_df = pd.DataFrame({'region': df['region'].to_numpy(), 'day': days, 'cents': cents})
+
+        # Add each (region, day) total to the daily buffers
+        daily = new_df.groupby(['region', 'day'], sort=True)['cents'].agg(['sum', 'count'])
+        for (region, day), (day_cents, count) in zip(daily.index, daily.to_numpy()):
+            if region not in self.buffers:
+                self.buffers[region] = DailyBuffer()
+            self.buffers[region].add(int(day), int(day_cents), int(count))
+
+        # Update the running totals of each region
+        new_df['before'] = np.where(days < self.increase_day, cents, 0)
+        for region, region_df in new_df.groupby('region', sort=False):
+            totals = self.totals.setdefault(region, {
+                'cents': 0, 'records': 0, 'before_cents': 0, 'after_cents': 0, 'min_day': None, 'max_day': None
+            })
+            region_cents = int(region_df['cents'].sum())
+            before = int(region_df['before'].sum())
+            totals['cents'] += region_cents
+            totals['records'] += len(region_df)
+            totals['before_cents'] += before
+            totals['after_cents'] += region_cents - before
+            first, last = int(region_df['day'].min()), int(region_df['day'].max())
+            totals['min_day'] = first if totals['min_day'] is None else min(totals['min_day'], first)
+            totals['max_day'] = last if totals['max_day'] is None else max(totals['max_day'], last)
+        self.version += 1
+        return len(df)
+
+    def summary(self, regions):
+        """
+        Return the running totals of the given regions: total sales, average
+        sales per record, records, whether the price increase lies within
+        their dates, and the sales before and after it (in dollars).
+        """
+        totals = [self.totals[region] for region in regions if region in self.totals]
+        cents = sum(t['cents'] for t in totals)
+        records = sum(t['records'] for t in totals)
+        days = [t['min_day'] for t in totals if t['min_day'] is not None]
+        in_range = bool(days) and min(days) <= self.increase_day <= max(t['max_day'] for t in totals if t['max_day'] is not None)
+        return (
+            cents / 100,
+            cents / 100 / records if records else float('nan'),
+            records,
+            in_range,
+            sum(t['before_cents'] for t in totals) / 100 if in_range else None,
+            sum(t['after_cents'] for t in totals) / 100 if in_range else None
+        )
+
+class LiveFeed:
+    """
+    Tails the raw files into a LiveSales for the dashboard's live mode.
+
+    The feed follows one dataset generation: when the dashboard reloads its
+    data (after an ingest), the LiveSales is seeded again from the new
+    rollup and the tailer restarts from the offsets that ingest recorded
+    (Dataset.offsets). Polls are
+    shared by every client and happen at most once per min_poll_seconds;
+    all reads go through the feed's lock.
+    """
+
+    def __init__(self, pattern=DATA_FILE_PATTERN, increase_date=None, min_poll_seconds=1.0):
+        self.pattern = pattern
+        self.increase_date = increase_date
+        self.min_poll_seconds = min_poll_seconds
+        self.generation = None
+        self.sales = None
+        self.tailer = None
+        self.last_poll = 0.0
+        self.lock = threading.Lock()
+
+    def reset(self, dataset):
+        """
+        Seed the live sales from a dataset and start tailing from the ingested data.
+        """
+        with self.lock:
+            self._reset(dataset)
+
+    def _reset(self, dataset):
+        self.sales = LiveSales(dataset.rollup, self.increase_date)
+        self.tailer = FileTailer.from_ingest(self.pattern, dataset.offsets)
+        self.generation = dataset.generation
+        self.last_poll = time.monotonic()
+
+    def sync(self, dataset, force=False):
+        """
+        Follow the dataset's generation and add newly appended rows. Call with the lock held.
+        """
+        if self.generation != dataset.generation:
+            self._reset(dataset)
+        if force or time.monotonic() - self.last_poll >= self.min_poll_seconds:
+            self.last_poll = time.monotonic()
+            self.sales.append(self.tailer.poll())
@@ -0,0 +1,158 @@
+import bisect
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+# Timing is on unless SOUL_FOODS_METRICS=0; disabled timers are a shared no-op context
+ENABLED = os.environ.get('SOUL_FOODS_METRICS', '1') != '0'
+
+# Histogram bucket upper bounds for durations (seconds) and sizes (bytes)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BYTES_BUCKETS = (1e3, 1e4, 1e5, 1e6, 1e7, 1e8)
+
+NULL_TIMER = nullcontext()
+
+class Histogram:
+    """
+    Counts of observed values per bucket, with their sum and count.
+    """
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+class Timer:
+    """
+    Context manager observing its elapsed time in a registry histogram.
+    """
+
+    __slots__ = ('registry', 'name', 'labels', 'start', 'seconds')
+
+    def __init__(self, registry, name, labels):
+        self.registry = registry
+        self.name = name
+        self.labels = labels
+        self.seconds = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.seconds = time.perf_counter() - self.start
+        self.registry.observe(self.name, self.seconds, **self.labels)
+        return False
+
+class MetricsRegistry:
+    """
+    Thread-safe histograms, counters and gauges keyed by metric name and labels,
+    rendered in the Prometheus text exposition format.
+    """
+
+    def __init__(self, enabled=ENABLED):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._metrics = {}
+        self._histograms = {}
+        self._counters = {}
+        self._gauges = {}
+
+    def describe(self, name, kind, help_text, buckets=LATENCY_BUCKETS):
+        """
+        Declare a metric: kind is 'histogram', 'counter' or 'gauge'.
+        """
+        self._metrics[name] = (kind, help_text, buckets)
+
+    def timer(self, name, **labels):
+        """
+        Return a context manager timing its block into the histogram name.
+        """
+        if not self.enabled:
+            return NULL_TIMER
+        return Timer(self, name, labels)
+
+    def observe(self, name, value, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self._metrics.get(name, (None, None, LATENCY_BUCKETS))[2])
+            histogram.observe(value)
+
+    def inc(self, name, value=1, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        with self._lock:
+            self._gauges[(name, tuple(sorted(labels.items())))] = value
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._gauges.clear()
+
+    def totals(self, name, label):
+        """
+        Return {label value: {'seconds': sum, 'calls': count}} of a histogram.
+        """
+        with self._lock:
+            return {
+                dict(labels).get(label): {'seconds': histogram.sum, 'calls': histogram.count}
+                for (metric, labels), histogram in self._histograms.items() if metric == name
+            }
+
+    def render(self):
+        """
+        Return every metric in the Prometheus text exposition format.
+        """
+        with self._lock:
+            names = sorted({name for name, _ in self._histograms} | {name for name, _ in self._counters}
+                           | {name for name, _ in self._gauges})
+            lines = []
+            for name in names:
+                kind, help_text, _ = self._metrics.get(name, ('untyped', None, None))
+                if help_text:
+                    lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for (metric, labels), histogram in sorted(self._histograms.items()):
+                    if metric != name:
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(list(histogram.buckets) + [float('inf')], histogram.counts):
+                        cumulative += count
+                        le = '+Inf' if bound == float('inf') else repr(float(bound))
+                        lines.append(f"{name}_bucket{format_labels(labels + (('le', le),))} {cumulative}")
+                    lines.append(f"{name}_sum{format_labels(labels)} {histogram.sum!r}")
+                    lines.append(f"{name}_count{format_labels(labels)} {histogram.count}")
+                for values in (self._counters, self._gauges):
+                    for (metric, labels), value in sorted(values.items()):
+                        if metric == name:
+                            lines.append(f"{name}{format_labels(labels)} {value}")
+            return '\n'.join(lines) + '\n'
+
+def format_labels(labels):
+    """
+    Return Prometheus label syntax for (name, value) pairs.
+    """
+    if not labels:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in labels)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(labels, escaped)) + '}'
+
+# Registry shared by the dashboard and the ingest script
+metrics = MetricsRegistry()
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+
+# Integer digits allowed before the decimal point, so cents times a quantity stay within int64
+MAX_PRICE_DIGITS = 12
+
+# Widths tried, smallest first, when compacting integer columns
+INT_TYPES = [np.int8, np.int16, np.int32, np.int64]
+
+def parse_price_cents(prices):
+    """
+    Parse "$3.00"-style prices into int64 cents.
+
+    The strings are viewed as a fixed-width byte matrix and validated and
+    accumulated one character column at a time with numpy, so no Python
+    work is done per row. Dropping the "." leaves the price in cents, so
+    the digits are simply read as one integer. A price must be "$", one or
+    more digits, "." and exactly two digits; anything else (including
+    missing values) raises ValueError naming the offending rows.
+    """
+    values = pd.Series(prices, copy=False)
+    try:
+        raw = values.to_numpy(dtype=object).astype('S')
+    except UnicodeEncodeError:
+        raw = np.array([value.encode('ascii', 'replace') if isinstance(value, str) else b'' for value in values], dtype='S')
+
+    n = len(raw)
+    width = max(raw.dtype.itemsize, 1)
+    chars = raw.view(np.uint8).reshape(n, width) if n else np.zeros((0, width), dtype=np.uint8)
+    lengths = np.char.str_len(raw) if n else np.zeros(0, dtype=np.int64)
+    dot = lengths - 3
+
+    valid = (lengths >= 5) & (lengths <= MAX_PRICE_DIGITS + 4) & (chars[:, 0] == ord('$'))
+    cents = np.zeros(n, dtype=np.int64)
+    for column in range(1, width):
+        chars_at = chars[:, column]
+        inside = column < lengths
+        is_dot = dot == column
+        digit = chars_at - np.uint8(ord('0'))
+        is_digit = digit <= 9
+
+        # "." third from the end, digits everywhere else within the string
+        valid &= ~inside | np.where(is_dot, chars_at == ord('.'), is_digit)
+        take = inside & ~is_dot & is_digit
+        cents = np.where(take, cents * 10 + digit, cents)
+
+    if not valid.all():
+        bad = np.flatnonzero(~valid)
+        examples = ', '.join(f"row {i}: {values.iloc[i]!r}" for i in bad[:5])
+        raise ValueError(f"{len(bad)} malformed price values ({examples})")
+    return cents
+
+def to_cents(sales):
+    """
+    Convert dollar amounts with at most two decimals to exact int64 cents.
+    """
+    return np.rint(np.asarray(sales, dtype='float64') * 100).astype(np.int64)
+
+def smallest_int(values):
+    """
+    Return integer values in the narrowest signed integer type that holds them.
+    """
+    values = np.asarray(values)
+    if len(values) == 0:
+        return values.astype(INT_TYPES[0])
+    low, high = values.min(), values.max()
+    for int_type in INT_TYPES:
+        info = np.iinfo(int_type)
+        if info.min <= low and high <= info.max:
+            return values.astype(int_type)
+    return values.astype(np.int64)
+
+def day_numbers(dates):
+    """
+    Return "YYYY-MM-DD" dates as int32 days since 1970-01-01.
+    A file holds few distinct dates, so each one is parsed only once.
+    """
+    codes, uniques = pd.factorize(pd.Series(dates, copy=False))
+    days = pd.to_datetime(uniques, format='%Y-%m-%d').to_numpy(dtype='datetime64[D]').astype(np.int64)
+    if (codes < 0).any():
+        raise ValueError("missing date values")
+    return days[codes].astype(np.int32)
+
+def compact_sales_frame(df):
+    """
+    Return a raw sales frame (product, price, quantity, date, region) with
+    compact dtypes: categorical product and region, int32 day numbers, the
+    smallest fitting quantity type and exact int64 price and sales cents.
+    """
+    price_cents = parse_price_cents(df['price'])
+    quantity = smallest_int(df['quantity'].to_numpy())
+    return pd.DataFrame({
+        'product': df['product'].astype('category'),
+        'region': df['region'].astype('category'),
+        'day': day_numbers(df['date']),
+        'quantity': quantity,
+        'price_cents': price_cents,
+        'sales_cents': price_cents * quantity.astype(np.int64)
+    })
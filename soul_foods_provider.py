@@ -0,0 +1,122 @@
+import threading
+import traceback
+
+class Dataset:
+    """
+    One consistent version of the dashboard data.
+
+    A Dataset is never modified after it is built: a reload builds a new one
+    and swaps it in, so a callback that took a dataset keeps using the same
+    version even if a reload finishes meanwhile. `offsets` holds the bytes
+    of each raw file the data was built from, as recorded by the ingest
+    (None when it recorded none).
+    """
+
+    def __init__(self, version, rollup, sales_index=None, product_rollups=None, generation=0, offsets=None):
+        self.version = version
+        self.rollup = rollup
+        self.sales_index = sales_index
+        self.product_rollups = product_rollups or {}
+        self.generation = generation
+        self.offsets = offsets
+
+    @property
+    def min_date(self):
+        return self.rollup.min_date
+
+    def close(self):
+        """
+        Release what the data holds open, such as the SQLite backend's connection pool.
+        """
+        close = getattr(self.rollup, 'close', None)
+        if close is not None:
+            close()
+
+    @property
+    def max_date(self):
+        return self.rollup.max_date
+
+class DataProvider:
+    """
+    Holds the current Dataset and reloads it in the background when the
+    data on disk changes.
+
+    `load(version)` builds a Dataset and `version_func()` returns a cheap
+    signature of the data on disk (such as file stats). The version is read
+    before loading, so a file rewritten during a load is picked up by the
+    next poll. The new dataset replaces the old one with a single reference
+    assignment; a failed reload keeps serving the previous version. The
+    replaced dataset is then closed.
+    """
+
+    def __init__(self, load, version_func, poll_seconds=30):
+        self.load = load
+        self.version_func = version_func
+        self.poll_seconds = poll_seconds
+        self.reloads = 0
+        self.last_error = None
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._dataset = self._build(self.version_func(), 0)
+
+    @property
+    def current(self):
+        """
+        The latest loaded Dataset; read it once per callback and use that object.
+        """
+        return self._dataset
+
+    def _build(self, version, generation):
+        dataset = self.load(version)
+        dataset.version = version
+        dataset.generation = generation
+        return dataset
+
+    def refresh(self):
+        """
+        Reload the data if its version changed. Returns True when a new dataset was swapped in.
+        """
+        with self._reload_lock:
+            version = self.version_func()
+            if version == self._dataset.version:
+                return False
+            try:
+                dataset = self._build(version, self._dataset.generation + 1)
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                print(f"Warning: data reload failed, keeping the current data ({self.last_error})")
+                traceback.print_exc()
+                return False
+
+            # Atomic swap: readers see either the old or the new dataset
+            old_dataset = self._dataset
+            self._dataset = dataset
+            old_dataset.close()
+            self.reloads += 1
+            self.last_error = None
+            print(f"Reloaded sales data (generation {dataset.generation})")
+            return True
+
+    def start(self):
+        """
+        Start polling for changes in a daemon thread (no-op when poll_seconds is 0).
+        """
+        if self.poll_seconds <= 0 or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._poll, name='soul-foods-data-reload', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop the polling thread.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _poll(self):
+        while not self._stop.wait(self.poll_seconds):
+            self.refresh()
@@ -0,0 +1,234 @@
+import numpy as np
+
+from soul_foods_index import SalesIndex, to_datetime64
+
+# Chart grains: daily, weekly (weeks start on Monday) and monthly
+GRAINS = ('D', 'W', 'M')
+GRAIN_LABELS = {'D': 'Daily', 'W': 'Weekly', 'M': 'Monthly'}
+GRAIN_DAYS = {'D': 1, 'W': 7, 'M': 30}
+
+def period_starts(dates, grain):
+    """
+    Return the start of the grain period containing each date.
+    """
+    days = dates.astype('datetime64[D]')
+    if grain == 'D':
+        return days.astype('datetime64[ns]')
+    if grain == 'W':
+        # 1970-01-01 was a Thursday, so shift by 3 days to start weeks on Monday
+        day_numbers = days.astype('int64')
+        return (days - ((day_numbers + 3) % 7)).astype('datetime64[ns]')
+    return days.astype('datetime64[M]').astype('datetime64[ns]')
+
+def choose_grain(start, end, max_points):
+    """
+    Pick the finest grain that keeps a range of dates under max_points per trace.
+    """
+    days = (end - start) // np.timedelta64(1, 'D') + 1
+    for grain in GRAINS:
+        if days / GRAIN_DAYS[grain] <= max_points:
+            return grain
+    return GRAINS[-1]
+
+class RegionRollup:
+    """
+    Daily sales of one region with prefix sums and grain bucket boundaries.
+
+    Totals over any range of days are differences of the cumulative arrays,
+    and weekly or monthly totals are the same differences taken at the
+    precomputed bucket boundaries, so no query has to touch the raw rows.
+    Sales are summed as int64 cents, so every total is exact.
+    """
+
+    def __init__(self, region, dates, cents, counts):
+        self.region = region
+        self.dates = dates
+        self.cents = cents
+        self.counts = counts
+        self.cum_cents = np.concatenate([[0], np.cumsum(cents)]).astype(np.int64)
+        self.cum_counts = np.concatenate([[0], np.cumsum(counts)])
+
+        # Period label of every day and the indices where a new period begins
+        self.labels = {}
+        self.bucket_starts = {}
+        for grain in GRAINS:
+            labels = period_starts(dates, grain)
+            self.labels[grain] = labels
+            self.bucket_starts[grain] = np.flatnonzero(np.r_[True, labels[1:] != labels[:-1]])
+
+    @property
+    def sales(self):
+        """
+        Daily sales in dollars.
+        """
+        return self.cents / 100
+
+    def bounds(self, start, end):
+        """
+        Return the daily index range [i, j) of the dates between start and end inclusive.
+        """
+        i = 0 if start is None else int(np.searchsorted(self.dates, start, side='left'))
+        j = len(self.dates) if end is None else int(np.searchsorted(self.dates, end, side='right'))
+        return i, max(i, j)
+
+    def series(self, i, j, grain):
+        """
+        Return the (period start, sales total) points of days [i, j) at a grain.
+        Periods cut by the range edges only include the selected days.
+        """
+        starts = self.bucket_starts[grain]
+        inner = starts[np.searchsorted(starts, i, side='right'):np.searchsorted(starts, j, side='left')]
+        edges = np.concatenate([[i], inner, [j]]) if j > i else np.array([i])
+        return self.labels[grain][edges[:-1]], np.diff(self.cum_cents[edges]) / 100
+
+    def total(self, i, j):
+        """
+        Return the sales total in cents and record count of days [i, j).
+        """
+        return int(self.cum_cents[j] - self.cum_cents[i]), int(self.cum_counts[j] - self.cum_counts[i])
+
+    def split(self, i, j, date):
+        """
+        Return the sales in cents of days [i, j) before date and from date onwards.
+        """
+        k = min(max(int(np.searchsorted(self.dates, date, side='left')), i), j)
+        return int(self.cum_cents[k] - self.cum_cents[i]), int(self.cum_cents[j] - self.cum_cents[k])
+
+class RollupView:
+    """
+    The result of a date range and region query against a SalesRollup.
+    """
+
+    def __init__(self, rollups, bounds, grain):
+        self.grain = grain
+        self.regions = [rollup.region for rollup in rollups]
+        self._rollups = rollups
+        self._bounds = bounds
+
+        self.total_cents = 0
+        self.total_records = 0
+        self.min_date = None
+        self.max_date = None
+        for rollup, (i, j) in zip(rollups, bounds):
+            cents, records = rollup.total(i, j)
+            self.total_cents += cents
+            self.total_records += records
+            if j > i:
+                first, last = rollup.dates[i], rollup.dates[j - 1]
+                self.min_date = first if self.min_date is None else min(self.min_date, first)
+                self.max_date = last if self.max_date is None else max(self.max_date, last)
+
+    @property
+    def rows(self):
+        """
+        Number of daily rows the selection covers, summed over regions.
+        """
+        return sum(j - i for i, j in self._bounds)
+
+    @property
+    def total_sales(self):
+        """
+        Exact total sales in dollars.
+        """
+        return self.total_cents / 100
+
+    @property
+    def avg_sales(self):
+        """
+        Average sales per record, NaN for an empty selection.
+        """
+        return self.total_cents / 100 / self.total_records if self.total_records else float('nan')
+
+    def parts(self):
+        """
+        Yield (region rollup, i, j) for every selected region and its day range.
+        """
+        for rollup, (i, j) in zip(self._rollups, self._bounds):
+            yield rollup, i, j
+
+    def series(self):
+        """
+        Yield (region, x, y) for every region with data in the selection.
+        """
+        for rollup, (i, j) in zip(self._rollups, self._bounds):
+            if j > i:
+                x, y = rollup.series(i, j, self.grain)
+                yield rollup.region, x, y
+
+    def contains(self, date):
+        """
+        Return True when date lies between the first and last selected day.
+        """
+        date = to_datetime64(date)
+        return self.min_date is not None and self.min_date <= date <= self.max_date
+
+    def split(self, date):
+        """
+        Return the selected sales before date and from date onwards.
+        """
+        date = to_datetime64(date)
+        before = after = 0
+        for rollup, (i, j) in zip(self._rollups, self._bounds):
+            region_before, region_after = rollup.split(i, j, date)
+            before += region_before
+            after += region_after
+        return before / 100, after / 100
+
+class SalesRollup:
+    """
+    Precomputed per-region aggregates answering dashboard queries by slicing.
+    """
+
+    def __init__(self, region_rollups):
+        self.region_rollups = region_rollups
+        self.regions = [rollup.region for rollup in region_rollups]
+
+    @classmethod
+    def from_index(cls, index):
+        """
+        Build the rollup from a SalesIndex, one region block at a time.
+        """
+        region_rollups = []
+        for region in index.regions:
+            lo, hi = index.region_block(region)
+            if hi == lo:
+                continue
+            days = index.dates[lo:hi].astype('datetime64[D]')
+            starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+            region_rollups.append(RegionRollup(
+                region,
+                days[starts].astype('datetime64[ns]'),
+                np.add.reduceat(index.cents[lo:hi], starts),
+                np.diff(np.r_[starts, hi - lo])
+            ))
+        return cls(region_rollups)
+
+    @classmethod
+    def from_frame(cls, df):
+        """
+        Build the rollup from a sales frame with sales, date (datetime) and region.
+        """
+        return cls.from_index(SalesIndex.from_frame(df))
+
+    @property
+    def min_date(self):
+        return min((rollup.dates[0] for rollup in self.region_rollups), default=None)
+
+    @property
+    def max_date(self):
+        return max((rollup.dates[-1] for rollup in self.region_rollups), default=None)
+
+    def query(self, start_date=None, end_date=None, region='all', grain=None, max_points=500):
+        """
+        Return a RollupView of the selected dates and region.
+        When grain is None it is chosen from the range width and max_points.
+        """
+        start = to_datetime64(start_date)
+        end = to_datetime64(end_date)
+        rollups = [rollup for rollup in self.region_rollups if region == 'all' or rollup.region == region]
+        bounds = [rollup.bounds(start, end) for rollup in rollups]
+
+        view = RollupView(rollups, bounds, grain or 'D')
+        if grain is None and view.min_date is not None:
+            view.grain = choose_grain(view.min_date, view.max_date, max_points)
+        return view
@@ -0,0 +1,75 @@
+import hashlib
+import os
+import shutil
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from soul_foods_index import SalesIndex
+
+# Directory of memory-mapped index files shared by the dashboard's worker processes
+SHARED_DIR = 'soul_foods_shared'
+
+def version_key(version):
+    """
+    Return a short directory name for a data version signature.
+    """
+    return hashlib.sha1(repr(version).encode('utf-8')).hexdigest()[:16]
+
+@contextmanager
+def build_lock(shared_dir):
+    """
+    Hold an exclusive lock on the shared directory, so concurrently starting
+    workers wait for the first one to write the files instead of all parsing
+    the data. Without fcntl (Windows) every worker may build; the rename in
+    shared_index still keeps the files consistent.
+    """
+    if fcntl is None:
+        yield
+        return
+    with open(os.path.join(shared_dir, '.lock'), 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def shared_index(version, build, shared_dir=SHARED_DIR):
+    """
+    Return the SalesIndex of a data version memory-mapped read-only from the
+    shared directory. The first process to ask builds it with build() and
+    writes it to a temporary directory that is renamed into place, so other
+    processes only ever map complete files. Directories of older versions are
+    removed; processes still mapping them keep their pages until they reload.
+    The files are mapped before the lock is released, so a process building
+    a newer version cannot remove them between the check and the mapping.
+    """
+    os.makedirs(shared_dir, exist_ok=True)
+    key = version_key(version)
+    path = os.path.join(shared_dir, key)
+
+    with build_lock(shared_dir):
+        if not os.path.isdir(path):
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            if os.path.exists(tmp_path):
+                shutil.rmtree(tmp_path)
+            build().save(tmp_path)
+            try:
+                os.replace(tmp_path, path)
+            except OSError:
+                # Another process renamed its copy first
+                if not os.path.isdir(path):
+                    raise
+                shutil.rmtree(tmp_path)
+            print(f"Shared index written to: {path}")
+
+            # Drop the files of older data versions
+            for name in os.listdir(shared_dir):
+                old_path = os.path.join(shared_dir, name)
+                if name != key and not name.startswith('.') and not name.endswith('.tmp') and os.path.isdir(old_path):
+                    shutil.rmtree(old_path, ignore_errors=True)
+
+        return SalesIndex.load(path, mmap=True)
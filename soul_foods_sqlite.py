@@ -0,0 +1,379 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from soul_foods_events import DAY, empty_impact, event_windows
+from soul_foods_index import to_datetime64
+from soul_foods_money import to_cents
+from soul_foods_rollup import choose_grain
+
+# SQLite database written next to the processed CSV
+SQLITE_FILE = 'soul_foods_sales.db'
+
+# Read-only connections kept open per dashboard worker
+DEFAULT_POOL_SIZE = 4
+
+# Column of daily_sales holding the period start of each grain
+GRAIN_COLUMNS = {'D': 'day', 'W': 'week', 'M': 'month'}
+
+# Day numbers bounding an open-ended range
+MIN_DAY = -(1 << 31)
+MAX_DAY = (1 << 31) - 1
+
+NS_PER_DAY = 86400 * 10 ** 9
+
+SCHEMA = """
+CREATE TABLE sales (
+    region TEXT NOT NULL,
+    day INTEGER NOT NULL,
+    cents INTEGER NOT NULL
+);
+CREATE TABLE daily_sales (
+    region TEXT NOT NULL,
+    day INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    cents INTEGER NOT NULL,
+    records INTEGER NOT NULL,
+    PRIMARY KEY (region, day)
+) WITHOUT ROWID;
+"""
+
+def day_number(value, ceil=False):
+    """
+    Return a datetime-like value as days since 1970-01-01, rounded down (or up).
+    """
+    ns = int(to_datetime64(value).astype('int64'))
+    return -(-ns // NS_PER_DAY) if ceil else ns // NS_PER_DAY
+
+def day_bounds(start_date, end_date):
+    """
+    Return the first and last day numbers of a date range; open ends select every day.
+    """
+    start_day = MIN_DAY if start_date is None else day_number(start_date, ceil=True)
+    end_day = MAX_DAY if end_date is None else day_number(end_date)
+    return start_day, end_day
+
+def days_to_datetime64(days):
+    """
+    Return day numbers as datetime64[ns], like the rollup's dates.
+    """
+    if np.ndim(days) == 0:
+        return np.datetime64(int(days), 'D').astype('datetime64[ns]')
+    return np.asarray(days, dtype='int64').astype('datetime64[D]').astype('datetime64[ns]')
+
+def write_sales_db(frames, db_file=SQLITE_FILE):
+    """
+    Bulk-load sales frames (sales, date, region) into a SQLite database.
+
+    Rows go to `sales`, indexed on (region, day), and are pre-aggregated into
+    `daily_sales` with the week and month each day belongs to, which is what
+    the dashboard queries. Money is stored as integer cents. The database is
+    built in a temporary file and swapped in at the end.
+    """
+    tmp_file = db_file + '.tmp'
+    if os.path.exists(tmp_file):
+        os.remove(tmp_file)
+
+    connection = sqlite3.connect(tmp_file)
+    try:
+        connection.execute('PRAGMA journal_mode = OFF')
+        connection.execute('PRAGMA synchronous = OFF')
+        connection.executescript(SCHEMA)
+        for df in frames:
+            if len(df) == 0:
+                continue
+            days = pd.to_datetime(df['date']).to_numpy(dtype='datetime64[D]').astype('int64')
+            connection.executemany(
+                'INSERT INTO sales (region, day, cents) VALUES (?, ?, ?)',
+                zip(df['region'].astype(str).tolist(), days.tolist(), to_cents(df['sales']).tolist())
+            )
+        connection.execute('CREATE INDEX sales_region_day ON sales (region, day)')
+
+        # Weeks start on Monday (1970-01-01 was a Thursday)
+        connection.execute("""
+            INSERT INTO daily_sales (region, day, week, month, cents, records)
+            SELECT region, day, day - (day + 3) % 7,
+                   CAST(julianday(date(day * 86400, 'unixepoch', 'start of month')) - 2440587.5 AS INTEGER),
+                   SUM(cents), COUNT(*)
+            FROM sales
+            GROUP BY region, day
+        """)
+        connection.commit()
+    finally:
+        connection.close()
+
+    os.replace(tmp_file, db_file)
+    print(f"SQLite database saved to: {db_file}")
+    return True
+
+def db_version(db_file=SQLITE_FILE):
+    """
+    Return a cheap signature of the database file, from its stat.
+    """
+    try:
+        stat = os.stat(db_file)
+    except FileNotFoundError:
+        return (db_file, None, None)
+    return (db_file, stat.st_mtime_ns, stat.st_size)
+
+class ConnectionPool:
+    """
+    A fixed set of read-only SQLite connections shared by callback threads.
+
+    Closing the pool closes its idle connections at once and the borrowed
+    ones when they are returned, so callbacks still holding a replaced
+    dataset finish their queries. Threads waiting for a connection are woken
+    up; they and any later queries use a one-off connection.
+    """
+
+    def __init__(self, db_file, size=DEFAULT_POOL_SIZE):
+        self.size = size
+        self.closed = False
+        self._available = threading.Condition()
+        self._uri = f"file:{os.path.abspath(db_file)}?mode=ro"
+        self._connections = [self._connect() for _ in range(size)]
+
+    def _connect(self):
+        return sqlite3.connect(self._uri, uri=True, check_same_thread=False)
+
+    @contextmanager
+    def connection(self):
+        """
+        Borrow a connection, waiting for one to be returned when all are in use.
+        """
+        with self._available:
+            while not self._connections and not self.closed:
+                self._available.wait()
+            connection = None if self.closed else self._connections.pop()
+        if connection is None:
+            connection = self._connect()
+        try:
+            yield connection
+        finally:
+            with self._available:
+                if self.closed:
+                    connection.close()
+                else:
+                    self._connections.append(connection)
+                    self._available.notify()
+
+    @contextmanager
+    def dedicated_connection(self):
+        """
+        Open a read-only connection outside the pool, for long reads such as
+        exports that would otherwise keep a pooled connection from callbacks.
+        """
+        connection = self._connect()
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+    def execute(self, sql, params=()):
+        """
+        Run a parameterized query on a pooled connection and return all rows.
+        """
+        with self.connection() as connection:
+            return connection.execute(sql, params).fetchall()
+
+    def close(self):
+        with self._available:
+            self.closed = True
+            for connection in self._connections:
+                connection.close()
+            self._connections = []
+            self._available.notify_all()
+
+class SqliteView:
+    """
+    The result of a date range and region query against the SQLite backend,
+    with the same attributes and methods as a RollupView.
+    """
+
+    def __init__(self, backend, start_day, end_day, region, grain):
+        self.grain = grain
+        self.regions = [name for name in backend.regions if region == 'all' or name == region]
+        self._pool = backend.pool
+        self._where = 'day BETWEEN ? AND ?' + ('' if region == 'all' else ' AND region = ?')
+        self._params = (start_day, end_day) + (() if region == 'all' else (region,))
+
+        # Totals and first/last day of every region with data in the selection
+        self._bounds = {}
+        self.total_cents = 0
+        self.total_records = 0
+        self.rows = 0
+        rows = self._pool.execute(
+            f"SELECT region, SUM(cents), SUM(records), MIN(day), MAX(day), COUNT(*) FROM daily_sales "
+            f"WHERE {self._where} GROUP BY region ORDER BY region",
+            self._params
+        )
+        for name, cents, records, first, last, days in rows:
+            self._bounds[name] = (first, last)
+            self.rows += days
+            self.total_cents += cents
+            self.total_records += records
+
+        self.min_date = None
+        self.max_date = None
+        if self._bounds:
+            self.min_date = days_to_datetime64(min(first for first, _ in self._bounds.values()))
+            self.max_date = days_to_datetime64(max(last for _, last in self._bounds.values()))
+
+    @property
+    def total_sales(self):
+        """
+        Exact total sales in dollars.
+        """
+        return self.total_cents / 100
+
+    @property
+    def avg_sales(self):
+        """
+        Average sales per record, NaN for an empty selection.
+        """
+        return self.total_cents / 100 / self.total_records if self.total_records else float('nan')
+
+    def series(self):
+        """
+        Yield (region, x, y) for every region with data in the selection,
+        summed per grain period by the database.
+        """
+        column = GRAIN_COLUMNS[self.grain]
+        rows = self._pool.execute(
+            f"SELECT region, {column}, SUM(cents) FROM daily_sales WHERE {self._where} "
+            f"GROUP BY region, {column} ORDER BY region, {column}",
+            self._params
+        )
+        if not rows:
+            return
+        regions = np.array([row[0] for row in rows], dtype=object)
+        periods = np.array([row[1] for row in rows], dtype='int64')
+        cents = np.array([row[2] for row in rows], dtype='int64')
+        starts = np.flatnonzero(np.r_[True, regions[1:] != regions[:-1]])
+        for lo, hi in zip(starts, np.r_[starts[1:], len(rows)]):
+            yield regions[lo], days_to_datetime64(periods[lo:hi]), cents[lo:hi] / 100
+
+    def contains(self, date):
+        """
+        Return True when date lies between the first and last selected day.
+        """
+        date = to_datetime64(date)
+        return self.min_date is not None and self.min_date <= date <= self.max_date
+
+    def split(self, date):
+        """
+        Return the selected sales before date and from date onwards.
+        """
+        day = day_number(date, ceil=True)
+        [(before, after)] = self._pool.execute(
+            f"SELECT COALESCE(SUM(CASE WHEN day < ? THEN cents ELSE 0 END), 0), "
+            f"COALESCE(SUM(CASE WHEN day >= ? THEN cents ELSE 0 END), 0) "
+            f"FROM daily_sales WHERE {self._where}",
+            (day, day) + self._params
+        )
+        return before / 100, after / 100
+
+    def region_impacts(self, events, window_days=None):
+        """
+        Return (region, impact) of every selected region for the event engine,
+        with all before/after and window totals from one aggregate query.
+        """
+        impacts = {region: empty_impact(len(events)) for region in self.regions}
+        if not self._bounds or not len(events):
+            return list(impacts.items())
+
+        # Thresholds per region and event: the event day and its window edges
+        thresholds = []
+        for region, (first, last) in self._bounds.items():
+            first_day, last_day = days_to_datetime64(first), days_to_datetime64(last)
+            window = event_windows(events, first_day, last_day, window_days)
+            edges = np.stack([events, events - window * DAY, events + window * DAY]).astype('int64')
+            edges = -(-edges // NS_PER_DAY)
+            for i in range(len(events)):
+                thresholds.append((i, region, int(edges[0, i]), int(edges[1, i]), int(edges[2, i])))
+            impacts[region] = {
+                'in_range': (first_day <= events) & (events <= last_day),
+                'window_days': window.astype(np.int64),
+                'first_day': first_day,
+                'last_day': last_day
+            }
+            for key in ['before_sales', 'after_sales', 'before_records', 'after_records',
+                        'window_before_sales', 'window_after_sales']:
+                impacts[region][key] = np.zeros(len(events), dtype=np.int64)
+
+        values = ', '.join(['(?, ?, ?, ?, ?)'] * len(thresholds))
+        rows = self._pool.execute(
+            f"WITH events (i, region, day, lo, hi) AS (VALUES {values}) "
+            f"SELECT events.i, events.region, "
+            f"SUM(CASE WHEN s.day < events.day THEN s.cents ELSE 0 END), "
+            f"SUM(CASE WHEN s.day >= events.day THEN s.cents ELSE 0 END), "
+            f"SUM(CASE WHEN s.day < events.day THEN s.records ELSE 0 END), "
+            f"SUM(CASE WHEN s.day >= events.day THEN s.records ELSE 0 END), "
+            f"SUM(CASE WHEN s.day >= events.lo AND s.day < events.day THEN s.cents ELSE 0 END), "
+            f"SUM(CASE WHEN s.day >= events.day AND s.day < events.hi THEN s.cents ELSE 0 END) "
+            f"FROM events JOIN (SELECT region, day, cents, records FROM daily_sales WHERE {self._where}) AS s "
+            f"ON s.region = events.region GROUP BY events.i, events.region",
+            [value for threshold in thresholds for value in threshold] + list(self._params)
+        )
+        for i, region, *totals in rows:
+            for key, total in zip(['before_sales', 'after_sales', 'before_records', 'after_records',
+                                   'window_before_sales', 'window_after_sales'], totals):
+                impacts[region][key][i] = total
+        return list(impacts.items())
+
+class SqliteSalesBackend:
+    """
+    Answers dashboard queries with aggregate SQL over a pool of read-only
+    connections, instead of holding the sales in memory.
+    """
+
+    def __init__(self, db_file=SQLITE_FILE, pool_size=DEFAULT_POOL_SIZE):
+        self.db_file = db_file
+        self.pool = ConnectionPool(db_file, pool_size)
+        self.regions = [row[0] for row in self.pool.execute('SELECT DISTINCT region FROM daily_sales ORDER BY region')]
+        [(first, last)] = self.pool.execute('SELECT MIN(day), MAX(day) FROM daily_sales')
+        self.min_date = None if first is None else days_to_datetime64(first)
+        self.max_date = None if last is None else days_to_datetime64(last)
+
+    def query(self, start_date=None, end_date=None, region='all', grain=None, max_points=500):
+        """
+        Return a SqliteView of the selected dates and region.
+        When grain is None it is chosen from the range width and max_points.
+        """
+        start_day, end_day = day_bounds(start_date, end_date)
+        view = SqliteView(self, start_day, end_day, region, grain or 'D')
+        if grain is None and view.min_date is not None:
+            view.grain = choose_grain(view.min_date, view.max_date, max_points)
+        return view
+
+    def chunks(self, start_date=None, end_date=None, region='all', chunk_rows=65536):
+        """
+        Yield the sales rows of a selection as (sales, date, region) frames of
+        at most chunk_rows rows, region by region in date order, read through
+        the (region, day) index. A streamed export can take as long as the
+        client reads, so it uses its own connection instead of a pooled one,
+        open until the last chunk has been read or the generator is closed.
+        """
+        start_day, end_day = day_bounds(start_date, end_date)
+        where = 'day BETWEEN ? AND ?' + ('' if region == 'all' else ' AND region = ?')
+        params = (start_day, end_day) + (() if region == 'all' else (region,))
+        with self.pool.dedicated_connection() as connection:
+            cursor = connection.execute(f"SELECT cents, day, region FROM sales WHERE {where} ORDER BY region, day", params)
+            while True:
+                rows = cursor.fetchmany(chunk_rows)
+                if not rows:
+                    break
+                cents, days, regions = zip(*rows)
+                yield pd.DataFrame({
+                    'sales': np.array(cents, dtype=np.int64) / 100,
+                    'date': days_to_datetime64(days),
+                    'region': regions
+                })
+
+    def close(self):
+        self.pool.close()
@@ -0,0 +1,213 @@
+import pandas as pd
+import json
+import os
+import shutil
+from urllib.parse import quote, unquote
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:
+    pa = None
+    feather = None
+
+# Processed sales CSV and the columnar store written next to it
+SALES_CSV_FILE = 'soul_foods_pink_morsels_sales.csv'
+STORE_DIR = 'soul_foods_store'
+
+# Sales of every product, written by a multi-product ingest
+PRODUCTS_CSV_FILE = 'soul_foods_products_sales.csv'
+PRODUCTS_STORE_DIR = 'soul_foods_products_store'
+
+# File in a store recording the stat of the CSV it was written with
+STORE_SOURCE_FILE = 'source.json'
+
+def store_available():
+    """
+    Return True when pyarrow is installed and the columnar store can be used.
+    """
+    return pa is not None
+
+def partition_path(store_dir, region, month, product=None):
+    """
+    Return the Feather file holding one region and month of sales, below a
+    product directory when the store holds several products.
+    """
+    if product is not None:
+        store_dir = os.path.join(store_dir, f"product={quote(product)}")
+    return os.path.join(store_dir, f"region={region}", f"month={month}.feather")
+
+def write_partition(store_dir, region, month, frames, product=None):
+    """
+    Write the rows of one region and month as an uncompressed Feather file,
+    so readers can memory-map it.
+    """
+    part = pd.concat(frames, ignore_index=True)
+    table = pa.table({
+        'date': pa.array(part['date'].to_numpy(dtype='datetime64[ns]'), type=pa.timestamp('ns')),
+        'sales': pa.array(part['sales'].to_numpy(dtype='float64'), type=pa.float64())
+    })
+    path = partition_path(store_dir, region, month, product)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    feather.write_feather(table, path, compression='uncompressed')
+
+def csv_signature(csv_file):
+    """
+    Return the size and mtime of a CSV, or None when it does not exist.
+    """
+    try:
+        stat = os.stat(csv_file)
+    except FileNotFoundError:
+        return None
+    return {'size': stat.st_size, 'mtime': stat.st_mtime_ns}
+
+def write_sales_store(frames, store_dir=STORE_DIR, csv_file=None):
+    """
+    Write sales frames (sales, date, region) to a store partitioned by region and month.
+    Frames with a product column are partitioned by product first.
+
+    `frames` is an iterable of frames sorted by date, such as a chunked CSV
+    reader, so only the months still being filled are held in memory. The
+    store is built in a temporary directory and swapped in at the end.
+    With csv_file, the store records the stat of that CSV, written just
+    before with the same rows, see data_source.
+    Returns False when pyarrow is not installed.
+    """
+    if not store_available():
+        print("Warning: pyarrow is not installed, skipping the columnar store")
+        return False
+
+    tmp_dir = store_dir + '.tmp'
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    pending = {}
+    for df in frames:
+        if len(df) == 0:
+            continue
+        df = df[[column for column in ['sales', 'date', 'region', 'product'] if column in df]].copy()
+        df['date'] = pd.to_datetime(df['date'])
+        months = df['date'].dt.strftime('%Y-%m')
+        products = df['product'] if 'product' in df else pd.Series(None, index=df.index, dtype=object)
+        for (product, region, month), group in df.groupby([products, df['region'], months], sort=False, dropna=False):
+            pending.setdefault((product_name(product), region, month), []).append(group)
+
+        # Months before the newest one seen are complete once input is date sorted
+        newest_month = months.max()
+        for key in [key for key in pending if key[2] < newest_month]:
+            write_partition(tmp_dir, key[1], key[2], pending.pop(key), key[0])
+
+    for (product, region, month), group_frames in pending.items():
+        write_partition(tmp_dir, region, month, group_frames, product)
+    if csv_file is not None:
+        with open(os.path.join(tmp_dir, STORE_SOURCE_FILE), 'w') as f:
+            json.dump(csv_signature(csv_file), f)
+
+    # Swap the new store in place of the old one
+    old_dir = store_dir + '.old'
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if os.path.exists(store_dir):
+        os.rename(store_dir, old_dir)
+    os.rename(tmp_dir, store_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+    print(f"Columnar store saved to: {store_dir}")
+    return True
+
+def product_name(value):
+    """
+    Return the product of a partition key, or None for a single-product store.
+    """
+    return None if pd.isna(value) else value
+
+def read_region_partitions(product_dir):
+    """
+    Read the region partitions below a directory, memory-mapped, adding the region column.
+    """
+    tables = []
+    for region_dir in sorted(os.listdir(product_dir)):
+        if not region_dir.startswith('region='):
+            continue
+        region = region_dir[len('region='):]
+        for part_file in sorted(os.listdir(os.path.join(product_dir, region_dir))):
+            table = feather.read_table(os.path.join(product_dir, region_dir, part_file), memory_map=True)
+            tables.append(table.append_column('region', pa.array([region] * table.num_rows, type=pa.string())))
+    return tables
+
+def load_sales_store(store_dir=STORE_DIR):
+    """
+    Load every partition of the store, memory-mapped, into one sales frame.
+    A multi-product store also gets a product column.
+    """
+    product_dirs = sorted(name for name in os.listdir(store_dir) if name.startswith('product='))
+    columns = ['sales', 'date', 'region']
+    if product_dirs:
+        columns.append('product')
+        tables = []
+        for product_dir in product_dirs:
+            product = unquote(product_dir[len('product='):])
+            for table in read_region_partitions(os.path.join(store_dir, product_dir)):
+                tables.append(table.append_column('product', pa.array([product] * table.num_rows, type=pa.string())))
+    else:
+        tables = read_region_partitions(store_dir)
+
+    if not tables:
+        return pd.DataFrame({
+            'sales': pd.Series(dtype='float64'),
+            'date': pd.Series(dtype='datetime64[ns]'),
+            'region': pd.Series(dtype=object)
+        })
+    return pa.concat_tables(tables).to_pandas()[columns]
+
+def store_matches(csv_file=SALES_CSV_FILE, store_dir=STORE_DIR):
+    """
+    Return True when the store holds the same data as the CSV: it recorded
+    the CSV's current stat when it was written, or there is no CSV. A run
+    that rewrote the CSV without the store (--no-store) leaves a stale store.
+    """
+    signature = csv_signature(csv_file)
+    if signature is None:
+        return True
+    try:
+        with open(os.path.join(store_dir, STORE_SOURCE_FILE)) as f:
+            return json.load(f) == signature
+    except (OSError, ValueError):
+        return False
+
+def data_source(csv_file=SALES_CSV_FILE, store_dir=STORE_DIR):
+    """
+    Return the path load_sales_data reads: the store directory when it is
+    up to date with the CSV, or the CSV.
+    """
+    if store_available() and os.path.isdir(store_dir) and store_matches(csv_file, store_dir):
+        return store_dir
+    return csv_file
+
+def data_version(csv_file=SALES_CSV_FILE, store_dir=STORE_DIR):
+    """
+    Return a cheap signature of the current sales data, from the source's stat.
+    The store is swapped in by renaming a new directory, so its mtime changes
+    on every rewrite.
+    """
+    source = data_source(csv_file, store_dir)
+    try:
+        stat = os.stat(source)
+    except FileNotFoundError:
+        return (source, None, None)
+    return (source, stat.st_mtime_ns, stat.st_size)
+
+def load_sales_data(csv_file=SALES_CSV_FILE, store_dir=STORE_DIR):
+    """
+    Load the processed sales for the dashboard, sorted by date and region.
+    Reads the columnar store when it is up to date and falls back to the CSV.
+    """
+    if data_source(csv_file, store_dir) == store_dir:
+        df = load_sales_store(store_dir)
+    else:
+        df = pd.read_csv(csv_file)
+
+        # Convert date column to datetime
+        df['date'] = pd.to_datetime(df['date'])
+
+    # Sort by date
+    return df.sort_values(['date', 'region'], kind='stable').reset_index(drop=True)
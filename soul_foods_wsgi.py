@@ -0,0 +1,22 @@
+"""
+WSGI entry point for serving the dashboard with several worker processes.
+
+Usage: gunicorn --workers 4 --threads 2 --bind 0.0.0.0:8050 "soul_foods_wsgi:create_app()"
+
+Workers are forked before the app is imported (do not use --preload, the
+data reload thread does not survive a fork). Each worker maps the sales
+index read-only from SOUL_FOODS_SHARED_DIR (default soul_foods_shared), which
+the first worker writes, so the data is held in memory once for all workers.
+"""
+import os
+
+from soul_foods_shared import SHARED_DIR
+
+def create_app(shared_dir=None):
+    """
+    Return the dashboard's WSGI application (its Flask server), configured to
+    share the memory-mapped sales index between processes.
+    """
+    os.environ.setdefault('SOUL_FOODS_SHARED_DIR', shared_dir or SHARED_DIR)
+    import soul_foods_dashboard
+    return soul_foods_dashboard.app.server
@@ -30,7 +30,7 @@ def test_header_present():
     assert app.layout is not None
     
     # Check first child (header container)
-    first_child = app.layout.children[0]
+    first_child = app.layout().children[0]
     
     # Check if H1 is in the first child's children
     header_found = False
@@ -73,7 +73,7 @@ def test_visualization_present():
             if hasattr(element, 'children') and "📊 Sales Performance Over Time" in str(element.children):
                 chart_container_found = True
     
-    search_layout_recursively(app.layout, search_for_chart)
+    search_layout_recursively(app.layout(), search_for_chart)
     
     # Assert that chart was found
     assert chart_found, "Chart (Graph) element not found in app layout"
@@ -106,7 +106,7 @@ def test_region_picker_present():
             if hasattr(element, 'children') and "🌍 Filter by Region:" in str(element.children):
                 region_label_found = True
     
-    search_layout_recursively(app.layout, search_for_region_picker)
+    search_layout_recursively(app.layout(), search_for_region_picker)
     
     # Assert that region picker was found
     assert radio_items_found, "RadioItems element not found in app layout"
@@ -145,7 +145,7 @@ def test_app_layout_structure():
                 elif "💡 Business Insight" in children_str:
                     business_insight_found = True
     
-    search_layout_recursively(app.layout, search_for_components)
+    search_layout_recursively(app.layout(), search_for_components)
     
     # Assert that all components were found
     assert business_question_found, "Business question section not found"
@@ -171,6 +171,432 @@ def test_app_import():
     
     print("✅ App import test passed - App structure is correct")
 
+def test_update_chart_full_range():
+    """
+    Test that the callbacks answer a query spanning the price increase from the rollup.
+    """
+    from soul_foods_dashboard import chart_data, data_provider, update_summary
+
+    sales_index = data_provider.current.sales_index
+
+    start_date = str(sales_index.min_date)[:10]
+    end_date = str(sales_index.max_date)[:10]
+    chart = chart_data(start_date, end_date, 'all')
+
+    # One trace per region, reduced to weekly points for the multi-year range
+    assert [trace['name'] for trace in chart['data']] == ['East', 'North', 'South', 'West']
+    assert all(len(trace['x']) <= 500 for trace in chart['data'])
+
+    # The price increase marker and the exact totals are present
+    assert len(chart['shapes']) == 1 and len(chart['annotations']) == 1
+    summary_text = str(update_summary(start_date, end_date, 'all'))
+    assert f"Total Sales: ${sales_index.sales.sum():,.2f}" in summary_text
+    assert f"Total Records: {len(sales_index):,}" in summary_text
+
+    print("✅ Callback test passed - Chart and summary are built from the rollup")
+
+def test_update_chart_patches_only_data():
+    """
+    Test that the chart callback sends a partial update without the static layout.
+    """
+    from soul_foods_dashboard import app, update_chart
+
+    patch = update_chart('2020-12-01', '2021-02-28', 'north').to_plotly_json()
+    locations = [operation['location'] for operation in patch['operations']]
+    assert locations == [['data'], ['layout', 'shapes'], ['layout', 'annotations'], ['layout', 'uirevision'],
+                         ['layout', 'title', 'text']]
+    assert patch['operations'][-1]['params']['value'] == "🍪 Pink Morsels Sales Performance Over Time by Region"
+
+    # The styling is part of the initial figure instead
+    def find_graph(element):
+        if getattr(element, 'id', None) == 'sales-chart':
+            return element
+        children = getattr(element, 'children', None)
+        for child in children if isinstance(children, list) else [children]:
+            if child is not None and not isinstance(child, str):
+                found = find_graph(child)
+                if found is not None:
+                    return found
+        return None
+
+    graph = find_graph(app.layout())
+    assert graph.figure.layout.title.text == "🍪 Pink Morsels Sales Performance Over Time by Region"
+
+    print("✅ Patch test passed - Only trace data, the marker and the title are sent")
+
+def test_callbacks_share_cached_view():
+    """
+    Test that the chart, summary and insight callbacks share one cached view,
+    also for an equivalent date format.
+    """
+    from soul_foods_dashboard import chart_cache, query_view, update_insight, update_summary
+
+    first = query_view('2020-12-01', '2021-02-28', 'north')
+    hits = chart_cache.stats()['hits']
+    assert query_view('2020-12-01T00:00:00', '2021-02-28T00:00:00', 'north') is first
+    assert chart_cache.stats()['hits'] == hits + 1
+
+    # Unchanged numbers reuse the same component trees
+    assert update_summary('2020-12-01', '2021-02-28', 'north') is update_summary('2020-12-01', '2021-02-28', 'north')
+    assert update_insight('2020-12-01', '2021-02-28', 'north') is update_insight('2020-12-01', '2021-02-28', 'north')
+
+    print("✅ Cache test passed - Callbacks share the cached view")
+
+def test_zoom_fetches_full_resolution_window():
+    """
+    Test that a zoomed relayoutData window is answered with daily points for that window only.
+    """
+    import numpy as np
+    from soul_foods_dashboard import chart_data, zoom_window
+
+    relayout_data = {'xaxis.range[0]': '2020-12-01 00:00:00', 'xaxis.range[1]': '2021-02-28 00:00:00'}
+    chart = chart_data('2018-02-06', '2022-02-14', 'south', zoom_window(relayout_data))
+
+    x = np.array(chart['data'][0]['x'], dtype='datetime64[D]')
+    assert x[0] == np.datetime64('2020-12-01') and x[-1] == np.datetime64('2021-02-28')
+    assert len(x) == 90
+
+    print("✅ Zoom test passed - The visible window is sent at daily resolution")
+
+def test_zoom_is_dropped_when_the_filters_change():
+    """
+    Test that the zoom kept in relayoutData only narrows the chart when the
+    zoom triggered the callback, not after the date range or region changed.
+    """
+    import json
+
+    client = app.server.test_client()
+    zoom = {'xaxis.range[0]': '2021-01-01 00:00:00', 'xaxis.range[1]': '2021-01-31 00:00:00'}
+
+    def chart_points(start_date, end_date, region, changed):
+        body = {
+            'output': 'sales-chart.figure',
+            'outputs': {'id': 'sales-chart', 'property': 'figure'},
+            'inputs': [
+                {'id': 'date-picker', 'property': 'start_date', 'value': start_date},
+                {'id': 'date-picker', 'property': 'end_date', 'value': end_date},
+                {'id': 'region-filter', 'property': 'value', 'value': region},
+                {'id': 'sales-chart', 'property': 'relayoutData', 'value': zoom},
+                {'id': 'product-filter', 'property': 'value', 'value': 'pink morsel'},
+                {'id': 'data-version', 'property': 'data', 'value': None}
+            ],
+            'state': [{'id': 'live-toggle', 'property': 'value', 'value': []}],
+            'changedPropIds': [changed]
+        }
+        response = client.post('/_dash-update-component', json=body)
+        assert response.status_code == 200
+        operations = json.loads(response.get_data(as_text=True))['response']['sales-chart']['figure']['operations']
+        return [len(trace['x']) for trace in operations[0]['params']['value']]
+
+    # The zoom itself is answered at daily resolution for the window
+    assert chart_points('2018-02-06', '2022-02-14', 'north', 'sales-chart.relayoutData') == [31]
+
+    # A new date range or region shows the whole new selection
+    assert chart_points('2018-02-06', '2022-02-14', 'south', 'region-filter.value')[0] > 31
+    assert chart_points('2019-01-01', '2019-12-31', 'north', 'date-picker.start_date')[0] > 0
+
+    print("✅ Stale zoom test passed - A filter change drops the previous zoom")
+
+def test_clientside_payload_matches_data():
+    """
+    Test that the client-side payload carries every region's daily series and totals.
+    """
+    from soul_foods_dashboard import clientside_payload, data_provider
+
+    sales_index = data_provider.current.sales_index
+
+    payload = clientside_payload()
+    assert payload['regions'] == ['east', 'north', 'south', 'west']
+    assert sum(sum(series['counts']) for series in payload['series'].values()) == len(sales_index)
+    assert sum(sum(series['cents']) for series in payload['series'].values()) == sales_index.cents.sum()
+    assert payload['price_increase_day'] == 18642
+    assert [marker['day'] for marker in payload['event_markers']] == [18642]
+
+    print("✅ Client-side payload test passed - The browser gets the full daily series")
+
+def test_webgl_follows_trace_length_before_downsampling():
+    """
+    Test that a trace longer than the WebGL threshold is drawn with WebGL even
+    though downsampling leaves fewer points than the threshold.
+    """
+    import soul_foods_dashboard
+
+    threshold = soul_foods_dashboard.WEBGL_POINT_THRESHOLD
+    soul_foods_dashboard.WEBGL_POINT_THRESHOLD = soul_foods_dashboard.DOWNSAMPLE_POINTS + 100
+    try:
+        window = ('2020-01-01', '2021-12-31')
+        chart = soul_foods_dashboard.build_chart_data(None, None, 'north', window)
+        assert chart['data'][0]['type'] == 'scattergl'
+        assert len(chart['data'][0]['x']) <= soul_foods_dashboard.DOWNSAMPLE_POINTS
+
+        chart = soul_foods_dashboard.build_chart_data(None, None, 'north', ('2021-01-01', '2021-03-31'))
+        assert chart['data'][0]['type'] == 'scatter'
+    finally:
+        soul_foods_dashboard.WEBGL_POINT_THRESHOLD = threshold
+
+    print("✅ WebGL test passed - The mode follows the trace length before downsampling")
+
+def test_summary_uses_event_engine():
+    """
+    Test that the before/after totals come from the event engine and add up to the total.
+    """
+    from soul_foods_dashboard import event_impacts, price_increase_split, query_view
+
+    in_range, before_increase, after_increase = price_increase_split('2020-12-01', '2021-02-28', 'all')
+    view = query_view('2020-12-01', '2021-02-28', 'all')
+    assert in_range
+    assert round((before_increase + after_increase) * 100) == view.total_cents
+    assert (before_increase, after_increase) == view.split('2021-01-15')
+
+    impacts = event_impacts('2020-12-01', '2021-02-28', 'all')
+    assert list(impacts['region']) == ['east', 'north', 'south', 'west', 'all']
+
+    assert price_increase_split('2019-01-01', '2019-12-31', 'all') == (False, None, None)
+
+    print("✅ Event engine test passed - Before/after totals come from the prefix sums")
+
+def test_product_filter_selects_product_rollup():
+    """
+    Test that the product dropdown defaults to pink morsels and that another
+    product's rollup is queried by its own cache entries.
+    """
+    import pandas as pd
+    import soul_foods_dashboard
+    from soul_foods_rollup import SalesRollup
+
+    found = []
+    search_layout_recursively(app.layout(), lambda element: found.append(element) if getattr(element, 'id', None) == 'product-filter' else None)
+    assert found and found[0].value == 'pink morsel'
+
+    gold_df = pd.DataFrame({
+        'sales': [10.0, 20.0, 30.0],
+        'date': pd.to_datetime(['2021-01-14', '2021-01-15', '2021-01-16']),
+        'region': ['north', 'north', 'south']
+    })
+    product_rollups = soul_foods_dashboard.data_provider.current.product_rollups
+    product_rollups['gold morsel'] = SalesRollup.from_frame(gold_df)
+    try:
+        view = soul_foods_dashboard.query_view('2021-01-01', '2021-01-31', 'all', 'gold morsel')
+        assert view.total_sales == 60.0 and view.total_records == 3
+        assert soul_foods_dashboard.price_increase_split('2021-01-01', '2021-01-31', 'all', 'gold morsel') == (True, 10.0, 50.0)
+        chart = soul_foods_dashboard.chart_data('2021-01-01', '2021-01-31', 'north', None, 'gold morsel')
+        assert [list(trace['y']) for trace in chart['data']] == [[10.0, 20.0]]
+
+        # The title and the price increase wording follow the product
+        patch = soul_foods_dashboard.update_chart('2021-01-01', '2021-01-31', 'north', None, 'gold morsel').to_plotly_json()
+        assert patch['operations'][-1]['params']['value'] == "🍪 Gold Morsels Sales Performance Over Time by Region"
+        assert 'Pink Morsel Price Increase' in chart['annotations'][0]['text']
+        summary = str(soul_foods_dashboard.update_summary('2021-01-01', '2021-01-31', 'all', 'gold morsel'))
+        assert 'Sales Before Pink Morsel Price Increase (Jan 15, 2021): $10.00' in summary
+        insight = str(soul_foods_dashboard.update_insight('2021-01-01', '2021-01-31', 'all', 'gold morsel'))
+        assert 'Gold Morsel sales were HIGHER after the pink morsel price increase!' in insight
+        assert 'Sales Before Price Increase (Jan 15, 2021)' in str(soul_foods_dashboard.update_summary('2021-01-01', '2021-01-31', 'all'))
+    finally:
+        del product_rollups['gold morsel']
+
+    print("✅ Product filter test passed - Each product is queried from its own rollup")
+
+def test_refresh_data_follows_reloaded_bounds():
+    """
+    Test that a reload moves the date picker bounds and a selection ending at
+    the old last date, and that nothing is sent while the data is unchanged.
+    """
+    import pandas as pd
+    from dash.exceptions import PreventUpdate
+    from soul_foods_dashboard import data_provider, refresh_data, serve_layout
+    from soul_foods_rollup import SalesRollup
+    from soul_foods_provider import Dataset
+
+    current = data_provider.current
+    shown = {'generation': current.generation, 'bounds': [str(current.min_date)[:10], str(current.max_date)[:10]]}
+    with pytest.raises(PreventUpdate):
+        refresh_data(1, '2020-01-01', shown['bounds'][1], shown)
+
+    # Swap in a dataset with one more day, as a reload after an ingest would
+    extended = SalesRollup.from_frame(pd.DataFrame({
+        'sales': [5.0, 7.0],
+        'date': pd.to_datetime([shown['bounds'][0], '2022-02-15']),
+        'region': ['north', 'north']
+    }))
+    data_provider._dataset = Dataset(current.version, extended, None, {'pink morsel': extended}, current.generation + 1)
+    try:
+        min_allowed, max_allowed, start_date, end_date, options, version, _ = refresh_data(2, '2020-01-01', shown['bounds'][1], shown)
+        assert (min_allowed, max_allowed) == (shown['bounds'][0], '2022-02-15')
+        assert (start_date, end_date) == ('2020-01-01', '2022-02-15')
+        assert options == [{'label': 'Pink Morsel', 'value': 'pink morsel'}]
+        assert version == {'generation': current.generation + 1, 'bounds': [shown['bounds'][0], '2022-02-15']}
+
+        # A selection inside the old range is kept
+        assert refresh_data(3, '2020-01-01', '2020-06-30', shown)[2:4] == ('2020-01-01', '2020-06-30')
+
+        # A page opened after the reload is built from the new data
+        pickers = []
+        search_layout_recursively(serve_layout(), lambda element: pickers.append(element) if getattr(element, 'id', None) == 'date-picker' else None)
+        assert str(pickers[0].max_date_allowed)[:10] == '2022-02-15'
+    finally:
+        data_provider._dataset = current
+
+    print("✅ Reload test passed - Date picker and new pages follow the reloaded data")
+
+def test_metrics_endpoint_reports_callback_phases():
+    """
+    Test that a callback request shows up on /metrics with its phases, rows
+    scanned and payload size.
+    """
+    client = app.server.test_client()
+    body = {
+        'output': 'sales-chart.figure',
+        'outputs': {'id': 'sales-chart', 'property': 'figure'},
+        'inputs': [
+            {'id': 'date-picker', 'property': 'start_date', 'value': '2019-04-01'},
+            {'id': 'date-picker', 'property': 'end_date', 'value': '2021-04-30'},
+            {'id': 'region-filter', 'property': 'value', 'value': 'south'},
+            {'id': 'sales-chart', 'property': 'relayoutData', 'value': None},
+            {'id': 'product-filter', 'property': 'value', 'value': 'pink morsel'},
+            {'id': 'data-version', 'property': 'data', 'value': None}
+        ],
+        'state': [{'id': 'live-toggle', 'property': 'value', 'value': []}],
+        'changedPropIds': ['date-picker.start_date']
+    }
+    assert client.post('/_dash-update-component', json=body).status_code == 200
+
+    response = client.get('/metrics')
+    assert response.status_code == 200 and response.mimetype == 'text/plain'
+    text = response.get_data(as_text=True)
+    for phase in ['filter', 'traces', 'vlines', 'serialize']:
+        assert f'soul_foods_callback_phase_seconds_count{{callback="update_chart",phase="{phase}"}}' in text
+    assert 'soul_foods_callback_seconds_count{callback="update_chart"}' in text
+    assert 'soul_foods_response_bytes_count{output="sales-chart.figure"}' in text
+    assert '# TYPE soul_foods_rows_scanned_total counter' in text
+    assert 'soul_foods_cache_misses' in text
+
+    print("✅ Metrics test passed - Callback phases are exposed on /metrics")
+
+def test_load_test_requests_match_callbacks():
+    """
+    Test that the load harness posts the inputs the registered callbacks expect.
+    """
+    import os
+    import sys
+    import numpy as np
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks'))
+    from load_test import interaction
+
+    client = app.server.test_client()
+    rng = np.random.default_rng(0)
+    for _ in range(5):
+        for name, body in interaction(rng, zoom_fraction=0.5):
+            response = client.post('/_dash-update-component', data=body, content_type='application/json')
+            assert response.status_code == 200, name
+
+    print("✅ Load test harness test passed - Requests match the callback inputs")
+
+def test_live_mode_extends_chart_with_new_days():
+    """
+    Test that live mode redraws the chart once, then sends only the days
+    completed by appended rows through extendData, with running totals.
+    """
+    import os
+    import tempfile
+    import soul_foods_dashboard
+    from dash.exceptions import PreventUpdate
+    from soul_foods_dashboard import LIVE_MAX_POINTS, data_provider, query_view, update_live
+    from soul_foods_live import LiveFeed
+
+    def append_day(path, date):
+        with open(path, 'a', newline='') as f:
+            for region in ['north', 'south', 'east', 'west']:
+                f.write(f"pink morsel,$5.00,10,{date},{region}\r\ngold morsel,$9.99,1,{date},{region}\r\n")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'daily_sales_data_9.csv')
+        with open(path, 'w', newline='') as f:
+            f.write('product,price,quantity,date,region\r\n')
+        feed = LiveFeed(os.path.join(tmp_dir, 'daily_sales_data_*.csv'), soul_foods_dashboard.PRICE_INCREASE_DATE,
+                        min_poll_seconds=0)
+        feed.reset(data_provider.current)
+        original_feed = soul_foods_dashboard.live_feed
+        soul_foods_dashboard.live_feed = feed
+        try:
+            # Turning live mode on redraws the chart and locks the date and product filters
+            figure, extend_data, cursor, _, _, interval_disabled, *locked = update_live(None, ['live'], 'all', None, None, None)
+            operations = figure.to_plotly_json()['operations']
+            traces = operations[0]['params']['value']
+            assert [trace['name'] for trace in traces] == ['East', 'North', 'South', 'West']
+            assert len(traces[0]['x']) == LIVE_MAX_POINTS and interval_disabled is False and locked == [True, True]
+            last_day = cursor['days'][0]
+            
+            # Nothing new: no update is sent
+            try:
+                update_live(1, ['live'], 'all', cursor, None, None)
+                assert False, "expected PreventUpdate"
+            except PreventUpdate:
+                pass
+            
+            # A new day completes the last day of the data; only its points are sent
+            append_day(path, '2022-02-15')
+            append_day(path, '2022-02-16')
+            figure, extend_data, cursor, *_ = update_live(2, ['live'], 'all', cursor, None, None)
+            assert figure is dash.no_update
+            points, indices, max_points = extend_data
+            assert indices == [0, 1, 2, 3] and max_points == LIVE_MAX_POINTS
+            assert points['x'][1] == ['2022-02-14', '2022-02-15'] and points['y'][1][-1] == 50.0
+            assert cursor['days'][1] == last_day + 2
+            
+            # The totals include the appended rows without a recompute of the history
+            total_sales, _, total_records, in_range, _, after = feed.sales.summary(['north'])
+            view = query_view(None, None, 'north')
+            assert total_records == view.total_records + 2 and total_sales == view.total_sales + 100
+            assert after == view.split(soul_foods_dashboard.PRICE_INCREASE_DATE)[1] + 100
+            
+            # Turning live mode off restores the filtered chart and unlocks the filters
+            result = update_live(3, [], 'all', cursor, None, None)
+            assert result[2] is None and result[5:] == (True, False, False)
+        finally:
+            soul_foods_dashboard.live_feed = original_feed
+
+    print("✅ Live mode test passed - New days are appended with extendData")
+
+def test_export_streams_the_chart_selection():
+    """
+    Test that the export route streams exactly the rows behind the chart's
+    totals, as CSV or gzip compressed Arrow, and rejects unknown parameters.
+    """
+    import gzip
+    import io
+    import pandas as pd
+    import pyarrow as pa
+    from soul_foods_dashboard import app, query_view, update_export_links
+
+    client = app.server.test_client()
+    for start_date, end_date, region in [(None, None, 'all'), ('2020-12-01', '2021-02-28', 'north'),
+                                         ('2021-01-15T12:00:00', '2021-03-01', 'west'), ('2019-03-07', None, 'east')]:
+        view = query_view(start_date, end_date, region)
+        csv_url, arrow_url, style = update_export_links(start_date, end_date, region)
+        assert 'display' not in style
+
+        response = client.get(csv_url)
+        assert response.status_code == 200 and response.is_streamed and response.mimetype == 'text/csv'
+        assert 'Content-Encoding' not in response.headers
+        df = pd.read_csv(io.BytesIO(response.data))
+        assert list(df.columns) == ['sales', 'date', 'region']
+        assert len(df) == view.total_records and round(df['sales'].sum() * 100) == view.total_cents
+
+        response = client.get(arrow_url, headers={'Accept-Encoding': 'gzip'})
+        assert response.headers['Content-Encoding'] == 'gzip'
+        table = pa.ipc.open_stream(gzip.decompress(response.data)).read_all()
+        assert table.num_rows == view.total_records
+
+    assert 'attachment; filename="soul_foods_pink_morsels_north_2020-12-01_2021-02-28.csv"' == \
+        client.get('/export?start_date=2020-12-01&end_date=2021-02-28&region=north').headers['Content-Disposition']
+    for query in ['format=xlsx', 'region=mars', 'start_date=soon&end_date=later', 'product=gold+morsel']:
+        assert client.get(f"/export?{query}").status_code == 400, query
+
+    # Other products have no row-level data, so the links are hidden
+    assert update_export_links(None, None, 'all', 'gold morsel')[2]['display'] == 'none'
+
+    print("✅ Export test passed - Downloads match the chart selection")
+
 if __name__ == "__main__":
     # Run tests
     print("🧪 Running Soul Foods Dashboard Test Suite...")
@@ -182,6 +608,20 @@ if __name__ == "__main__":
         test_visualization_present()
         test_region_picker_present()
         test_app_layout_structure()
+        test_update_chart_full_range()
+        test_update_chart_patches_only_data()
+        test_callbacks_share_cached_view()
+        test_zoom_fetches_full_resolution_window()
+        test_zoom_is_dropped_when_the_filters_change()
+        test_clientside_payload_matches_data()
+        test_webgl_follows_trace_length_before_downsampling()
+        test_summary_uses_event_engine()
+        test_product_filter_selects_product_rollup()
+        test_refresh_data_follows_reloaded_bounds()
+        test_metrics_endpoint_reports_callback_phases()
+        test_load_test_requests_match_callbacks()
+        test_live_mode_extends_chart_with_new_days()
+        test_export_streams_the_chart_selection()
         
         print("=" * 50)
         print("🎉 All tests passed! Dashboard is working correctly.")
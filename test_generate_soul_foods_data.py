@@ -0,0 +1,40 @@
+import os
+import pandas as pd
+
+from generate_soul_foods_data import generate_soul_foods_data, scale_config
+from process_soul_foods_data import discover_input_files, process_soul_foods_data
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def test_scale_one_matches_sample_shape(tmp_path):
+    """
+    Test that scale 1 writes files shaped like the sample data: same products,
+    prices, dates and regions in the same order, only the quantities differ.
+    """
+    paths = generate_soul_foods_data(str(tmp_path), scale=1)
+    assert [os.path.basename(path) for path in paths] == [f"daily_sales_data_{i}.csv" for i in range(3)]
+
+    for path in paths:
+        generated = pd.read_csv(path)
+        sample = pd.read_csv(os.path.join(REPO_DIR, 'data', os.path.basename(path)))
+        assert list(generated.columns) == list(sample.columns)
+        pd.testing.assert_frame_equal(generated.drop(columns='quantity'), sample.drop(columns='quantity'))
+        assert generated['quantity'].between(400, 600).all()
+
+def test_larger_scale_generates_more_of_everything(tmp_path, monkeypatch):
+    """
+    Test extra records, years, regions and products, and that the ingest reads them.
+    """
+    data_dir = str(tmp_path / 'data')
+    paths = generate_soul_foods_data(data_dir, scale=4, years=0.5, regions=6, products=9)
+    assert len(paths) == scale_config(4)['files'] == 6
+
+    df = pd.concat(pd.read_csv(path) for path in paths)
+    days = round(0.5 * 365.25)
+    assert len(df) == days * 6 * 9 * 4
+    assert df['region'].nunique() == 6 and df['product'].nunique() == 9
+    assert df.groupby(['date', 'product', 'region']).size().eq(4).all()
+
+    monkeypatch.chdir(tmp_path)
+    output = process_soul_foods_data(discover_input_files(os.path.join(data_dir, '*.csv')), store_dir=None)
+    assert len(output) == days * 6 * 4
@@ -0,0 +1,250 @@
+import os
+import pandas as pd
+import pytest
+
+from process_soul_foods_data import discover_input_files, process_soul_foods_data
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_PATTERN = os.path.join(REPO_DIR, 'data', 'daily_sales_data_*.csv')
+EXPECTED_OUTPUT = os.path.join(REPO_DIR, 'soul_foods_pink_morsels_sales.csv')
+
+def read_bytes(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """
+    Run the ingest in a temporary directory so the committed output is untouched.
+    """
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+def test_discover_input_files():
+    """
+    Test that the daily sales files are discovered by glob in a stable order.
+    """
+    files = discover_input_files(DATA_PATTERN)
+    assert [os.path.basename(f) for f in files] == [
+        'daily_sales_data_0.csv',
+        'daily_sales_data_1.csv',
+        'daily_sales_data_2.csv'
+    ]
+
+def test_serial_output_matches_committed_csv(workdir):
+    """
+    Test that the serial ingest reproduces the committed output exactly.
+    """
+    process_soul_foods_data(discover_input_files(DATA_PATTERN))
+    assert read_bytes(workdir / 'soul_foods_pink_morsels_sales.csv') == read_bytes(EXPECTED_OUTPUT)
+
+def test_parallel_output_matches_serial(workdir):
+    """
+    Test that the parallel ingest returns and writes the same data as the serial one.
+    """
+    files = discover_input_files(DATA_PATTERN)
+    serial_df = process_soul_foods_data(files)
+    parallel_df = process_soul_foods_data(files, parallel=True, workers=2)
+
+    pd.testing.assert_frame_equal(serial_df, parallel_df)
+    assert read_bytes(workdir / 'soul_foods_pink_morsels_sales.csv') == read_bytes(EXPECTED_OUTPUT)
+
+def test_incremental_first_run_matches_full_run(workdir):
+    """
+    Test that an incremental run without a manifest rebuilds the full output.
+    """
+    process_soul_foods_data(discover_input_files(DATA_PATTERN), incremental=True)
+    assert read_bytes(workdir / 'soul_foods_pink_morsels_sales.csv') == read_bytes(EXPECTED_OUTPUT)
+    assert (workdir / 'soul_foods_manifest.json').exists()
+
+    # A second run with no changes does nothing
+    assert process_soul_foods_data(discover_input_files(DATA_PATTERN), incremental=True) is None
+
+def test_incremental_replaces_changed_and_adds_new_files(workdir):
+    """
+    Test that rows of a changed file are replaced and a new file is merged in sorted order.
+    """
+    data_dir = workdir / 'data'
+    data_dir.mkdir()
+    for path in discover_input_files(DATA_PATTERN):
+        (data_dir / os.path.basename(path)).write_bytes(read_bytes(path))
+    pattern = str(data_dir / 'daily_sales_data_*.csv')
+    process_soul_foods_data(discover_input_files(pattern), incremental=True)
+
+    # Double every quantity in one file and add a new file
+    changed = pd.read_csv(data_dir / 'daily_sales_data_1.csv')
+    changed['quantity'] = changed['quantity'] * 2
+    changed.to_csv(data_dir / 'daily_sales_data_1.csv', index=False)
+    pd.DataFrame({
+        'product': ['pink morsel', 'gold morsel'],
+        'price': ['$5.00', '$1.00'],
+        'quantity': [10, 20],
+        'date': ['2022-02-15', '2022-02-15'],
+        'region': ['north', 'north']
+    }).to_csv(data_dir / 'daily_sales_data_3.csv', index=False)
+
+    incremental_df = process_soul_foods_data(discover_input_files(pattern), incremental=True)
+    incremental_bytes = read_bytes(workdir / 'soul_foods_pink_morsels_sales.csv')
+
+    full_df = process_soul_foods_data(discover_input_files(pattern))
+    assert incremental_bytes == read_bytes(workdir / 'soul_foods_pink_morsels_sales.csv')
+    assert len(incremental_df) == len(full_df) == 5881
+
+def test_incremental_keeps_rows_of_unchanged_files_with_shared_keys(workdir):
+    """
+    Test that rewriting one file only replaces its own rows, even when another
+    file has rows for the same date and region, and that the manifest holds
+    no per-row data.
+    """
+    import json
+
+    data_dir = workdir / 'data'
+    data_dir.mkdir()
+    header = 'product,price,quantity,date,region\n'
+    (data_dir / 'daily_sales_data_0.csv').write_text(header + 'pink morsel,$3.00,10,2021-01-01,north\n')
+    (data_dir / 'daily_sales_data_1.csv').write_text(header + 'pink morsel,$3.00,20,2021-01-01,north\n')
+    pattern = str(data_dir / 'daily_sales_data_*.csv')
+    process_soul_foods_data(discover_input_files(pattern), incremental=True)
+
+    (data_dir / 'daily_sales_data_1.csv').write_text(header + 'pink morsel,$3.00,30,2021-01-01,north\n')
+    incremental_df = process_soul_foods_data(discover_input_files(pattern), incremental=True)
+    assert sorted(incremental_df['sales']) == [30.0, 90.0]
+    incremental_bytes = read_bytes(workdir / 'soul_foods_pink_morsels_sales.csv')
+    process_soul_foods_data(discover_input_files(pattern))
+    assert incremental_bytes == read_bytes(workdir / 'soul_foods_pink_morsels_sales.csv')
+
+    # Removing a file removes exactly its rows
+    os.remove(data_dir / 'daily_sales_data_0.csv')
+    assert process_soul_foods_data(discover_input_files(pattern), incremental=True)['sales'].tolist() == [90.0]
+
+    with open(workdir / 'soul_foods_manifest.json') as f:
+        entries = json.load(f)['files']
+    assert [sorted(entry) for entry in entries.values()] == [['mtime', 'sha256', 'size']]
+
+def test_every_ingest_records_the_offsets_it_read(workdir):
+    """
+    Test that each ingest path records, after its outputs, the bytes of every
+    raw file it read, stopping before a last line that is still being written.
+    """
+    from process_soul_foods_data import load_offsets
+
+    data_dir = workdir / 'data'
+    data_dir.mkdir()
+    header = 'product,price,quantity,date,region\r\n'
+    complete = header + 'pink morsel,$3.00,10,2021-01-01,north\r\n'
+    (data_dir / 'daily_sales_data_0.csv').write_text(complete + 'pink morsel,$3.00,2', newline='')
+    (data_dir / 'daily_sales_data_1.csv').write_text(complete, newline='')
+    files = discover_input_files(str(data_dir / 'daily_sales_data_*.csv'))
+    expected = {os.path.abspath(path): len(complete) for path in files}
+
+    for options in [{}, {'parallel': True, 'workers': 2}, {'streaming': True}, {'all_products': True}, {'incremental': True}]:
+        if os.path.exists('soul_foods_pink_morsels_sales_offsets.json'):
+            os.remove('soul_foods_pink_morsels_sales_offsets.json')
+        process_soul_foods_data(files, **options)
+        assert load_offsets('soul_foods_pink_morsels_sales_offsets.json') == expected, options
+        assert pd.read_csv(workdir / 'soul_foods_pink_morsels_sales.csv')['sales'].tolist() == [30.0, 30.0]
+
+    # An incremental run updates the offsets of changed files and keeps the others
+    with open(data_dir / 'daily_sales_data_0.csv', 'a', newline='') as f:
+        f.write('0,2021-01-02,north\r\n')
+    process_soul_foods_data(files, incremental=True)
+    expected[os.path.abspath(files[0])] = len(complete) + len('pink morsel,$3.00,20,2021-01-02,north\r\n')
+    assert load_offsets('soul_foods_pink_morsels_sales_offsets.json') == expected
+
+def test_store_is_not_read_after_a_run_without_it(workdir):
+    """
+    Test that a store left by an earlier run is not read once a --no-store
+    run rewrote the CSV, and is read again after the next run with the store.
+    """
+    from soul_foods_store import data_source, load_sales_data, store_available
+
+    if not store_available():
+        pytest.skip("pyarrow is not installed")
+    files = discover_input_files(DATA_PATTERN)
+    process_soul_foods_data(files)
+    assert data_source() == 'soul_foods_store'
+
+    process_soul_foods_data(files[:1], store_dir=None)
+    assert data_source() == 'soul_foods_pink_morsels_sales.csv'
+    assert len(load_sales_data()) == len(pd.read_csv('soul_foods_pink_morsels_sales.csv'))
+
+    process_soul_foods_data(files[:1])
+    assert data_source() == 'soul_foods_store'
+
+def test_streaming_output_is_byte_identical(workdir, monkeypatch):
+    """
+    Test that the external merge sort path writes exactly the in-memory output,
+    including when the memory limit forces many sorted runs.
+    """
+    import process_soul_foods_data as ingest
+
+    files = discover_input_files(DATA_PATTERN)
+    assert process_soul_foods_data(files, streaming=True) == 'soul_foods_pink_morsels_sales.csv'
+    assert read_bytes(workdir / 'soul_foods_pink_morsels_sales.csv') == read_bytes(EXPECTED_OUTPUT)
+
+    # A tiny ceiling gives small chunks and one run per chunk
+    monkeypatch.setattr(ingest, 'RAW_ROW_BYTES', 1)
+    process_soul_foods_data(files, streaming=True, memory_limit_mb=0)
+    assert read_bytes(workdir / 'soul_foods_pink_morsels_sales.csv') == read_bytes(EXPECTED_OUTPUT)
+
+def test_all_products_single_pass(workdir, monkeypatch):
+    """
+    Test that the multi-product mode reads each file once, keeps the pink
+    morsel output unchanged and writes a product-partitioned store.
+    """
+    import process_soul_foods_data as ingest
+    from soul_foods_store import load_sales_data, store_available
+
+    reads = []
+    open_raw_file = ingest.open_raw_file
+    monkeypatch.setattr(ingest, 'open_raw_file', lambda path, *args: reads.append(path) or open_raw_file(path, *args))
+
+    files = discover_input_files(DATA_PATTERN)
+    products_df = process_soul_foods_data(files, all_products=True)
+    assert sorted(reads) == files
+    assert read_bytes(workdir / 'soul_foods_pink_morsels_sales.csv') == read_bytes(EXPECTED_OUTPUT)
+
+    # Every raw row is kept, with its product
+    assert len(products_df) == 3 * 13720
+    assert products_df['product'].nunique() == 7
+    pink_morsels = products_df[products_df['product'] == 'pink morsel']
+    assert pink_morsels['sales'].sum() == pd.read_csv(EXPECTED_OUTPUT)['sales'].sum()
+
+    if store_available():
+        assert 'product=pink%20morsel' in os.listdir(workdir / 'soul_foods_products_store')
+        store_df = load_sales_data('soul_foods_products_sales.csv', 'soul_foods_products_store')
+        csv_df = load_sales_data('soul_foods_products_sales.csv', 'missing_store')
+        columns = ['date', 'region', 'product']
+        pd.testing.assert_frame_equal(
+            store_df.sort_values(columns, kind='stable').reset_index(drop=True),
+            csv_df.sort_values(columns, kind='stable').reset_index(drop=True)
+        )
+
+def test_sqlite_database_is_written(workdir):
+    """
+    Test that the ingest bulk-loads every output row into the SQLite database.
+    """
+    import sqlite3
+
+    process_soul_foods_data(discover_input_files(DATA_PATTERN), streaming=True, db_file='soul_foods_sales.db')
+    with sqlite3.connect(workdir / 'soul_foods_sales.db') as connection:
+        [(rows, cents)] = connection.execute('SELECT COUNT(*), SUM(cents) FROM sales').fetchall()
+    assert rows == 5880
+    assert cents == 1064558300
+
+def test_timing_report(workdir):
+    """
+    Test that --timing-report style runs save the time of every phase as JSON.
+    """
+    import json
+
+    csv_files = discover_input_files(DATA_PATTERN)
+    process_soul_foods_data(csv_files, output_file='out.csv', store_dir='store', timing_report='timing.json')
+    with open('timing.json') as f:
+        report = json.load(f)
+
+    assert report['mode'] == 'serial' and report['files'] == 3
+    assert set(report['phases']) == {'read', 'filter', 'parse', 'concat', 'sort', 'write_csv', 'write_store'}
+    assert report['phases']['read']['calls'] == 3 and report['phases']['sort']['calls'] == 1
+    assert sum(phase['seconds'] for phase in report['phases'].values()) <= report['total_seconds']
+    assert read_bytes('out.csv') == read_bytes(EXPECTED_OUTPUT)
@@ -0,0 +1,53 @@
+import threading
+
+from soul_foods_cache import LRUCache, VersionedCache
+
+def test_lru_eviction_and_counters():
+    """
+    Test that the least recently used entry is evicted and counters are kept.
+    """
+    cache = LRUCache(maxsize=2)
+    cache.get_or_compute(('a',), lambda: 1)
+    cache.get_or_compute(('b',), lambda: 2)
+    assert cache.get_or_compute(('a',), lambda: 'unused') == 1
+    cache.get_or_compute(('c',), lambda: 3)
+
+    # 'b' was the least recently used entry
+    assert cache.get_or_compute(('b',), lambda: 'recomputed') == 'recomputed'
+    assert cache.stats() == {
+        'size': 2, 'maxsize': 2, 'hits': 1, 'misses': 4, 'evictions': 2, 'hit_rate': 0.2
+    }
+
+def test_versioned_cache_drops_entries_of_old_versions():
+    """
+    Test that a new data version invalidates every cached entry.
+    """
+    version = ['v1']
+    cache = VersionedCache(lambda: version[0], maxsize=8)
+    assert cache.get_or_compute(('q',), lambda: 'old') == 'old'
+    assert cache.get_or_compute(('q',), lambda: 'unused') == 'old'
+
+    version[0] = 'v2'
+    assert cache.get_or_compute(('q',), lambda: 'new') == 'new'
+    assert len(cache) == 1
+
+def test_concurrent_access_is_consistent():
+    """
+    Test that concurrent lookups keep the counters and the size bound consistent.
+    """
+    cache = LRUCache(maxsize=16)
+
+    def worker(offset):
+        for i in range(500):
+            key = ((i + offset) % 32,)
+            assert cache.get_or_compute(key, lambda: key[0] * 2) == key[0] * 2
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = cache.stats()
+    assert stats['hits'] + stats['misses'] == 8 * 500
+    assert stats['size'] <= 16
@@ -0,0 +1,49 @@
+import numpy as np
+
+from soul_foods_downsample import downsample, lttb_indices, neighbours
+
+def make_series(n):
+    x = np.datetime64('2018-01-01', 'ns') + np.arange(n) * np.timedelta64(1, 'D')
+    y = np.sin(np.arange(n) / 20.0) * 100 + 1000
+    return x, y
+
+def test_lttb_keeps_endpoints_and_budget():
+    """
+    Test that LTTB returns exactly the budget, in order, with both endpoints.
+    """
+    x, y = make_series(2000)
+    indices = lttb_indices(x, y, 100)
+
+    assert len(indices) == 100
+    assert indices[0] == 0 and indices[-1] == 1999
+    assert (np.diff(indices) > 0).all()
+
+def test_lttb_keeps_extremes():
+    """
+    Test that a single spike survives downsampling.
+    """
+    x, y = make_series(2000)
+    y[1234] = 10000
+    x_small, y_small = downsample(x, y, 50)
+    assert 10000 in y_small
+
+def test_downsample_keeps_points_around_event():
+    """
+    Test that the points either side of an event date are always kept.
+    """
+    x, y = make_series(2000)
+    event = np.datetime64('2021-01-15', 'ns')
+    keep = neighbours(x, event)
+    x_small, _ = downsample(x, y, 60, keep=keep)
+
+    assert x[keep[0]] in x_small and x[keep[1]] in x_small
+    assert x[keep[0]] < event <= x[keep[1]]
+    assert len(x_small) <= 62
+
+def test_short_series_are_untouched():
+    """
+    Test that series within the budget are returned as is.
+    """
+    x, y = make_series(100)
+    x_small, y_small = downsample(x, y, 400)
+    assert x_small is x and y_small is y
@@ -0,0 +1,89 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+
+from soul_foods_events import evaluate_events
+from soul_foods_rollup import SalesRollup
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+SALES_CSV = os.path.join(REPO_DIR, 'soul_foods_pink_morsels_sales.csv')
+
+EVENTS = ['2021-01-15', '2019-06-01', '2017-01-01', '2025-01-01']
+
+@pytest.fixture(scope='module')
+def sales_df():
+    df = pd.read_csv(SALES_CSV)
+    df['date'] = pd.to_datetime(df['date'])
+    return df
+
+@pytest.fixture(scope='module')
+def rollup(sales_df):
+    return SalesRollup.from_frame(sales_df)
+
+def reference_impact(df, event, window_days):
+    """
+    Reference implementation: full-frame masks around one event.
+    """
+    event = pd.Timestamp(event)
+    before = df[df['date'] < event]
+    after = df[df['date'] >= event]
+    window = pd.Timedelta(days=window_days)
+    return {
+        'before_sales': before['sales'].sum(),
+        'after_sales': after['sales'].sum(),
+        'before_records': len(before),
+        'after_records': len(after),
+        'window_before_sales': before[before['date'] >= event - window]['sales'].sum(),
+        'window_after_sales': after[after['date'] < event + window]['sales'].sum()
+    }
+
+@pytest.mark.parametrize('start_date,end_date,region', [
+    (None, None, 'all'),
+    ('2020-12-01', '2021-02-28', 'north'),
+    ('2019-03-07', '2021-09-30', 'all')
+])
+def test_events_match_frame_masking(sales_df, rollup, start_date, end_date, region):
+    """
+    Test that every event's totals, counts and 30 day windows match full-frame masking.
+    """
+    df = sales_df
+    if start_date:
+        df = df[(df['date'] >= start_date) & (df['date'] <= end_date)]
+
+    report = evaluate_events(rollup, EVENTS, start_date, end_date, region, window_days=30)
+    regions = sorted(df['region'].unique()) if region == 'all' else [region]
+    assert len(report) == len(EVENTS) * (len(regions) + (len(regions) > 1))
+
+    for row in report.itertuples():
+        region_df = df if row.region == 'all' else df[df['region'] == row.region]
+        expected = reference_impact(region_df, row.event, 30)
+        for column, value in expected.items():
+            assert getattr(row, column) == pytest.approx(value), (row.event, row.region, column)
+        assert row.in_range == (region_df['date'].min() <= row.event <= region_df['date'].max())
+        if row.before_records:
+            assert row.before_mean == pytest.approx(expected['before_sales'] / expected['before_records'])
+        else:
+            assert np.isnan(row.before_mean)
+
+def test_automatic_window_is_equal_length(rollup):
+    """
+    Test that the default window takes the widest span available on both sides.
+    """
+    report = evaluate_events(rollup, ['2021-01-15'], '2020-12-01', '2021-02-28', 'north')
+    [row] = list(report.itertuples())
+
+    # 45 days before the event (Dec 1 - Jan 14) and 45 days from it (Jan 15 - Feb 28)
+    assert row.window_days == 45
+    assert row.window_before_sales == pytest.approx(row.before_sales)
+    assert row.window_after_sales == pytest.approx(row.after_sales)
+    assert row.window_change_pct == pytest.approx(100 * (row.after_sales / row.before_sales - 1))
+
+def test_empty_selection(rollup):
+    """
+    Test that a range without data reports every event as out of range.
+    """
+    report = evaluate_events(rollup, EVENTS, '2030-01-01', '2030-12-31', 'south')
+    assert len(report) == len(EVENTS)
+    assert not report['in_range'].any()
+    assert (report['before_sales'] == 0).all() and (report['after_sales'] == 0).all()
@@ -0,0 +1,49 @@
+import gzip
+import io
+
+import pandas as pd
+import pytest
+
+from soul_foods_export import csv_stream, encode_export, format_available, gzip_stream
+
+def sales_frames():
+    return [
+        pd.DataFrame({'sales': [1731.0, 1638.5], 'date': pd.to_datetime(['2018-02-06', '2018-02-07']), 'region': 'east'}),
+        pd.DataFrame({'sales': [12.25], 'date': pd.to_datetime(['2021-01-15']), 'region': 'north'})
+    ]
+
+def test_csv_stream_matches_processed_output_layout():
+    """
+    Test that the CSV export has the processed file's header and columns, one block per frame.
+    """
+    chunks = list(csv_stream(sales_frames()))
+    assert len(chunks) == 3
+    assert b''.join(chunks).decode() == (
+        "sales,date,region\n1731.0,2018-02-06,east\n1638.5,2018-02-07,east\n12.25,2021-01-15,north\n"
+    )
+    assert list(csv_stream([])) == [b"sales,date,region\n"]
+
+def test_arrow_stream_round_trips():
+    """
+    Test that the Arrow export is one IPC stream with a batch per frame, valid even when empty.
+    """
+    pa = pytest.importorskip('pyarrow')
+    assert format_available('arrow') and not format_available('xlsx')
+
+    table = pa.ipc.open_stream(b''.join(encode_export(sales_frames(), 'arrow'))).read_all()
+    assert table.column_names == ['sales', 'date', 'region'] and table.num_rows == 3
+    df = table.to_pandas()
+    assert df['sales'].tolist() == [1731.0, 1638.5, 12.25]
+    assert [str(date) for date in df['date']] == ['2018-02-06', '2018-02-07', '2021-01-15']
+
+    assert pa.ipc.open_stream(b''.join(encode_export([], 'arrow'))).read_all().num_rows == 0
+
+def test_gzip_stream_is_one_valid_member():
+    """
+    Test that compressing chunk by chunk gives the same bytes back after decompression.
+    """
+    chunks = [b"sales,date,region\n"] + [b"1731.0,2018-02-06,east\n" * 1000] * 5
+    compressed = list(gzip_stream(iter(chunks)))
+    assert gzip.decompress(b''.join(compressed)) == b''.join(chunks)
+    assert len(b''.join(compressed)) < len(b''.join(chunks)) / 10
+    assert gzip.GzipFile(fileobj=io.BytesIO(b''.join(gzip_stream([])))).read() == b''
@@ -0,0 +1,28 @@
+import numpy as np
+import plotly.graph_objects as go
+
+from soul_foods_figure import make_trace, use_webgl
+
+def make_series(points):
+    x = np.datetime64('2021-01-01', 'ns') + np.arange(points) * np.timedelta64(1, 'D')
+    return [('north', x, np.full(points, 1234.5678))]
+
+def test_webgl_only_above_threshold():
+    """
+    Test that WebGL is chosen only when a trace exceeds the point threshold.
+    """
+    assert not use_webgl(make_series(2000), 2000)
+    assert use_webgl(make_series(2001), 2000)
+    assert not use_webgl(make_series(5000), 0)
+
+def test_webgl_trace_uses_compact_arrays():
+    """
+    Test that WebGL traces carry epoch milliseconds and cent-rounded sales.
+    """
+    [(region, x, y)] = make_series(3)
+    trace = make_trace(0, region, x, y, 'Daily', webgl=True)
+
+    assert isinstance(trace, go.Scattergl)
+    assert list(trace.x) == [1609459200000, 1609545600000, 1609632000000]
+    assert list(trace.y) == [1234.57, 1234.57, 1234.57]
+    assert isinstance(make_trace(0, region, x, y, 'Daily'), go.Scatter)
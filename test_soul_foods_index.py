@@ -0,0 +1,78 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+
+from soul_foods_index import SalesIndex, memory_comparison
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+SALES_CSV = os.path.join(REPO_DIR, 'soul_foods_pink_morsels_sales.csv')
+
+@pytest.fixture(scope='module')
+def sales_df():
+    df = pd.read_csv(SALES_CSV)
+    df['date'] = pd.to_datetime(df['date'])
+    return df
+
+def test_regions_are_contiguous_date_sorted_blocks(sales_df):
+    """
+    Test that every region owns one block of rows sorted by date.
+    """
+    index = SalesIndex.from_frame(sales_df)
+
+    assert index.regions == ['east', 'north', 'south', 'west']
+    assert index.codes.dtype == np.int8
+    for code, region in enumerate(index.regions):
+        lo, hi = index.region_block(region)
+        assert (index.codes[lo:hi] == code).all()
+        assert (np.diff(index.dates[lo:hi]) >= np.timedelta64(0)).all()
+        assert hi - lo == (sales_df['region'] == region).sum()
+
+@pytest.mark.parametrize('region', ['all', 'north', 'west'])
+def test_slices_match_frame_filtering(sales_df, region):
+    """
+    Test that binary-search slices select exactly the rows the frame masks select.
+    """
+    index = SalesIndex.from_frame(sales_df)
+    mask = (sales_df['date'] >= '2020-06-01') & (sales_df['date'] <= '2021-03-31')
+    if region != 'all':
+        mask &= sales_df['region'] == region
+
+    ranges = index.slices('2020-06-01', '2021-03-31', region)
+    assert sum(hi - lo for _, lo, hi in ranges) == mask.sum()
+    assert sum(index.sales[lo:hi].sum() for _, lo, hi in ranges) == pytest.approx(sales_df.loc[mask, 'sales'].sum())
+
+def test_chunks_split_slices_into_bounded_frames(sales_df):
+    """
+    Test that chunks yield the sliced rows, region by region in date order, in bounded frames.
+    """
+    index = SalesIndex.from_frame(sales_df)
+    chunks = list(index.chunks('2020-06-01', '2021-03-31', 'all', chunk_rows=100))
+    assert all(0 < len(chunk) <= 100 for chunk in chunks)
+    assert all(chunk['region'].nunique() == 1 for chunk in chunks)
+
+    exported = pd.concat(chunks, ignore_index=True)
+    mask = (sales_df['date'] >= '2020-06-01') & (sales_df['date'] <= '2021-03-31')
+    expected = sales_df[mask].sort_values(['region', 'date'], kind='stable').reset_index(drop=True)
+    assert list(exported.columns) == ['sales', 'date', 'region']
+    assert exported['region'].tolist() == expected['region'].tolist()
+    assert (exported['date'].to_numpy() == expected['date'].to_numpy()).all()
+    assert exported['sales'].sum() == pytest.approx(expected['sales'].sum())
+    assert list(index.chunks('2030-01-01', None)) == []
+
+def test_many_regions_keep_distinct_codes():
+    """
+    Test that more regions than an int8 holds still get their own blocks.
+    """
+    regions = [f"region_{i:03d}" for i in range(300)]
+    df = pd.DataFrame({'sales': 1.0, 'date': pd.Timestamp('2021-01-01'), 'region': regions[::-1]})
+    index = SalesIndex.from_frame(df)
+    assert index.regions == regions
+    assert [index.region_block(region) for region in ['region_000', 'region_200', 'region_299']] == [(0, 1), (200, 201), (299, 300)]
+
+def test_index_is_smaller_than_frame(sales_df):
+    """
+    Test that the indexed arrays take less memory than the frame they replace.
+    """
+    comparison = memory_comparison(sales_df)
+    assert comparison['index_bytes'] * 3 < comparison['frame_bytes']
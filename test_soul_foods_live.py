@@ -0,0 +1,163 @@
+import numpy as np
+import pandas as pd
+
+from soul_foods_live import DailyBuffer, FileTailer, LiveFeed, LiveSales
+from soul_foods_provider import Dataset
+from soul_foods_rollup import SalesRollup
+
+HEADER = 'product,price,quantity,date,region\r\n'
+
+def raw_rows(date, quantity=10, regions=('north', 'south')):
+    """
+    Return raw CSV lines of one day: a pink morsel and a gold morsel row per region.
+    """
+    return ''.join(f"pink morsel,$5.00,{quantity},{date},{region}\r\ngold morsel,$9.99,1,{date},{region}\r\n"
+                   for region in regions)
+
+def sales_frame(rows):
+    return pd.DataFrame(rows, columns=['sales', 'date', 'region'])
+
+def test_tailer_reads_only_complete_appended_lines(tmp_path):
+    """
+    Test that each poll returns only the new complete lines of every file, and
+    that new, partially written and truncated files are handled.
+    """
+    old = tmp_path / 'daily_sales_data_0.csv'
+    old.write_text(HEADER + raw_rows('2022-02-14'), newline='')
+    tailer = FileTailer.from_ingest(str(tmp_path / 'daily_sales_data_*.csv'), {str(old): old.stat().st_size})
+    assert tailer.poll() is None
+
+    # Appended rows, with a trailing partial line left for the next poll
+    with open(old, 'a', newline='') as f:
+        f.write(raw_rows('2022-02-15', 20) + 'pink morsel,$5.00,3')
+    df = tailer.poll()
+    assert df['date'].tolist() == ['2022-02-15', '2022-02-15']
+    assert df['sales'].tolist() == [100.0, 100.0] and df['region'].tolist() == ['north', 'south']
+
+    with open(old, 'a', newline='') as f:
+        f.write(',2022-02-16,north\r\n')
+    assert tailer.poll()['sales'].tolist() == [15.0]
+    assert tailer.poll() is None
+
+    # A file created later is read from its start, header included
+    (tmp_path / 'daily_sales_data_1.csv').write_text(HEADER + raw_rows('2022-02-17', regions=('east',)), newline='')
+    assert tailer.poll()['region'].tolist() == ['east']
+
+    # A rewritten file is skipped to its end instead of being read again
+    old.write_text(HEADER, newline='')
+    assert tailer.poll() is None
+    assert tailer.offsets[str(old)] == len(HEADER)
+
+def test_feed_starts_where_the_loaded_ingest_stopped(tmp_path, monkeypatch):
+    """
+    Test that rows appended after the ingest that built the loaded data, but
+    before the feed started, are read once, whichever kind of ingest ran last.
+    """
+    from process_soul_foods_data import discover_input_files, load_offsets, process_soul_foods_data
+
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / 'daily_sales_data_0.csv'
+    path.write_text(HEADER + raw_rows('2022-02-14'), newline='')
+    pattern = str(tmp_path / 'daily_sales_data_*.csv')
+    feed = LiveFeed(pattern, '2021-01-15', min_poll_seconds=0)
+
+    def loaded_dataset():
+        df = pd.read_csv('soul_foods_pink_morsels_sales.csv', parse_dates=['date'])
+        return Dataset('v', SalesRollup.from_frame(df), offsets=load_offsets())
+
+    def follow(dataset):
+        feed.reset(dataset)
+        feed.sync(dataset, force=True)
+        return feed.sales.summary(['north'])[2]
+
+    def ingest_and_follow(**options):
+        process_soul_foods_data(discover_input_files(pattern), store_dir=None, **options)
+        return follow(loaded_dataset())
+
+    # An incremental ingest, then rows appended before a full ingest and more after it
+    assert ingest_and_follow(incremental=True) == 1
+    with open(path, 'a', newline='') as f:
+        f.write(raw_rows('2022-02-15'))
+    assert ingest_and_follow() == 2
+    with open(path, 'a', newline='') as f:
+        f.write(raw_rows('2022-02-16'))
+    assert ingest_and_follow(streaming=True) == 3
+
+    # Rows appended to an ingested file and a file created after the ingest are read
+    with open(path, 'a', newline='') as f:
+        f.write(raw_rows('2022-02-17'))
+    (tmp_path / 'daily_sales_data_1.csv').write_text(HEADER + raw_rows('2022-02-18'), newline='')
+    assert follow(loaded_dataset()) == 5
+
+    # Without any record the feed starts at the current end of the files
+    assert follow(Dataset('v', loaded_dataset().rollup)) == 3
+
+def test_daily_buffer_appends_and_inserts_in_order():
+    """
+    Test that days are added in order whether they come last or late, and
+    that only days before the open last day count as completed.
+    """
+    buffer = DailyBuffer([10, 11], [100, 200], [1, 2])
+    for day in range(12, 60):
+        buffer.add(day, 5, 1)
+    buffer.add(59, 5, 1)
+    buffer.add(5, 7, 1)
+    assert buffer.size == 51
+    assert buffer.days[:buffer.size].tolist() == [5, 10, 11] + list(range(12, 60))
+    assert buffer.cents[buffer.size - 1] == 10 and buffer.counts[0] == 1
+
+    days, cents = buffer.completed(after_day=56)
+    assert days.tolist() == [57, 58] and cents.tolist() == [5, 5]
+    assert buffer.completed(limit=2)[0].tolist() == [57, 58]
+    assert len(DailyBuffer().completed()[0]) == 0
+
+def test_live_sales_match_a_full_recompute():
+    """
+    Test that totals and daily sales updated from new rows equal a rollup
+    built from all the rows at once.
+    """
+    history = sales_frame([
+        (15.0, '2021-01-13', 'north'), (15.0, '2021-01-14', 'north'),
+        (25.0, '2021-01-15', 'north'), (9.5, '2021-01-14', 'south')
+    ])
+    new = sales_frame([
+        (25.0, '2021-01-15', 'north'), (40.25, '2021-01-16', 'north'),
+        (5.0, '2021-01-10', 'south'), (12.5, '2021-01-16', 'west')
+    ])
+    sales = LiveSales(SalesRollup.from_frame(history.assign(date=pd.to_datetime(history['date']))), '2021-01-15')
+    assert sales.append(new) == 4 and sales.version == 1
+    assert sales.regions == ['north', 'south', 'west']
+
+    everything = pd.concat([history, new], ignore_index=True)
+    full = SalesRollup.from_frame(everything.assign(date=pd.to_datetime(everything['date'])))
+    for region in ['north', 'south', 'west']:
+        view = full.query(region=region, grain='D')
+        before, after = view.split('2021-01-15')
+        total, average, records, in_range, live_before, live_after = sales.summary([region])
+        assert (total, records) == (view.total_sales, view.total_records)
+        assert in_range == view.contains('2021-01-15')
+        if in_range:
+            assert (live_before, live_after) == (before, after)
+
+        region_rollup = next(r for r in full.region_rollups if r.region == region)
+        buffer = sales.buffers[region]
+        assert buffer.days[:buffer.size].tolist() == region_rollup.dates.astype('datetime64[D]').astype(np.int64).tolist()
+        assert buffer.cents[:buffer.size].tolist() == region_rollup.cents.tolist()
+
+    assert sales.summary(['north', 'south', 'west'])[0] == full.query().total_sales
+
+def test_live_feed_follows_dataset_generation(tmp_path):
+    """
+    Test that the feed reseeds its live sales when the dataset is reloaded.
+    """
+    (tmp_path / 'daily_sales_data_0.csv').write_text(HEADER, newline='')
+    rollup = SalesRollup.from_frame(pd.DataFrame({'sales': [1.0], 'date': pd.to_datetime(['2021-01-01']), 'region': ['north']}))
+    feed = LiveFeed(str(tmp_path / 'daily_sales_data_*.csv'), '2021-01-15', min_poll_seconds=0)
+    feed.reset(Dataset('v1', rollup))
+    with open(tmp_path / 'daily_sales_data_0.csv', 'a', newline='') as f:
+        f.write(raw_rows('2021-01-02', regions=('north',)))
+    feed.sync(Dataset('v1', rollup))
+    assert feed.sales.summary(['north'])[2] == 2
+
+    feed.sync(Dataset('v2', rollup, generation=1))
+    assert feed.generation == 1 and feed.sales.summary(['north'])[2] == 1
@@ -0,0 +1,50 @@
+from soul_foods_metrics import NULL_TIMER, MetricsRegistry
+
+def test_histogram_renders_prometheus_buckets():
+    """
+    Test cumulative buckets, sum and count in the Prometheus text format.
+    """
+    registry = MetricsRegistry(enabled=True)
+    registry.describe('phase_seconds', 'histogram', "Phase time", buckets=(0.1, 1.0))
+    for value in [0.05, 0.1, 0.5, 2.0]:
+        registry.observe('phase_seconds', value, phase='read')
+
+    lines = registry.render().splitlines()
+    assert lines[:2] == ['# HELP phase_seconds Phase time', '# TYPE phase_seconds histogram']
+    assert lines[2:] == [
+        'phase_seconds_bucket{phase="read",le="0.1"} 2',
+        'phase_seconds_bucket{phase="read",le="1.0"} 3',
+        'phase_seconds_bucket{phase="read",le="+Inf"} 4',
+        'phase_seconds_sum{phase="read"} 2.65',
+        'phase_seconds_count{phase="read"} 4'
+    ]
+
+def test_counters_gauges_and_label_escaping():
+    """
+    Test counters, gauges and escaping of label values.
+    """
+    registry = MetricsRegistry(enabled=True)
+    registry.describe('rows_total', 'counter', "Rows")
+    registry.inc('rows_total', 10, output='a"b')
+    registry.inc('rows_total', 5, output='a"b')
+    registry.set('cache_size', 3)
+
+    text = registry.render()
+    assert 'rows_total{output="a\\"b"} 15' in text
+    assert '# TYPE cache_size untyped\ncache_size 3' in text
+
+def test_timer_and_disabled_registry():
+    """
+    Test that timers record their block and that a disabled registry records nothing.
+    """
+    registry = MetricsRegistry(enabled=True)
+    with registry.timer('step_seconds', step='a') as timer:
+        pass
+    assert timer.seconds >= 0
+    assert registry.totals('step_seconds', 'step')['a']['calls'] == 1
+
+    disabled = MetricsRegistry(enabled=False)
+    assert disabled.timer('step_seconds', step='a') is NULL_TIMER
+    disabled.observe('step_seconds', 1.0)
+    disabled.inc('rows_total')
+    assert disabled.render() == '\n'
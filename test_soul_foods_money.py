@@ -0,0 +1,59 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+
+from soul_foods_money import compact_sales_frame, day_numbers, parse_price_cents, smallest_int, to_cents
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+RAW_CSV = os.path.join(REPO_DIR, 'data', 'daily_sales_data_0.csv')
+
+def test_parse_price_cents():
+    """
+    Test that well-formed prices become exact integer cents.
+    """
+    cents = parse_price_cents(['$3.00', '$0.05', '$10.01', '$999999999999.99'])
+    assert cents.dtype == np.int64
+    assert cents.tolist() == [300, 5, 1001, 99999999999999]
+    assert parse_price_cents([]).tolist() == []
+
+@pytest.mark.parametrize('price', [
+    '3.00', '$3.0', '$3.000', '$.00', '$a.00', '$3,00', '$-3.00', '$3.00 ', '$$3.00', '€3.00', '$1234567890123.00', None
+])
+def test_parse_price_cents_rejects_malformed_values(price):
+    """
+    Test that anything but "$<digits>.<two digits>" is rejected with its row number.
+    """
+    with pytest.raises(ValueError, match=r"row 1"):
+        parse_price_cents(['$3.00', price])
+
+def test_raw_prices_match_float_parsing():
+    """
+    Test that the cents parser agrees with the former float parsing on the raw data.
+    """
+    prices = pd.read_csv(RAW_CSV, dtype=str)['price']
+    expected = np.rint(prices.str.replace('$', '').astype(float) * 100)
+    np.testing.assert_array_equal(parse_price_cents(prices), expected)
+
+def test_compact_sales_frame():
+    """
+    Test the compact dtypes and that the exact cents total matches the float total.
+    """
+    raw_df = pd.read_csv(RAW_CSV)
+    df = compact_sales_frame(raw_df)
+
+    assert str(df['product'].dtype) == 'category' and str(df['region'].dtype) == 'category'
+    assert df['day'].dtype == np.int32 and df['quantity'].dtype == np.int16
+    assert df['day'].iloc[0] == (np.datetime64('2018-02-06') - np.datetime64('1970-01-01')).astype(int)
+
+    float_sales = raw_df['price'].str.replace('$', '').astype(float) * raw_df['quantity']
+    assert df['sales_cents'].sum() == to_cents(float_sales).sum()
+    assert df.memory_usage(deep=True).sum() < raw_df.memory_usage(deep=True).sum() / 5
+
+def test_smallest_int_and_day_numbers():
+    """
+    Test integer downcasting and date to day number conversion.
+    """
+    assert smallest_int(np.array([0, 127])).dtype == np.int8
+    assert smallest_int(np.array([-1, 40000])).dtype == np.int32
+    assert day_numbers(['1970-01-02', '2021-01-15', '1970-01-02']).tolist() == [1, 18642, 1]
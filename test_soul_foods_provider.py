@@ -0,0 +1,102 @@
+import threading
+import time
+
+import pandas as pd
+
+from soul_foods_provider import DataProvider, Dataset
+from soul_foods_rollup import SalesRollup
+
+def make_rollup(dates):
+    return SalesRollup.from_frame(pd.DataFrame({
+        'sales': [1.0] * len(dates),
+        'date': pd.to_datetime(dates),
+        'region': ['north'] * len(dates)
+    }))
+
+def test_refresh_swaps_dataset_on_new_version():
+    """
+    Test that a changed version builds a new dataset and an unchanged one does not.
+    """
+    version = ['v1']
+    loads = []
+
+    def load(v):
+        loads.append(v)
+        return Dataset(v, make_rollup(['2021-01-01', '2021-01-02'] if v == 'v1' else ['2021-01-01', '2021-01-05']))
+
+    provider = DataProvider(load, lambda: version[0], poll_seconds=0)
+    first = provider.current
+    assert first.generation == 0 and str(first.max_date)[:10] == '2021-01-02'
+    assert provider.refresh() is False and provider.current is first
+
+    version[0] = 'v2'
+    assert provider.refresh() is True
+    assert provider.current.generation == 1 and str(provider.current.max_date)[:10] == '2021-01-05'
+    assert loads == ['v1', 'v2'] and provider.reloads == 1
+
+    # A dataset taken before the reload is left untouched
+    assert str(first.max_date)[:10] == '2021-01-02'
+
+def test_failed_reload_keeps_current_dataset():
+    """
+    Test that a reload error keeps serving the previous data and is retried on the next poll.
+    """
+    version = ['v1']
+
+    def load(v):
+        if v == 'broken':
+            raise ValueError('half-written file')
+        return Dataset(v, make_rollup(['2021-01-01']))
+
+    provider = DataProvider(load, lambda: version[0], poll_seconds=0)
+    first = provider.current
+    version[0] = 'broken'
+    assert provider.refresh() is False
+    assert provider.current is first and 'half-written file' in provider.last_error
+
+    version[0] = 'v2'
+    assert provider.refresh() is True
+    assert provider.current.generation == 1 and provider.last_error is None
+
+def test_polling_thread_reloads_in_background():
+    """
+    Test that the polling thread picks up a new version and stops cleanly.
+    """
+    version = ['v1']
+    reloaded = threading.Event()
+
+    def load(v):
+        if v == 'v2':
+            reloaded.set()
+        return Dataset(v, make_rollup(['2021-01-01']))
+
+    provider = DataProvider(load, lambda: version[0], poll_seconds=0.01)
+    provider.start()
+    try:
+        version[0] = 'v2'
+        assert reloaded.wait(5)
+        deadline = time.time() + 5
+        while provider.current.version != 'v2' and time.time() < deadline:
+            time.sleep(0.01)
+        assert provider.current.version == 'v2'
+    finally:
+        provider.stop()
+    assert provider._thread is None
+
+def test_replaced_dataset_is_closed():
+    """
+    Test that a reload closes the dataset it replaces, and only that one.
+    """
+    class ClosingRollup:
+        def __init__(self):
+            self.closed = False
+
+        def close(self):
+            self.closed = True
+
+    version = ['v1']
+    provider = DataProvider(lambda v: Dataset(v, ClosingRollup()), lambda: version[0], poll_seconds=0)
+    first = provider.current
+    version[0] = 'v2'
+    assert provider.refresh() is True
+    assert first.rollup.closed and not provider.current.rollup.closed
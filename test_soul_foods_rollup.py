@@ -0,0 +1,76 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+
+from soul_foods_rollup import SalesRollup, choose_grain
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+SALES_CSV = os.path.join(REPO_DIR, 'soul_foods_pink_morsels_sales.csv')
+
+@pytest.fixture(scope='module')
+def sales_df():
+    df = pd.read_csv(SALES_CSV)
+    df['date'] = pd.to_datetime(df['date'])
+    return df
+
+@pytest.fixture(scope='module')
+def rollup(sales_df):
+    return SalesRollup.from_frame(sales_df)
+
+def filter_frame(df, start_date, end_date, region):
+    """
+    Reference implementation: the boolean masks update_chart used to run.
+    """
+    filtered_df = df[(df['date'] >= start_date) & (df['date'] <= end_date)]
+    if region != 'all':
+        filtered_df = filtered_df[filtered_df['region'] == region]
+    return filtered_df
+
+@pytest.mark.parametrize('start_date,end_date,region', [
+    ('2018-02-06', '2022-02-14', 'all'),
+    ('2020-12-01', '2021-02-28', 'north'),
+    ('2021-01-15', '2021-01-15', 'west'),
+    ('2019-03-07', '2021-09-30', 'all'),
+    ('2023-01-01', '2023-12-31', 'south')
+])
+def test_query_matches_frame_filtering(sales_df, rollup, start_date, end_date, region):
+    """
+    Test that totals, record counts and the before/after split match full-frame masking.
+    """
+    filtered_df = filter_frame(sales_df, start_date, end_date, region)
+    view = rollup.query(start_date, end_date, region)
+
+    assert view.total_records == len(filtered_df)
+    assert view.total_sales == pytest.approx(filtered_df['sales'].sum())
+
+    event = pd.Timestamp('2021-01-15')
+    in_range = len(filtered_df) > 0 and filtered_df['date'].min() <= event <= filtered_df['date'].max()
+    assert view.contains(event) == in_range
+    before, after = view.split(event)
+    assert before == pytest.approx(filtered_df[filtered_df['date'] < event]['sales'].sum())
+    assert after == pytest.approx(filtered_df[filtered_df['date'] >= event]['sales'].sum())
+
+@pytest.mark.parametrize('grain,freq', [('D', 'D'), ('W', 'W-SUN'), ('M', 'MS')])
+def test_series_matches_resampled_totals(sales_df, rollup, grain, freq):
+    """
+    Test that each grain's points are the period totals of the selected days.
+    """
+    filtered_df = filter_frame(sales_df, '2019-03-07', '2021-09-30', 'east')
+    expected = filtered_df.set_index('date')['sales'].resample(freq).sum()
+
+    view = rollup.query('2019-03-07', '2021-09-30', 'east', grain=grain)
+    [(region, x, y)] = list(view.series())
+
+    assert region == 'east'
+    assert y.sum() == pytest.approx(filtered_df['sales'].sum())
+    np.testing.assert_allclose(y, expected.to_numpy())
+
+def test_grain_follows_range_width():
+    """
+    Test that wide ranges switch from daily to weekly and monthly points.
+    """
+    start = np.datetime64('2018-01-01')
+    assert choose_grain(start, np.datetime64('2018-12-31'), 500) == 'D'
+    assert choose_grain(start, np.datetime64('2022-12-31'), 500) == 'W'
+    assert choose_grain(start, np.datetime64('2040-12-31'), 500) == 'M'
@@ -0,0 +1,100 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from soul_foods_index import SalesIndex
+from soul_foods_shared import shared_index, version_key
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+SALES_CSV = os.path.join(REPO_DIR, 'soul_foods_pink_morsels_sales.csv')
+
+@pytest.fixture(scope='module')
+def sales_index():
+    df = pd.read_csv(SALES_CSV)
+    df['date'] = pd.to_datetime(df['date'])
+    return SalesIndex.from_frame(df)
+
+def test_save_and_mmap_load(sales_index, tmp_path):
+    """
+    Test that a saved index loads memory-mapped, read-only and identical.
+    """
+    sales_index.save(str(tmp_path))
+    loaded = SalesIndex.load(str(tmp_path))
+
+    assert loaded.regions == sales_index.regions
+    for name in ['codes', 'dates', 'cents', 'offsets']:
+        np.testing.assert_array_equal(getattr(loaded, name), getattr(sales_index, name))
+    assert isinstance(loaded.cents, np.memmap) and not loaded.cents.flags.writeable
+    assert loaded.slices('2021-01-01', '2021-01-31', 'north') == sales_index.slices('2021-01-01', '2021-01-31', 'north')
+
+def test_shared_index_is_built_once_per_version(sales_index, tmp_path):
+    """
+    Test that processes asking for the same version map the same files, and
+    that a new version replaces the old files.
+    """
+    builds = []
+
+    def build():
+        builds.append(1)
+        return sales_index
+
+    shared_dir = str(tmp_path)
+    first = shared_index(('v1',), build, shared_dir)
+    second = shared_index(('v1',), build, shared_dir)
+    assert len(builds) == 1
+    assert first.cents.filename == second.cents.filename
+    assert first.cents.sum() == sales_index.cents.sum()
+
+    shared_index(('v2',), build, shared_dir)
+    assert len(builds) == 2
+    assert sorted(name for name in os.listdir(shared_dir) if not name.startswith('.')) == [version_key(('v2',))]
+
+def test_shared_index_is_mapped_under_the_lock(sales_index, tmp_path, monkeypatch):
+    """
+    Test that the files are mapped while the build lock is held, so another
+    process pruning older versions cannot remove them first.
+    """
+    import soul_foods_shared
+
+    fcntl = pytest.importorskip('fcntl')
+    held = []
+    load = SalesIndex.load
+
+    def checked_load(path, mmap=True):
+        with open(os.path.join(str(tmp_path), '.lock'), 'w') as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                held.append(False)
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+            except BlockingIOError:
+                held.append(True)
+        return load(path, mmap=mmap)
+
+    monkeypatch.setattr(soul_foods_shared.SalesIndex, 'load', checked_load)
+    shared_index(('v1',), lambda: sales_index, str(tmp_path))
+    shared_index(('v1',), lambda: sales_index, str(tmp_path))
+    assert held == [True, True]
+
+def test_wsgi_app_uses_shared_index(tmp_path):
+    """
+    Test that the WSGI factory serves the same numbers from the shared index.
+    """
+    from soul_foods_dashboard import update_summary
+
+    shared_dir = str(tmp_path / 'shared')
+    script = (
+        "import soul_foods_wsgi\n"
+        "server = soul_foods_wsgi.create_app()\n"
+        "import numpy as np, soul_foods_dashboard as d\n"
+        "assert isinstance(d.data_provider.current.sales_index.cents, np.memmap)\n"
+        "print(d.update_summary('2020-12-01', '2021-02-28', 'all'))\n"
+    )
+    env = dict(os.environ, SOUL_FOODS_SHARED_DIR=shared_dir, SOUL_FOODS_RELOAD_SECONDS='0', PYTHONPATH=REPO_DIR)
+    result = subprocess.run([sys.executable, '-c', script], cwd=REPO_DIR, env=env, capture_output=True, text=True, check=True)
+
+    assert result.stdout.endswith(f"{update_summary('2020-12-01', '2021-02-28', 'all')}\n")
+    assert len([name for name in os.listdir(shared_dir) if not name.startswith('.')]) == 1
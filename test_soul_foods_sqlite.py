@@ -0,0 +1,184 @@
+import os
+import sqlite3
+import numpy as np
+import pandas as pd
+import pytest
+
+from soul_foods_events import evaluate_events
+from soul_foods_rollup import SalesRollup
+from soul_foods_sqlite import SqliteSalesBackend, write_sales_db
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+SALES_CSV = os.path.join(REPO_DIR, 'soul_foods_pink_morsels_sales.csv')
+
+QUERIES = [
+    (None, None, 'all', None),
+    ('2018-02-06', '2022-02-14', 'all', None),
+    ('2020-12-01', '2021-02-28', 'north', None),
+    ('2019-03-07', '2021-09-30', 'east', 'W'),
+    ('2019-03-07', '2021-09-30', 'all', 'M'),
+    ('2021-01-15T12:00:00', '2021-01-15', 'west', None),
+    ('2023-01-01', '2023-12-31', 'south', None)
+]
+
+@pytest.fixture(scope='module')
+def rollup():
+    df = pd.read_csv(SALES_CSV)
+    df['date'] = pd.to_datetime(df['date'])
+    return SalesRollup.from_frame(df)
+
+@pytest.fixture(scope='module')
+def backend(tmp_path_factory):
+    db_file = str(tmp_path_factory.mktemp('db') / 'sales.db')
+    write_sales_db(pd.read_csv(SALES_CSV, chunksize=1000), db_file)
+    backend = SqliteSalesBackend(db_file, pool_size=2)
+    yield backend
+    backend.close()
+
+def test_database_schema(backend):
+    """
+    Test that the rows are indexed on (region, date) and pre-aggregated per day.
+    """
+    indexes = backend.pool.execute("SELECT sql FROM sqlite_master WHERE type = 'index' AND name = 'sales_region_day'")
+    assert 'ON sales (region, day)' in indexes[0][0]
+    [(rows,)] = backend.pool.execute('SELECT COUNT(*) FROM sales')
+    [(days, records)] = backend.pool.execute('SELECT COUNT(*), SUM(records) FROM daily_sales')
+    assert rows == records == 5880
+    assert days == 4 * 1470
+
+    # Connections are read-only
+    with pytest.raises(sqlite3.OperationalError):
+        backend.pool.execute('DELETE FROM sales')
+
+@pytest.mark.parametrize('start_date,end_date,region,grain', QUERIES)
+def test_sqlite_matches_rollup(rollup, backend, start_date, end_date, region, grain):
+    """
+    Test that both backends return identical totals, series and splits.
+    """
+    expected = rollup.query(start_date, end_date, region, grain=grain)
+    actual = backend.query(start_date, end_date, region, grain=grain)
+
+    assert actual.grain == expected.grain
+    assert actual.regions == expected.regions
+    assert actual.total_sales == expected.total_sales
+    assert actual.total_records == expected.total_records and actual.rows == expected.rows
+    assert actual.min_date == expected.min_date and actual.max_date == expected.max_date
+    assert actual.contains('2021-01-15') == expected.contains('2021-01-15')
+    assert actual.split('2021-01-15') == expected.split('2021-01-15')
+
+    expected_series = list(expected.series())
+    actual_series = list(actual.series())
+    assert [region for region, _, _ in actual_series] == [region for region, _, _ in expected_series]
+    for (_, x, y), (_, expected_x, expected_y) in zip(actual_series, expected_series):
+        np.testing.assert_array_equal(x, expected_x)
+        np.testing.assert_array_equal(y, expected_y)
+
+@pytest.mark.parametrize('window_days', [None, 30])
+@pytest.mark.parametrize('start_date,end_date,region,grain', QUERIES)
+def test_sqlite_event_impacts_match_rollup(rollup, backend, start_date, end_date, region, grain, window_days):
+    """
+    Test that the event engine gives identical results on both backends.
+    """
+    events = ['2021-01-15', '2019-06-01', '2017-01-01']
+    pd.testing.assert_frame_equal(
+        evaluate_events(backend, events, start_date, end_date, region, window_days),
+        evaluate_events(rollup, events, start_date, end_date, region, window_days)
+    )
+
+@pytest.mark.parametrize('start_date,end_date,region,grain', QUERIES)
+def test_sqlite_chunks_match_index(backend, start_date, end_date, region, grain):
+    """
+    Test that exporting from the database yields the rows the sales index yields.
+    """
+    from soul_foods_index import SalesIndex
+
+    df = pd.read_csv(SALES_CSV)
+    df['date'] = pd.to_datetime(df['date'])
+    expected = list(SalesIndex.from_frame(df).chunks(start_date, end_date, region))
+    actual = list(backend.chunks(start_date, end_date, region, chunk_rows=500))
+    assert all(len(chunk) <= 500 for chunk in actual)
+    assert sum(len(chunk) for chunk in actual) == sum(len(chunk) for chunk in expected)
+
+    if actual:
+        key = ['region', 'date', 'sales']
+        pd.testing.assert_frame_equal(pd.concat(actual).sort_values(key).reset_index(drop=True)[key],
+                                      pd.concat(expected).sort_values(key).reset_index(drop=True)[key])
+
+def test_dashboard_sqlite_backend(tmp_path):
+    """
+    Test that the dashboard shows the same summary with SOUL_FOODS_BACKEND=sqlite.
+    """
+    import subprocess
+    import sys
+    from soul_foods_dashboard import update_insight, update_summary
+
+    write_sales_db([pd.read_csv(SALES_CSV)], str(tmp_path / 'soul_foods_sales.db'))
+    script = (
+        "import soul_foods_dashboard as d\n"
+        "assert d.data_provider.current.sales_index is None\n"
+        "print(d.update_summary('2020-12-01', '2021-02-28', 'all'))\n"
+        "print(d.update_insight('2019-01-01', None, 'east'))\n"
+    )
+    env = dict(os.environ, SOUL_FOODS_BACKEND='sqlite', PYTHONPATH=REPO_DIR)
+    result = subprocess.run([sys.executable, '-c', script], cwd=tmp_path, env=env, capture_output=True, text=True, check=True)
+
+    expected = f"{update_summary('2020-12-01', '2021-02-28', 'all')}\n{update_insight('2019-01-01', None, 'east')}\n"
+    assert result.stdout == expected
+
+def test_closed_pool_lets_borrowed_connections_finish(tmp_path):
+    """
+    Test that closing the pool closes idle connections, closes a borrowed one
+    when it comes back, and still answers later queries.
+    """
+    db_file = str(tmp_path / 'sales.db')
+    write_sales_db(pd.read_csv(SALES_CSV, chunksize=1000), db_file)
+    backend = SqliteSalesBackend(db_file, pool_size=2)
+    with backend.pool.connection() as borrowed:
+        backend.close()
+        assert backend.pool._connections == []
+        assert borrowed.execute('SELECT COUNT(*) FROM sales').fetchone()[0] > 0
+    with pytest.raises(sqlite3.ProgrammingError):
+        borrowed.execute('SELECT 1')
+    assert backend.pool.execute('SELECT COUNT(DISTINCT region) FROM sales') == [(4,)]
+    assert backend.pool._connections == []
+
+def test_close_wakes_threads_waiting_for_a_connection(tmp_path):
+    """
+    Test that a thread waiting for a pooled connection when the pool is closed
+    runs its query on a one-off connection instead of waiting forever.
+    """
+    import threading
+
+    db_file = str(tmp_path / 'sales.db')
+    write_sales_db(pd.read_csv(SALES_CSV, chunksize=1000), db_file)
+    backend = SqliteSalesBackend(db_file, pool_size=1)
+    results = []
+    with backend.pool.connection():
+        waiter = threading.Thread(target=lambda: results.append(backend.pool.execute('SELECT COUNT(DISTINCT region) FROM sales')))
+        waiter.start()
+        waiter.join(0.2)
+        assert waiter.is_alive() and not results
+        backend.close()
+        waiter.join(5)
+        assert not waiter.is_alive() and results == [[(4,)]]
+    assert backend.pool._connections == []
+
+def test_export_does_not_hold_a_pooled_connection(tmp_path):
+    """
+    Test that an export being streamed leaves the pool to the callbacks.
+    """
+    import threading
+
+    db_file = str(tmp_path / 'sales.db')
+    write_sales_db(pd.read_csv(SALES_CSV, chunksize=1000), db_file)
+    backend = SqliteSalesBackend(db_file, pool_size=1)
+    chunks = backend.chunks(region='north', chunk_rows=100)
+    assert len(next(chunks)) == 100
+
+    results = []
+    query = threading.Thread(target=lambda: results.append(backend.pool.execute('SELECT COUNT(*) FROM daily_sales')))
+    query.start()
+    query.join(5)
+    assert not query.is_alive() and results[0][0][0] > 0
+    chunks.close()
+    backend.close()
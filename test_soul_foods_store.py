@@ -0,0 +1,37 @@
+import os
+import pandas as pd
+import pytest
+
+from soul_foods_store import data_source, load_sales_data, write_sales_store
+
+pytest.importorskip('pyarrow')
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+SALES_CSV = os.path.join(REPO_DIR, 'soul_foods_pink_morsels_sales.csv')
+
+def test_store_is_partitioned_by_region_and_month(tmp_path):
+    """
+    Test that the store holds one Feather file per region and month.
+    """
+    store_dir = str(tmp_path / 'store')
+    assert write_sales_store([pd.read_csv(SALES_CSV)], store_dir)
+
+    assert sorted(os.listdir(store_dir)) == ['region=east', 'region=north', 'region=south', 'region=west']
+    months = os.listdir(os.path.join(store_dir, 'region=north'))
+    assert 'month=2021-01.feather' in months
+    assert len(months) == 49
+
+def test_store_and_csv_load_the_same_data(tmp_path):
+    """
+    Test that the dashboard data is identical whether it comes from the store or the CSV.
+    """
+    store_dir = str(tmp_path / 'store')
+    csv_df = load_sales_data(SALES_CSV, store_dir)
+
+    # Chunked, date sorted input as written by the streaming ingest
+    write_sales_store(pd.read_csv(SALES_CSV, chunksize=500), store_dir, SALES_CSV)
+    assert data_source(SALES_CSV, store_dir) == store_dir
+    store_df = load_sales_data(SALES_CSV, store_dir)
+
+    assert str(store_df['date'].dtype) == 'datetime64[ns]'
+    pd.testing.assert_frame_equal(csv_df, store_df)